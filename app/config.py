@@ -24,13 +24,69 @@ PRESENCE_COLORS = [
 
 # ── Validation ticket cache ───────────────────────────────────────────────────
 VALIDATION_CACHE_TTL = 300  # seconds before a re-fetch is allowed
+VALIDATION_POLL_INTERVAL = 30  # seconds between server-side Validation queue polls
+VALIDATION_INCREMENTAL_REFRESH = True  # on TTL expiry, fetch only new / changed tickets
+
+# ── Validation broadcast (SSE) ────────────────────────────────────────────────
+SSE_CLIENT_QUEUE_SIZE = 200     # frames buffered per client before it is dropped
+SSE_REPLAY_BUFFER_SIZE = 1000   # recent frames kept for Last-Event-ID resume
+UI_STATE_BROADCAST_DELAY = 0.05  # seconds ui-state mutations are coalesced before one broadcast
+SSE_KEEPALIVE_INTERVAL = 10     # seconds of silence before a keepalive comment is sent
+SSE_MAX_CLIENTS = 500           # broadcast connections accepted per worker process (503 beyond)
 
 # ── Recommendation engine ─────────────────────────────────────────────────────
-RECOMMENDATION_MAX_WORKERS = 3  # concurrent LLM recommendation threads
+RECOMMENDATION_MAX_WORKERS = 3  # concurrent LLM calls (workers of the pipeline's llm stage)
+
+# Scheduling order of queued recommendations.  Tickets are ordered by tier
+# (explicit "recommend now" requests, then tickets a viewer has open, then
+# the rest) and within a tier by ``priority rank * weight + creation time``,
+# so oldest first with one priority level worth this many seconds of age.
+RECOMMENDATION_PRIORITY_WEIGHT_SECONDS = 4 * 3600
+RECOMMENDATION_PRIORITY_RANKS = {
+    '1': 0, 'critical': 0, 'high': 0,
+    '2': 1, 'medium': 1,
+    '3': 2, 'low': 2,
+    '4': 3, 'planning': 3,
+}
+RECOMMENDATION_DEFAULT_PRIORITY_RANK = 2  # rank of tickets with an unknown priority
+
+# Staged recommendation pipeline: each stage of the ticket-advice pipeline
+# has its own worker pool and a bounded hand-off queue; a stage whose queue
+# is full blocks the stage before it.
+RECOMMENDATION_PIPELINE_WORKERS = {
+    'fetch': 4,        # Athena ticket fetch
+    'keyword': 1,      # support-group keyword match (CPU)
+    'embedding': 4,    # embedding endpoint
+    'retrieval': 4,    # vector + OneNote search (SQL warehouse)
+    'llm': RECOMMENDATION_MAX_WORKERS,
+}
+RECOMMENDATION_PIPELINE_QUEUE_SIZE = 4       # tickets waiting per stage before upstream blocks
+# Tickets admitted from the priority queue at once: enough to keep the LLM
+# stage busy with a full queue in front of it.  Admitting more only parks
+# tickets inside the pipeline, where a newly prioritised ticket waits for a
+# slot behind them.
+RECOMMENDATION_PIPELINE_MAX_IN_FLIGHT = RECOMMENDATION_MAX_WORKERS + RECOMMENDATION_PIPELINE_QUEUE_SIZE
+
+# ── EUS location mapping ──────────────────────────────────────────────────────
+EUS_MAPPER_CACHE_SIZE = 1024  # memoized location strings / group names in the EUS mapper
 
 # ── Consensus ─────────────────────────────────────────────────────────────────
 CONSENSUS_TICKET_THRESHOLD = 5  # consensus required when > this many tickets selected
 
 # ── Validation fetch ──────────────────────────────────────────────────────────
 VALIDATION_FETCH_MAX_WORKERS = 8   # concurrent Athena connections for ticket fetch
-VALIDATION_FETCH_TOTAL_TIMEOUT = 300  # seconds before the entire fetch is abandoned
\ No newline at end of file
+VALIDATION_FETCH_TOTAL_TIMEOUT = 300  # seconds before the entire fetch is abandoned
+
+# ── Ticket state store ────────────────────────────────────────────────────────
+TICKET_STORE_SHARDS = 16  # lock stripes for per-ticket sync / recommendation state
+
+# ── Tracing ───────────────────────────────────────────────────────────────────
+TRACE_HISTOGRAM_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+TRACE_RECENT_LIMIT = 50   # finished ticket-advice traces kept for /api/metrics
+
+# ── Production server (serve.py / gunicorn.conf.py) ───────────────────────────
+SERVER_HOST = '0.0.0.0'
+SERVER_PORT = 5000
+SERVER_WORKERS = 1                 # worker processes; must stay 1 (all state is per process)
+SERVER_WORKER_CONNECTIONS = 1000   # concurrent connections (greenlets) per worker
+SERVER_GRACEFUL_TIMEOUT = 30       # seconds to drain streams and finish requests on shutdown
@@ -51,6 +51,7 @@ def _register_blueprints(app: Flask) -> None:
     from app.routes.presence import presence_bp
     from app.routes.consensus import consensus_bp
     from app.routes.sync import sync_bp
+    from app.routes.metrics import metrics_bp
 
     app.register_blueprint(main_bp)
     app.register_blueprint(search_bp)
@@ -61,6 +62,7 @@ def _register_blueprints(app: Flask) -> None:
     app.register_blueprint(presence_bp)
     app.register_blueprint(consensus_bp)
     app.register_blueprint(sync_bp)
+    app.register_blueprint(metrics_bp)
 
 
 def warm_up_warehouse() -> None:
@@ -56,7 +56,8 @@ def semantic_search(description: str, max_results: int = 5) -> list[dict]:
     db = Databricks()
     table_name = "scratchpad.aslanuka.ir_embeddings"
     output.add_line("Performing similarity search on Databricks ir_embeddings table...")
-    embedding_results = db.similarity_search(table_name, description, limit=max_results)
+    embedding_results = db.similarity_search(table_name, description, limit=max_results,
+                                             query_embedding=search_embedding)
 
     if not embedding_results:
         output.add_line("No similar tickets found")
@@ -100,12 +101,15 @@ def ticket_vector_search(
     ticket_number: str | None = None,
     ticket_data: dict | None = None,
     max_results: int = 5,
+    embedding: list | None = None,
 ) -> list[dict]:
     """
     Perform vector search based on a ticket's content.
 
     If *ticket_data* is provided it is used directly (avoids a redundant
     Athena call).  Otherwise *ticket_number* is fetched from Athena first.
+    *embedding*, if given, is the precomputed embedding of the ticket's
+    ``"title description"`` search text.
     """
     output = Output()
     output.add_line(f"Starting ticket-based vector search for ticket: {ticket_number}")
@@ -137,8 +141,7 @@ def ticket_vector_search(
     )
 
     # Generate embedding
-    emb_model = EmbeddingModel()
-    search_embedding = emb_model.get_embedding(search_text)
+    search_embedding = embedding or EmbeddingModel().get_embedding(search_text)
     if not search_embedding:
         output.add_line("Embedding generation failed")
         return []
@@ -149,7 +152,8 @@ def ticket_vector_search(
     db_sim = Databricks()
     table_name = "scratchpad.aslanuka.ir_embeddings"
     output.add_line("Performing similarity search on Databricks ir_embeddings table...")
-    embedding_results = db_sim.similarity_search(table_name, search_text, limit=max_results)
+    embedding_results = db_sim.similarity_search(table_name, search_text, limit=max_results,
+                                                 query_embedding=search_embedding)
 
     if not embedding_results:
         output.add_line("No similar tickets found")
@@ -2,12 +2,13 @@
 Support group loading and EUS-to-location mapping logic.
 """
 
+import functools
 import json
-import os
 import re
 
 from services.output import Output
-from app.config import DEBUG
+from services.reference_data import REFERENCE_FILES, get_reference_data
+from app.config import DEBUG, EUS_MAPPER_CACHE_SIZE
 
 
 def load_support_groups_from_json(ticket_type: str = "ir") -> list[dict]:
@@ -20,17 +21,14 @@ def load_support_groups_from_json(ticket_type: str = "ir") -> list[dict]:
         each group that has a non-null description and matches the ticket type.
     """
     output = Output()
-    json_path = os.path.join(
-        os.path.dirname(__file__), '..', '..', 'services', 'support_group_description.json'
-    )
+    json_path = REFERENCE_FILES['support_groups']
 
     if DEBUG:
         output.add_line(f"Loading support groups from: {json_path}")
         output.add_line(f"Filtering for ticket_type: {ticket_type}")
 
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            support_groups = json.load(f)
+        support_groups = get_reference_data().support_groups_by_type.get(ticket_type.lower(), [])
 
         filtered_groups = [
             {
@@ -39,11 +37,7 @@ def load_support_groups_from_json(ticket_type: str = "ir") -> list[dict]:
                 'description': g.get('description', ''),
             }
             for g in support_groups
-            if (
-                g.get('ticket_type') == ticket_type.lower()
-                and g.get('description') is not None
-                and g.get('name') != "--Please Select a Support Group--"
-            )
+            if g.get('name') != "--Please Select a Support Group--"
         ]
 
         if DEBUG:
@@ -65,93 +59,113 @@ def load_support_groups_from_json(ticket_type: str = "ir") -> list[dict]:
         return []
 
 
-def map_eus_to_location_group(
-    location_string: str,
-    available_support_groups: list[dict],
-) -> str:
-    """
-    Map a generic ``'EUS'`` recommendation to a location-specific EUS group
-    based on the ticket's location string.
+# ── EUS location mapping ──────────────────────────────────────────────────────
+# Scoring tables shared by every mapping call (built once at import).
 
-    Args:
-        location_string: e.g. ``"RITTENHOUSE - MAIN BLDG (1800 LOMBARD)"``
-        available_support_groups: List of dicts with a ``'name'`` key.
+_LOCATION_SEPARATORS = (
+    ' - ', ' (', '(', ' MAIN ', ' CENTER', ' HOSPITAL',
+    ' MEDICAL', ' BUILDING', ' BLDG',
+)
 
-    Returns:
-        Best matching location-specific EUS group name, or ``'EUS'`` if no
-        match is found.
+_KNOWN_LOCATIONS = (
+    'RITTENHOUSE', 'CHERRY HILL', 'WIDENER', 'PMUC',
+    'PAHC', 'PRESTON', 'HUP', 'PAH', 'MARKET',
+)
+
+# Groups whose names contain any of these are never EUS location targets
+_EXCLUDED_GROUP_TERMS = ('NETWORK', 'CPD', 'RFID')
+
+# Common abbreviation mappings
+_ABBREVIATION_MAP = {
+    'RITTENHOUSE': 'RITT',
+    'CHERRY HILL': 'RSI',
+    'WIDENER': 'WIDENER',
+    'MARKET': 'PMUC',
+    'PRESTON': 'PRES',
+}
+
+
+class _EusGroupEntry:
+    """A support group name tokenized once for EUS scoring."""
+
+    __slots__ = ('name', 'upper', 'words', 'excluded')
+
+    def __init__(self, name):
+        self.name = name
+        self.upper = str(name).upper()
+        self.words = tuple(self.upper.split())
+        self.excluded = any(ex in self.upper for ex in _EXCLUDED_GROUP_TERMS)
+
+
+class EusLocationMapper:
+    """
+    Precompiled mapper from a ticket location string to a location-specific
+    EUS support group.
+
+    Group names are tokenized once, word-boundary patterns are compiled once
+    per location keyword, and every intermediate result (location keywords
+    per location string, score per keyword/group pair, and the final group
+    per location string and candidate list) is memoized, so repeated mapping
+    during batch post-processing is a dictionary lookup.  Scoring is
+    identical to the original per-call implementation.
     """
-    if not location_string or not available_support_groups:
-        return "EUS"
 
-    # ── Extract location keywords ─────────────────────────────────────────
-    location_parts: list[str] = []
-    separators = [
-        ' - ', ' (', '(', ' MAIN ', ' CENTER', ' HOSPITAL',
-        ' MEDICAL', ' BUILDING', ' BLDG',
-    ]
-    for sep in separators:
-        if sep in str(location_string).upper():
-            parts = str(location_string).upper().split(sep, 1)
-            if parts[0] and len(parts[0]) > 2:
-                location_parts.append(parts[0].strip())
-            break
-
-    if not location_parts:
-        upper_loc = str(location_string).upper()
-        known_locations = [
-            'RITTENHOUSE', 'CHERRY HILL', 'WIDENER', 'PMUC',
-            'PAHC', 'PRESTON', 'HUP', 'PAH', 'MARKET',
-        ]
-        for candidate in known_locations:
-            if candidate in upper_loc:
-                location_parts = [candidate]
+    def __init__(self, cache_size: int = EUS_MAPPER_CACHE_SIZE):
+        self._extract_location_parts = functools.lru_cache(maxsize=cache_size)(
+            self._extract_location_parts_uncached)
+        self._group_entry = functools.lru_cache(maxsize=cache_size)(_EusGroupEntry)
+        self._word_pattern = functools.lru_cache(maxsize=cache_size)(
+            lambda loc_part: re.compile(r'\b' + re.escape(loc_part) + r'\b'))
+        self._score = functools.lru_cache(maxsize=cache_size * 8)(self._score_uncached)
+        self._map = functools.lru_cache(maxsize=cache_size)(self._map_uncached)
+
+    def map(self, location_string: str, available_support_groups: list[dict]) -> str:
+        """See :func:`map_eus_to_location_group`."""
+        if not location_string or not available_support_groups:
+            return "EUS"
+        group_names = tuple(g.get('name', '') for g in available_support_groups)
+        return self._map(str(location_string), group_names)
+
+    @staticmethod
+    def _extract_location_parts_uncached(location_string: str) -> tuple[str, ...]:
+        """Extract the location keywords used for scoring from *location_string*."""
+        upper_loc = location_string.upper()
+
+        for sep in _LOCATION_SEPARATORS:
+            if sep in upper_loc:
+                parts = upper_loc.split(sep, 1)
+                if parts[0] and len(parts[0]) > 2:
+                    return (parts[0].strip(),)
                 break
 
-    if not location_parts:
-        words = str(location_string).upper().split()
-        for word in words[:3]:
+        for candidate in _KNOWN_LOCATIONS:
+            if candidate in upper_loc:
+                return (candidate,)
+
+        for word in upper_loc.split()[:3]:
             cleaned = word.replace('(', '').replace(')', '').replace(',', '')
             if len(cleaned) >= 4 and cleaned.isalnum():
-                location_parts = [cleaned]
-                break
+                return (cleaned,)
 
-    if not location_parts:
-        return "EUS"
+        return ()
 
-    # ── Filter out irrelevant groups ──────────────────────────────────────
-    excluded = {'NETWORK', 'CPD', 'RFID'}
-    filtered_groups = [
-        g for g in available_support_groups
-        if not any(ex in str(g.get('name', '')).upper() for ex in excluded)
-    ]
-
-    # ── Score each group ──────────────────────────────────────────────────
-    scored: list[tuple[str, int]] = []
-    for group in filtered_groups:
-        group_name = group.get('name', '')
-        group_upper = str(group_name).upper()
+    def _score_uncached(self, location_parts: tuple[str, ...], group_name) -> int:
+        """Score one group name against the extracted location keywords."""
+        entry = self._group_entry(group_name)
+        group_upper = entry.upper
         score = 0
 
         for loc_part in location_parts:
             if loc_part in group_upper:
                 score += 3
-            if re.search(r'\b' + re.escape(loc_part) + r'\b', group_upper):
+            if self._word_pattern(loc_part).search(group_upper):
                 score += 2
-            for word in group_upper.split():
+            for word in entry.words:
                 if word.startswith(loc_part) or loc_part.startswith(word):
                     score += 1
 
-        # Common abbreviation mappings
-        abbreviation_map = {
-            'RITTENHOUSE': 'RITT',
-            'CHERRY HILL': 'RSI',
-            'WIDENER': 'WIDENER',
-            'MARKET': 'PMUC',
-            'PRESTON': 'PRES',
-        }
         for loc_part in location_parts:
-            abbrev = abbreviation_map.get(loc_part)
+            abbrev = _ABBREVIATION_MAP.get(loc_part)
             if abbrev and abbrev in group_upper:
                 score += 3
             if loc_part.startswith('PAH') and 'PAH' in group_upper:
@@ -159,11 +173,46 @@ def map_eus_to_location_group(
             if loc_part.startswith('HUP') and 'HUP' in group_upper:
                 score += 3
 
-        if score > 0:
-            scored.append((group_name, score))
+        return score
+
+    def _map_uncached(self, location_string: str, group_names: tuple) -> str:
+        location_parts = self._extract_location_parts(location_string)
+        if not location_parts:
+            return "EUS"
+
+        best_name, best_score = None, 0
+        for group_name in group_names:
+            if self._group_entry(group_name).excluded:
+                continue
+            score = self._score(location_parts, group_name)
+            # Strictly greater keeps the first group among equal scores
+            # (same result as a stable sort by descending score)
+            if score > best_score:
+                best_name, best_score = group_name, score
+
+        if best_name is not None:
+            return best_name
+
+        return "EUS"
+
+
+_eus_mapper = EusLocationMapper()
+
+
+def map_eus_to_location_group(
+    location_string: str,
+    available_support_groups: list[dict],
+) -> str:
+    """
+    Map a generic ``'EUS'`` recommendation to a location-specific EUS group
+    based on the ticket's location string.
 
-    if scored:
-        scored.sort(key=lambda x: x[1], reverse=True)
-        return scored[0][0]
+    Args:
+        location_string: e.g. ``"RITTENHOUSE - MAIN BLDG (1800 LOMBARD)"``
+        available_support_groups: List of dicts with a ``'name'`` key.
 
-    return "EUS"
\ No newline at end of file
+    Returns:
+        Best matching location-specific EUS group name, or ``'EUS'`` if no
+        match is found.
+    """
+    return _eus_mapper.map(location_string, available_support_groups)
@@ -1,12 +1,24 @@
 """
 Ticket advice / assignment recommendation logic.
 
-Orchestrates the LLM-based recommendation pipeline:
-  1. Fetch original ticket from Athena
-  2. Find similar tickets (vector search) and OneNote docs (in parallel)
-  3. Match relevant support groups via keyword matching
-  4. Build a structured prompt and call the text generation model
-  5. Post-process the result (EUS mapping, etc.)
+Orchestrates the LLM-based recommendation pipeline as a sequence of stages
+(:data:`STAGES`), each a function that advances an :class:`AdviceRequest`:
+
+  1. ``fetch``      — fetch the original ticket from Athena
+  2. ``keyword``    — match relevant support groups via keyword matching
+  3. ``embedding``  — embed the ticket's search text once
+  4. ``retrieval``  — similar tickets (vector search) and OneNote docs, in
+     parallel, both reusing that embedding; the OneNote searches share one
+     long-lived pool
+  5. ``llm``        — build a structured prompt, call the text generation
+     model and post-process the result (EUS mapping, etc.)
+
+:func:`get_ticket_advice` runs the stages one after another for a single
+ticket; :mod:`app.state.recommendation_pipeline` runs each stage on its own
+worker pool so stages of different tickets overlap.
+
+Each stage is timed as a :mod:`app.state.tracing` span; callers wrap the
+call in ``tracing.trace(ticket_id)`` to get the per-ticket breakdown.
 """
 
 import json
@@ -14,14 +26,23 @@ import concurrent.futures
 
 from services.athena import Athena
 from services.databricks import Databricks
-from services.keyword_match import KeywordMatch
+from services.embedding_model import EmbeddingModel
+from services.keyword_match import get_keyword_matcher
 from services.text_generation_model import TextGenerationModel
 from services.prompts import PROMPTS
 from services.output import Output
+from services.config import DEBUG_JSON_DATA
 
-from app.config import DEBUG
+from app.config import DEBUG, RECOMMENDATION_PIPELINE_WORKERS
 from app.logic.search import ticket_vector_search
 from app.logic.support_groups import map_eus_to_location_group
+from app.state import tracing
+
+
+# OneNote searches run here while the retrieval worker runs the vector search
+_onenote_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=RECOMMENDATION_PIPELINE_WORKERS['retrieval'], thread_name_prefix='onenote-search',
+)
 
 
 def _extract_fields(ticket: dict) -> dict:
@@ -37,6 +58,36 @@ def _extract_fields(ticket: dict) -> dict:
     }
 
 
+class AdviceRequest:
+    """
+    One ticket moving through the advice stages.
+
+    Each stage fills in its fields; a stage that settles the outcome early
+    (ticket not found, invalid number) sets :attr:`result` and
+    :attr:`done` so the remaining stages are skipped.
+    """
+
+    __slots__ = ('ticket_number', 'original_data', 'support_match_result',
+                 'available_support_groups', 'search_text', 'embedding',
+                 'similar_tickets', 'onenote_docs', 'result', 'done')
+
+    def __init__(self, ticket_number: str):
+        self.ticket_number = ticket_number
+        self.original_data: dict | None = None
+        self.support_match_result: dict | None = None
+        self.available_support_groups: list = []
+        self.search_text = ''
+        self.embedding: list = []
+        self.similar_tickets: list = []
+        self.onenote_docs: list = []
+        self.result: dict | None = None
+        self.done = False
+
+    def finish(self, result: dict | None) -> None:
+        self.result = result
+        self.done = True
+
+
 def get_ticket_advice(ticket_number: str) -> dict | None:
     """
     Full ticket-advice pipeline for a single ticket.
@@ -44,104 +95,181 @@ def get_ticket_advice(ticket_number: str) -> dict | None:
     Returns a dict with recommendation fields on success, a dict with an
     ``'error'`` key on failure, or ``None`` if the ticket cannot be fetched.
     """
-    output = Output()
-
     if DEBUG:
-        output.add_line("Starting get_ticket_advice function")
+        Output().add_line("Starting get_ticket_advice function")
+
+    advice = AdviceRequest(ticket_number)
+    for _name, stage in STAGES:
+        stage(advice)
+        if advice.done:
+            break
+    return advice.result
+
+
+# ── Stages ────────────────────────────────────────────────────────────────────
+
+def fetch_stage(advice: AdviceRequest) -> None:
+    """Fetch the original ticket from Athena."""
+    output = Output()
+    ticket_number = advice.ticket_number
 
-    # ── 1. Fetch original ticket ──────────────────────────────────────────
-    athena = Athena()
-    original_result = athena.get_ticket_data(ticket_number=ticket_number, view=True)
+    with tracing.span('athena_fetch', ticket_id=ticket_number) as s:
+        athena = Athena()
+        original_result = athena.get_ticket_data(ticket_number=ticket_number, view=True)
+        s.set(found=bool(original_result and original_result.get('result')))
 
     if not original_result or not original_result.get('result'):
         output.add_line(f"Could not retrieve original ticket {ticket_number}")
-        return None
+        advice.finish(None)
+        return
 
-    original_data = original_result['result'][0]
+    advice.original_data = original_result['result'][0]
 
     if DEBUG:
-        output.add_line(f"original_data:\n{original_data}")
+        output.add_line(f"original_data:\n{advice.original_data}")
 
     # Validate ticket number format
     if not isinstance(ticket_number, str) or len(ticket_number) < 2:
         output.add_line(f"Invalid ticket number format: {ticket_number}")
-        return {'error': f'Invalid ticket number format: {ticket_number}'}
+        advice.finish({'error': f'Invalid ticket number format: {ticket_number}'})
+        return
 
-    ticket_type = ticket_number[:2].lower()
     if DEBUG:
-        output.add_line(f"Detected ticket type: {ticket_type}")
+        output.add_line(f"Detected ticket type: {ticket_number[:2].lower()}")
+
+    advice.search_text = (
+        f"{advice.original_data.get('title', '')} "
+        f"{advice.original_data.get('description', '')}"
+    ).strip()
 
-    # ── 2. Match relevant support groups ──────────────────────────────────
-    keyword_matcher = KeywordMatch()
-    support_match_result = keyword_matcher.match_support_groups(original_data)
-    available_support_groups = (
-        support_match_result['location_specific_support']
-        + support_match_result['global_support']
-    )
+
+def keyword_stage(advice: AdviceRequest) -> None:
+    """Match relevant support groups."""
+    with tracing.span('keyword_match') as s:
+        keyword_matcher = get_keyword_matcher()
+        support_match_result = keyword_matcher.match_support_groups(advice.original_data)
+        advice.support_match_result = support_match_result
+        advice.available_support_groups = (
+            support_match_result['location_specific_support']
+            + support_match_result['global_support']
+        )
+        s.set(support_groups=len(advice.available_support_groups))
 
     if DEBUG:
-        total = len(available_support_groups)
+        total = len(advice.available_support_groups)
         loc_count = len(support_match_result['location_specific_support'])
         glob_count = len(support_match_result['global_support'])
-        output.add_line(
+        Output().add_line(
             f"Available support groups ({total} total): "
             f"{loc_count} location-specific, {glob_count} global"
         )
 
-    # ── 3. Parallel: similar tickets + OneNote docs ───────────────────────
-    search_text = (
-        f"{original_data.get('title', '')} "
-        f"{original_data.get('description', '')}"
-    ).strip()
+
+def embedding_stage(advice: AdviceRequest) -> None:
+    """Embed the search text once for both retrieval searches."""
+    if not advice.search_text:
+        return
+    with tracing.span('embedding', search_chars=len(advice.search_text)) as s:
+        advice.embedding = EmbeddingModel().get_embedding(advice.search_text) or []
+        s.set(dimensions=len(advice.embedding))
+
+
+def retrieval_stage(advice: AdviceRequest) -> None:
+    """Similar tickets and OneNote docs, in parallel."""
+    output = Output()
+    if not advice.embedding:
+        output.add_line(f"Warning: no embedding for {advice.ticket_number}; skipping retrieval")
+        return
 
     similar_tickets: list = []
     onenote_docs: list = []
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-        sim_future = executor.submit(
-            ticket_vector_search, ticket_data=original_data, max_results=5
-        )
-        onenote_future = executor.submit(
-            lambda: Databricks().semantic_search_onenote(search_text, limit=5)
+    with tracing.span('retrieval', search_chars=len(advice.search_text)) as s:
+        onenote_future = _onenote_executor.submit(
+            tracing.propagate(_traced_onenote_search), advice.search_text, advice.embedding
         )
-
         try:
-            similar_tickets = sim_future.result(timeout=60)
+            similar_tickets = _traced_vector_search(advice.original_data, advice.embedding)
+        except Exception as e:
+            output.add_line(f"Warning: Vector search failed: {e}")
+        try:
             onenote_docs = onenote_future.result(timeout=60)
         except concurrent.futures.TimeoutError:
-            output.add_line("Warning: Parallel operations timed out")
+            output.add_line("Warning: OneNote search timed out")
         except Exception as e:
-            output.add_line(f"Warning: Parallel operations failed: {e}")
+            output.add_line(f"Warning: OneNote search failed: {e}")
+        s.set(similar_tickets=len(similar_tickets), onenote_docs=len(onenote_docs))
+
+    advice.similar_tickets = similar_tickets
+    advice.onenote_docs = onenote_docs
 
     if DEBUG:
         output.add_line(f"similar_tickets:\n{similar_tickets}")
         output.add_line(f"onenote_docs:\n{onenote_docs}")
 
-    # ── 4. Build prompt and call LLM ──────────────────────────────────────
+
+def llm_stage(advice: AdviceRequest) -> None:
+    """Build the prompt, call the LLM and post-process its answer."""
+    output = Output()
+    support_match_result = advice.support_match_result
     structured_data = {
-        "original_ticket": _extract_fields(original_data),
-        "similar_tickets": similar_tickets,
-        "onenote_documentation": onenote_docs,
+        "original_ticket": _extract_fields(advice.original_data),
+        "similar_tickets": advice.similar_tickets,
+        "onenote_documentation": advice.onenote_docs,
         "location_specific_support_groups": support_match_result['location_specific_support'],
         "global_support_groups": support_match_result['global_support'],
     }
 
     json_data = json.dumps(structured_data, indent=2)
 
-    # Optional: dump full prompt context for debugging
-    DEBUG_JSON_DATA = True
-    if DEBUG_JSON_DATA:
-        dbg_output = Output()
-        dbg_output.add_line("=== FULL JSON_DATA CONTENTS FOR DEBUGGING ===")
-        dbg_output.add_line(json_data)
-        dbg_output.add_line("=== END JSON_DATA DEBUG OUTPUT ===")
+    # Optional: dump full prompt context for debugging (DEBUG level only)
+    if DEBUG_JSON_DATA and output.is_enabled_for('DEBUG'):
+        output.debug("=== FULL JSON_DATA CONTENTS FOR DEBUGGING ===")
+        output.debug(json_data, ticket_id=advice.ticket_number)
+        output.debug("=== END JSON_DATA DEBUG OUTPUT ===")
 
     prompt = PROMPTS["ticket_assignment"].format(json_data=json_data)
 
-    model = TextGenerationModel()
-    assignment_result = model.ask(prompt, max_retries=3)
+    with tracing.span('llm', prompt_chars=len(prompt)) as s:
+        model = TextGenerationModel()
+        assignment_result = model.ask(prompt, max_retries=3)
+        s.set(ok='error' not in assignment_result)
+
+    with tracing.span('post_process'):
+        advice.finish(_post_process(advice.ticket_number, advice.original_data,
+                                    advice.similar_tickets, advice.onenote_docs,
+                                    assignment_result, advice.available_support_groups))
+
+
+# (name, function) in pipeline order
+STAGES = (
+    ('fetch', fetch_stage),
+    ('keyword', keyword_stage),
+    ('embedding', embedding_stage),
+    ('retrieval', retrieval_stage),
+    ('llm', llm_stage),
+)
+
 
-    # ── 5. Post-process ───────────────────────────────────────────────────
+def _traced_vector_search(ticket_data: dict, embedding: list | None = None) -> list:
+    with tracing.span('vector_search') as s:
+        result = ticket_vector_search(ticket_data=ticket_data, max_results=5, embedding=embedding)
+        s.set(results=len(result))
+        return result
+
+
+def _traced_onenote_search(search_text: str, embedding: list | None = None) -> list:
+    with tracing.span('onenote_search') as s:
+        result = Databricks().semantic_search_onenote(search_text, limit=5, query_embedding=embedding)
+        s.set(results=len(result))
+        return result
+
+
+def _post_process(ticket_number: str, original_data: dict, similar_tickets: list,
+                  onenote_docs: list, assignment_result: dict,
+                  available_support_groups: list) -> dict:
+    """Log the LLM result, map generic EUS to a location group and build the response."""
+    output = Output()
     output.add_line("Ticket Advice Request:")
     output.add_line(f"Ticket: {ticket_number}")
     output.add_line("Assignment Recommendations:")
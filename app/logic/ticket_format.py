@@ -94,5 +94,6 @@ def format_validation_ticket(ticket: dict, index: int) -> dict:
         'source': ticket.get('source', ''),
         'support_group': ticket.get('support_group', ''),
         'resolution_notes': ticket.get('resolution_notes', ''),
+        'last_modified_at': ticket.get('last_modified_at'),
         'index': index,
     }
\ No newline at end of file
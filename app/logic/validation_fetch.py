@@ -0,0 +1,72 @@
+"""
+Parallel Athena fetch of validation tickets.
+
+Shared by the initial validation load and the server-side queue poller so
+every ticket is fetched once on the server and the formatted result is
+broadcast to all clients, instead of each client hydrating it separately.
+"""
+
+import concurrent.futures
+
+from services.athena import Athena
+
+from app.config import VALIDATION_FETCH_MAX_WORKERS, VALIDATION_FETCH_TOTAL_TIMEOUT
+from app.logic.ticket_format import format_validation_ticket
+
+FETCH_TIMEOUT_MESSAGE = 'Timeout: Athena did not respond in time'
+
+
+def _fetch_one(index: int, ticket_id: str) -> tuple:
+    """Fetch and format one ticket. Returns ``(index, ticket_id, vt, error)``."""
+    try:
+        ticket_data = Athena().get_ticket_data(ticket_number=ticket_id, view=True)
+        if ticket_data and ticket_data.get('result'):
+            return (index, ticket_id, format_validation_ticket(ticket_data['result'][0], index), None)
+        return (index, ticket_id, None, 'Failed to fetch ticket data')
+    except Exception as exc:
+        return (index, ticket_id, None, str(exc))
+
+
+def fetch_validation_tickets(
+    items: list[tuple[int, str]],
+    max_workers: int = VALIDATION_FETCH_MAX_WORKERS,
+    timeout: float = VALIDATION_FETCH_TOTAL_TIMEOUT,
+):
+    """
+    Fetch validation tickets from Athena in parallel.
+
+    Args:
+        items: ``(index, ticket_id)`` pairs; *index* is the accordion position
+            stored on the formatted ticket.
+        max_workers: Concurrent Athena connections.
+        timeout: Seconds before unfinished fetches are abandoned.
+
+    Yields:
+        ``(index, ticket_id, ticket, error)`` in completion order, where
+        *ticket* is the :func:`format_validation_ticket` dict or ``None`` and
+        *error* is a message when the fetch failed or timed out.
+    """
+    if not items:
+        return
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    future_to_item = {
+        executor.submit(_fetch_one, index, ticket_id): (index, ticket_id)
+        for index, ticket_id in items
+    }
+
+    try:
+        for future in concurrent.futures.as_completed(future_to_item, timeout=timeout):
+            index, ticket_id = future_to_item[future]
+            try:
+                yield future.result()
+            except Exception as exc:
+                yield (index, ticket_id, None, str(exc))
+
+    except concurrent.futures.TimeoutError:
+        for future, (index, ticket_id) in future_to_item.items():
+            if not future.done():
+                yield (index, ticket_id, None, FETCH_TIMEOUT_MESSAGE)
+
+    finally:
+        executor.shutdown(wait=False)
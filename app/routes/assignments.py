@@ -10,8 +10,8 @@ from services.athena import Athena
 from services.output import Output
 
 from app.config import DEBUG
-from app.state import recommendation_state
 from app.state import sync_state
+from app.state import ticket_store
 from app.state import ui_state
 from app.state import consensus_state
 
@@ -146,8 +146,7 @@ def api_implement_assignments():
         assigned_ids = [r['ticket_id'] for r in results if r['success']]
 
         if assigned_ids:
-            recommendation_state.purge_tickets(assigned_ids)
-            sync_state.purge_tickets(assigned_ids)
+            ticket_store.purge_tickets(assigned_ids)
 
         if DEBUG:
             output.add_line(
@@ -172,7 +171,7 @@ def api_implement_assignments():
         ui_state.set_tickets_in_view(remaining)
 
         # Recalculate checked_count from remaining checkbox state
-        # (purged tickets were removed from sync_state above)
+        # (purged tickets were removed from ticket_store above)
         cb = sync_state.get_checkbox_state()
         remaining_checked = sum(1 for v in cb.values() if v)
         remaining_total = len(cb)
@@ -0,0 +1,35 @@
+"""
+Metrics routes — pipeline latency and Prometheus exposition.
+
+/api/metrics  (GET, per-stage latency histograms and recent traces)
+/metrics      (GET, Prometheus text format: upstream calls, queues, clients)
+"""
+
+from flask import Blueprint, request, jsonify, Response
+
+from services import metrics
+
+from app.state import tracing
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/api/metrics', methods=['GET'])
+def api_metrics():
+    """
+    Return per-stage latency histograms for the ticket-advice pipeline.
+
+    Query params:
+        recent: Number of latest per-ticket traces to include (default 10).
+
+    Response: ``{"stages": {stage: {count, mean_ms, p50_ms, p95_ms, p99_ms, buckets, ...}},
+    "recent": [{ticket_id, total_ms, stages, spans}, ...]}``
+    """
+    recent = request.args.get('recent', 10, type=int)
+    return jsonify(tracing.get_metrics(recent=max(0, recent)))
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Return every registered metric in Prometheus text exposition format."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
@@ -1,8 +1,9 @@
 """
 Recommendation engine routes.
 
-/api/toggle-recommendations  (POST)
-/api/recommendation-state    (GET)
+/api/toggle-recommendations      (POST)
+/api/recommendation-state        (GET)
+/api/recommendations/prioritize  (POST)
 """
 
 from flask import Blueprint, request, jsonify
@@ -22,7 +23,7 @@ def api_toggle_recommendations():
     Toggle the recommendation engine on or off.
 
     When toggled ON:  processes all loaded validation tickets without recommendations.
-    When toggled OFF: stops submitting new tickets; in-flight ones complete and are cached.
+    When toggled OFF: drops queued tickets; in-flight ones complete and are cached.
 
     Request body: ``{"active": true/false}`` (optional — defaults to toggling)
     """
@@ -51,10 +52,7 @@ def api_toggle_recommendations():
         cached_count = recommendation_state.get_cached_count()
         total = len(loaded_tickets)
 
-        validation_cache.broadcast('recommendation-progress', {
-            'completed': cached_count,
-            'total': total,
-        }, buffer=False)
+        recommendation_state.broadcast_progress()
 
         if DEBUG:
             output.add_line(
@@ -66,7 +64,7 @@ def api_toggle_recommendations():
         # Update ui_state via button_rules
         ui_state.set_recommendations_toggle(False)
         if DEBUG:
-            output.add_line('toggle-recommendations: OFF — stop event set')
+            output.add_line('toggle-recommendations: OFF — queue cleared')
 
     return jsonify({
         'active': active,
@@ -86,5 +84,35 @@ def api_recommendation_state():
         'active': recommendation_state.is_active(),
         'cache': recommendation_state.get_cache(),
         'processing': recommendation_state.get_processing_list(),
+        'queue': recommendation_state.get_queue_snapshot(),
+        'pipeline': recommendation_state.get_pipeline_stats(),
         'total': validation_cache.get_ticket_count(),
-    })
\ No newline at end of file
+    })
+
+
+@recommendations_bp.route('/api/recommendations/prioritize', methods=['POST'])
+def api_prioritize_recommendation():
+    """
+    Move one ticket's recommendation ahead in the queue.
+
+    ``mode`` is ``"focus"`` (sent when a viewer opens the ticket; only
+    reorders work that is already due) or ``"now"`` (queue it at the front
+    even while auto-recommend is off).
+
+    Request body: ``{"ticket_id": "...", "mode": "focus"|"now", "session_id": "..."}``
+    """
+    data = request.get_json(silent=True) or {}
+    ticket_id = data.get('ticket_id')
+    mode = data.get('mode', 'focus')
+    if not ticket_id:
+        return jsonify({'error': 'Missing ticket_id'}), 400
+    if mode not in ('focus', 'now'):
+        return jsonify({'error': 'mode must be "focus" or "now"'}), 400
+
+    queued = recommendation_state.prioritize(ticket_id, mode)
+    if DEBUG and queued:
+        Output().add_line(
+            f'prioritize: {ticket_id} ({mode}) by {data.get("session_id") or "unknown"}, '
+            f'depth {recommendation_state.get_queue_depth()}'
+        )
+    return jsonify({'ticket_id': ticket_id, 'mode': mode, 'queued': queued})
\ No newline at end of file
@@ -2,12 +2,10 @@
 Search routes — /api/search-tickets and /api/support-group-names.
 """
 
-import json
-import os
-
 from flask import Blueprint, request, jsonify
 
 from services.athena import Athena
+from services.reference_data import get_reference_data
 from app.logic.search import semantic_search, exact_description_search, ticket_vector_search
 from app.logic.ticket_format import format_ticket_from_athena
 
@@ -37,13 +35,7 @@ def search_tickets():
 def support_group_names():
     """Return a sorted list of all support group names for the manual selector."""
     try:
-        keywords_path = os.path.join(
-            os.path.dirname(__file__), '..', '..', 'services', 'support_group_keywords.json'
-        )
-        with open(keywords_path, 'r', encoding='utf-8') as f:
-            groups = json.load(f)
-        names = sorted([g['name'] for g in groups if 'name' in g])
-        return jsonify(names)
+        return jsonify(get_reference_data().support_group_names)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -3,11 +3,11 @@ Cross-client state synchronisation routes.
 
 /api/sync-checkbox              (POST)
 /api/sync-assignment-selection  (POST)
-/api/sync-poll-timer            (POST)
 /api/sync-implement             (POST)
 /api/sync-state                 (GET)
 /api/toggle-validation          (POST)
 /api/ui-state                   (GET)
+/api/state-snapshot             (GET)
 """
 
 from flask import Blueprint, request, jsonify
@@ -128,21 +128,6 @@ def api_sync_assignment_selection():
     return jsonify({'status': 'ok'})
 
 
-@sync_bp.route('/api/sync-poll-timer', methods=['POST'])
-def api_sync_poll_timer():
-    """
-    Broadcast the next poll epoch timestamp so all clients show the same countdown.
-
-    Request body: ``{"next_poll_at": <epoch_ms>}``
-    """
-    data = request.get_json(silent=True) or {}
-    next_poll_at = data.get('next_poll_at', 0)
-
-    sync_state.set_next_poll(next_poll_at)
-    sync_state.broadcast_poll_timer(next_poll_at)
-    return jsonify({'status': 'ok'})
-
-
 @sync_bp.route('/api/sync-implement', methods=['POST'])
 def api_sync_implement():
     """
@@ -225,6 +210,26 @@ def api_ui_state():
     return jsonify(ui_state.get_state(session_id=session_id))
 
 
+@sync_bp.route('/api/state-snapshot', methods=['GET'])
+def api_state_snapshot():
+    """
+    Return a versioned state document (``ui``, ``consensus`` or ``headers``).
+
+    Clients fetch this when a ``state-patch`` does not follow on from the
+    version they hold.  Accepts an optional ``session_id`` query parameter
+    to personalise the ``ui`` document's consensus tooltip.
+    """
+    doc = request.args.get('doc', '').strip()
+    if doc == 'ui':
+        session_id = request.args.get('session_id', '').strip() or None
+        return jsonify(ui_state.get_snapshot_event(session_id=session_id))
+    if doc == 'consensus':
+        return jsonify(consensus_state.get_snapshot_event())
+    if doc == 'headers':
+        return jsonify(sync_state.get_headers_snapshot_event())
+    return jsonify({'error': f'Unknown state document: {doc}'}), 400
+
+
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
 def _is_original_value(ticket_id: str, field: str, value: str) -> bool:
@@ -3,14 +3,12 @@ Validation ticket routes — broadcast, check, and hydrate.
 
 /api/trigger-validation-load        (POST, shared broadcast trigger)
 /api/validation-broadcast           (GET, long-lived SSE)
-/api/check-validation-tickets       (GET, polling diff)
+/api/validation-broadcast/clients   (GET, per-client delivery / lag metrics)
+/api/check-validation-tickets       (GET, diff against the polled queue)
 /api/get-single-validation-ticket   (GET, single ticket hydration)
 """
 
-import json
 import threading
-import concurrent.futures
-import queue as _queue_module
 import uuid
 
 from flask import Blueprint, request, jsonify, current_app
@@ -18,13 +16,17 @@ from flask import Blueprint, request, jsonify, current_app
 from services.athena import Athena
 from services.output import Output
 
-from app.config import DEBUG, VALIDATION_FETCH_MAX_WORKERS, VALIDATION_FETCH_TOTAL_TIMEOUT
+from app.config import (
+    DEBUG, VALIDATION_FETCH_MAX_WORKERS, VALIDATION_INCREMENTAL_REFRESH, SSE_KEEPALIVE_INTERVAL,
+)
 from app.logic.ticket_format import format_validation_ticket
+from app.logic.validation_fetch import fetch_validation_tickets, FETCH_TIMEOUT_MESSAGE
 from app.state import validation_cache
+from app.state import consensus_state
 from app.state import recommendation_state
 from app.state import sync_state
 from app.state import ui_state
-from app.state import recommendation_originals
+from app.state import validation_poller
 
 validation_bp = Blueprint('validation', __name__)
 
@@ -44,6 +46,14 @@ def api_trigger_validation_load():
             'count': validation_cache.get_ticket_count(),
         })
 
+    # Stale but loaded: refresh only what changed instead of reloading
+    if state == 'loaded' and VALIDATION_INCREMENTAL_REFRESH:
+        validation_poller.start_refresh()
+        return jsonify({
+            'status': 'refreshing',
+            'count': validation_cache.get_ticket_count(),
+        })
+
     # Transition to loading and start background fetch
     validation_cache.set_loading()
     validation_cache.broadcast('state', {'state': 'loading'}, buffer=False)
@@ -65,60 +75,98 @@ def api_validation_broadcast():
     if not session_id:
         session_id = str(uuid.uuid4())
 
-    client_queue, current_state, load_buffer_snapshot, cached_tickets = \
-        validation_cache.register_client(session_id)
+    # EventSource sends Last-Event-ID on its own reconnects; the client
+    # passes it as a query parameter when it reopens the stream itself.
+    last_event_id = (
+        request.headers.get('Last-Event-ID', '').strip()
+        or request.args.get('last_event_id', '').strip()
+        or None
+    )
+
+    # Refused while draining for shutdown or at the per-worker connection
+    # limit; EventSource retries on its own.
+    if not validation_cache.accepts_client(session_id):
+        return jsonify({'error': 'Broadcast unavailable, retry shortly'}), 503, {'Retry-After': '5'}
+
+    (channel, current_state, load_buffer_snapshot, cached_tickets,
+     missed_frames, current_event_id) = validation_cache.register_client(session_id, last_event_id)
+
+    encode = validation_cache.encode_event
 
     def generate():
         try:
+            # ── Resume: replay only the frames this client missed ─────────
+            if missed_frames is not None:
+                yield from missed_frames
+                if DEBUG:
+                    Output().add_line(
+                        f'api_validation_broadcast: client {session_id[:8]}… resumed '
+                        f'after {last_event_id} ({len(missed_frames)} missed)'
+                    )
+
             # ── Initial state burst ───────────────────────────────────────
-            if current_state == 'loaded' and cached_tickets:
-                yield f"event: state\ndata: {json.dumps({'state': 'loaded'})}\n\n"
-                yield f"event: count\ndata: {json.dumps({'count': len(cached_tickets)})}\n\n"
+            elif current_state == 'loaded' and cached_tickets:
+                yield encode('state', {'state': 'loaded'})
+                yield encode('count', {'count': len(cached_tickets)})
                 for ticket in cached_tickets:
-                    yield f"event: ticket\ndata: {json.dumps(ticket)}\n\n"
-                yield f"event: complete\ndata: {json.dumps({'count': len(cached_tickets)})}\n\n"
+                    yield encode('ticket', ticket)
+                yield encode('complete', {'count': len(cached_tickets)})
 
                 # Replay recommendation state
                 rec_cache = recommendation_state.get_cache()
                 rec_toggle = recommendation_state.is_active()
                 rec_error_count = recommendation_state.get_error_count()
-                yield f"event: recommendation-toggle\ndata: {json.dumps({'active': rec_toggle})}\n\n"
+                yield encode('recommendation-toggle', {'active': rec_toggle})
                 for tid, rec_data in rec_cache.items():
-                    yield f"event: recommendation-complete\ndata: {json.dumps({'ticket_id': tid, 'data': rec_data})}\n\n"
+                    yield encode('recommendation-complete', {'ticket_id': tid, 'data': rec_data})
                 if rec_cache or rec_error_count:
-                    yield f"event: recommendation-progress\ndata: {json.dumps({'completed': len(rec_cache) + rec_error_count, 'total': len(cached_tickets)})}\n\n"
+                    yield encode('recommendation-progress', {'completed': len(rec_cache) + rec_error_count, 'total': len(cached_tickets)})
 
                 # Replay sync state
                 sync_checkboxes = sync_state.get_checkbox_state()
                 sync_assignments = sync_state.get_assignment_selections()
                 sync_editors = sync_state.get_assignment_editors()
-                sync_headers = sync_state.compute_all_headers()
                 sync_next_poll = sync_state.get_next_poll()
                 if sync_checkboxes or sync_editors:
-                    yield f"event: sync-state-burst\ndata: {json.dumps({'checkboxes': sync_checkboxes, 'assignments': sync_assignments, 'editors': sync_editors, 'headers': sync_headers, 'next_poll_at': sync_next_poll})}\n\n"
+                    yield encode('sync-state-burst', {'checkboxes': sync_checkboxes, 'assignments': sync_assignments, 'editors': sync_editors, 'next_poll_at': sync_next_poll})
+                elif sync_next_poll:
+                    yield encode('poll-timer-sync', {'next_poll_at': sync_next_poll, 'paused': recommendation_state.is_processing()})
 
             elif current_state == 'loading':
-                yield f"event: state\ndata: {json.dumps({'state': 'loading'})}\n\n"
-                for msg in load_buffer_snapshot:
-                    yield f"event: {msg['event']}\ndata: {json.dumps(msg['data'])}\n\n"
+                yield encode('state', {'state': 'loading'})
+                # Frames were encoded once when they were first broadcast
+                yield from load_buffer_snapshot
             else:
-                yield f"event: state\ndata: {json.dumps({'state': 'idle'})}\n\n"
-
-            # Always replay centralised UI state for the three workflow buttons
-            # (sent after the if/elif/else so it applies regardless of cache state)
-            # Use session_id for per-session consensus tooltip personalisation
-            yield f"event: ui-state-update\ndata: {json.dumps(ui_state.get_state(session_id=session_id))}\n\n"
+                yield encode('state', {'state': 'idle'})
+
+            if missed_frames is None:
+                # Always send snapshots of the versioned state documents
+                # (sent after the if/elif/else so they apply regardless of
+                # cache state); later changes arrive as state-patch deltas.
+                # Patches already queued for this channel that the snapshots
+                # include carry an older version and are ignored by the client.
+                yield encode('state-snapshot', sync_state.get_headers_snapshot_event())
+                yield encode('state-snapshot', consensus_state.get_snapshot_event())
+                # The ui snapshot is personalised for this session's consensus
+                # tooltip and tagged with the current event ID so a later
+                # reconnect resumes here.
+                yield encode('state-snapshot', ui_state.get_snapshot_event(session_id=session_id),
+                             event_id=current_event_id)
 
             # ── Relay broadcast events ────────────────────────────────────
-            while True:
-                try:
-                    msg = client_queue.get(timeout=10)
-                    yield f"event: {msg['event']}\ndata: {json.dumps(msg['data'])}\n\n"
-                except _queue_module.Empty:
-                    yield ': keepalive\n\n'
+            # Ends after a resync frame (overflow), when a newer connection
+            # for this session replaces the channel, or once the channel has
+            # drained on shutdown; the browser reconnects and resumes from
+            # its last event ID.
+            while channel.is_open:
+                frame = channel.get(timeout=SSE_KEEPALIVE_INTERVAL)
+                if frame is not None:
+                    yield frame
+                elif channel.is_open:
+                    yield b': keepalive\n\n'
 
         finally:
-            validation_cache.unregister_client(session_id, client_queue)
+            validation_cache.unregister_client(session_id, channel)
             if DEBUG:
                 output = Output()
                 output.add_line(f'api_validation_broadcast: client {session_id[:8]}… disconnected')
@@ -134,63 +182,36 @@ def api_validation_broadcast():
     )
 
 
+@validation_bp.route('/api/validation-broadcast/clients', methods=['GET'])
+def api_validation_broadcast_clients():
+    """Return delivery and lag metrics for every open broadcast connection."""
+    return jsonify(validation_cache.get_client_stats())
+
+
 # ── Polling diff ──────────────────────────────────────────────────────────────
 
 @validation_bp.route('/api/check-validation-tickets', methods=['GET'])
 def api_check_validation_tickets():
-    output = Output()
+    """
+    Diff the caller's displayed ticket IDs against the Validation queue last
+    seen by the server-side poller.
+
+    Purges and auto-queueing are applied by :mod:`validation_poller` once per
+    poll, so this endpoint never queries Athena and has no side effects.
+    """
     ids_param = request.args.get('ids', '').strip()
     displayed_ids = set(
         i.strip() for i in ids_param.split(',') if i.strip()
     ) if ids_param else set()
 
-    try:
-        athena = Athena()
-        current_ids = athena.get_validation_tickets()
-        if current_ids is None:
-            return jsonify({'error': 'Failed to fetch validation tickets from Athena'}), 500
-
-        current_set = set(current_ids)
-        left_queue = list(displayed_ids - current_set)
-        new_in_queue = list(current_set - displayed_ids)
-
-        result = {
-            'still_in_queue': list(displayed_ids & current_set),
-            'left_queue': left_queue,
-            'new_in_queue': new_in_queue,
-        }
-
-        # Purge caches for tickets that left
-        if left_queue:
-            recommendation_state.purge_tickets(left_queue)
-            recommendation_originals.purge_tickets(left_queue)
-            sync_state.purge_tickets(left_queue)
-            if DEBUG:
-                output.add_line(
-                    f"check-validation-tickets: purged {len(left_queue)} "
-                    f"ticket(s) that left the queue"
-                )
-
-        # Auto-queue recommendations for new tickets if toggle is ON
-        if new_in_queue and recommendation_state.is_active():
-            recommendation_state.queue_for_tickets(new_in_queue)
-            if DEBUG:
-                output.add_line(
-                    f"check-validation-tickets: auto-queued {len(new_in_queue)} "
-                    f"new ticket(s) for recommendations"
-                )
-
-        if DEBUG:
-            output.add_line(
-                f"check-validation-tickets: displayed={len(displayed_ids)}, "
-                f"left={len(left_queue)}, new={len(new_in_queue)}"
-            )
+    current_set = set(validation_poller.get_queue())
 
-        return jsonify(result)
-
-    except Exception as e:
-        output.add_line(f"Error in api_check_validation_tickets: {e}")
-        return jsonify({'error': str(e)}), 500
+    return jsonify({
+        'still_in_queue': list(displayed_ids & current_set),
+        'left_queue': list(displayed_ids - current_set),
+        'new_in_queue': list(current_set - displayed_ids),
+        'checked_at': validation_poller.get_checked_at(),
+    })
 
 
 # ── Single ticket hydration ──────────────────────────────────────────────────
@@ -229,17 +250,6 @@ def _do_validation_fetch() -> None:
     """
     output = Output()
 
-    def _fetch_one(args):
-        index, ticket_id = args
-        try:
-            a = Athena()
-            ticket_data = a.get_ticket_data(ticket_number=ticket_id, view=True)
-            if ticket_data and ticket_data.get('result'):
-                return (index, ticket_id, ticket_data['result'][0], None)
-            return (index, ticket_id, None, 'Failed to fetch ticket data')
-        except Exception as exc:
-            return (index, ticket_id, None, str(exc))
-
     try:
         athena = Athena()
         ticket_ids = athena.get_validation_tickets()
@@ -263,50 +273,26 @@ def _do_validation_fetch() -> None:
         validation_cache.broadcast('count', {'count': total})
 
         fetched: list = []
-        executor = concurrent.futures.ThreadPoolExecutor(max_workers=VALIDATION_FETCH_MAX_WORKERS)
-        future_to_args = {
-            executor.submit(_fetch_one, (i, tid)): (i, tid)
-            for i, tid in enumerate(ticket_ids)
-        }
-
-        try:
-            for future in concurrent.futures.as_completed(
-                    future_to_args, timeout=VALIDATION_FETCH_TOTAL_TIMEOUT):
-                i, tid = future_to_args[future]
-                try:
-                    index, ticket_id, ticket, err = future.result()
-                    if ticket:
-                        vt = format_validation_ticket(ticket, index)
-                        fetched.append(vt)
-                        validation_cache.broadcast('ticket', vt)
-                        if DEBUG:
-                            output.add_line(f'_do_validation_fetch: broadcast ticket {ticket_id} (index {index})')
-                    else:
-                        validation_cache.broadcast('error', {
-                            'index': index, 'ticket_id': ticket_id,
-                            'message': err or 'Failed to fetch ticket data',
-                        })
-                except Exception as exc:
-                    validation_cache.broadcast('error', {
-                        'index': i, 'ticket_id': tid, 'message': str(exc),
-                    })
-
-        except concurrent.futures.TimeoutError:
-            for future, (i, tid) in future_to_args.items():
-                if not future.done():
-                    output.add_line(f'_do_validation_fetch: timeout waiting for ticket {tid}')
-                    validation_cache.broadcast('error', {
-                        'index': i, 'ticket_id': tid,
-                        'message': 'Timeout: Athena did not respond in time',
-                    })
-
-        finally:
-            executor.shutdown(wait=False)
+        for index, ticket_id, vt, err in fetch_validation_tickets(list(enumerate(ticket_ids))):
+            if vt:
+                fetched.append(vt)
+                validation_cache.broadcast('ticket', vt)
+                if DEBUG:
+                    output.add_line(f'_do_validation_fetch: broadcast ticket {ticket_id} (index {index})')
+            else:
+                if err == FETCH_TIMEOUT_MESSAGE:
+                    output.add_line(f'_do_validation_fetch: timeout waiting for ticket {ticket_id}')
+                validation_cache.broadcast('error', {
+                    'index': index, 'ticket_id': ticket_id,
+                    'message': err or 'Failed to fetch ticket data',
+                })
 
         validation_cache.set_loaded(fetched)
         validation_cache.broadcast('complete', {'count': len(fetched)})
         # Update tickets_in_view so button_rules recomputes all buttons
         ui_state.set_tickets_in_view(len(fetched))
+        # Queue changes from here on are detected by the server-side poller
+        validation_poller.start(ticket_ids)
 
         if DEBUG:
             output.add_line(f'_do_validation_fetch: complete, {len(fetched)} tickets cached')
@@ -315,4 +301,4 @@ def _do_validation_fetch() -> None:
         output.add_line(f'_do_validation_fetch: fatal error: {e}')
         validation_cache.set_idle()
         validation_cache.broadcast('error', {'message': str(e)})
-        ui_state.set_tickets_in_view(0)
\ No newline at end of file
+        ui_state.set_tickets_in_view(0)
@@ -0,0 +1,161 @@
+"""
+Per-client SSE delivery channel.
+
+Replaces the plain ``queue.Queue`` per validation-broadcast connection with a
+bounded, backpressure-aware buffer:
+
+- **Coalescing** — state-style events (the latest value is all that matters)
+  replace any undelivered frame with the same coalesce key instead of
+  queueing behind it, so a slow browser receives one up-to-date frame rather
+  than a backlog of stale ones.
+- **Explicit overflow** — when the non-coalescable backlog reaches the limit
+  the pending frames are discarded and the client is sent a single
+  ``resync`` event, after which the stream closes; the browser reconnects
+  and resumes from the server's replay buffer (or takes a fresh snapshot).
+- **Lag metrics** — each channel tracks what it delivered, coalesced and
+  how far it trails the newest broadcast.
+- **Draining** — on server shutdown a channel stops accepting frames,
+  delivers what is already queued and then closes, so the stream ends
+  cleanly and the browser reconnects (with ``Last-Event-ID``) elsewhere.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from app.config import SSE_CLIENT_QUEUE_SIZE
+
+
+class ClientChannel:
+    """Bounded, coalescing frame buffer for one SSE connection."""
+
+    def __init__(self, session_id: str, resync_frame: bytes, start_seq: int = 0,
+                 max_pending: int = SSE_CLIENT_QUEUE_SIZE):
+        """
+        Args:
+            session_id: Session the connection belongs to.
+            resync_frame: Frame sent (once) when the channel overflows.
+            start_seq: Broadcast sequence number the client is caught up to.
+            max_pending: Undelivered frames allowed before overflowing.
+        """
+        self.session_id = session_id
+        self.max_pending = max_pending
+        self._resync_frame = resync_frame
+        self._cond = threading.Condition()
+        # key -> (seq, frame, enqueued_at); key is the coalesce key for
+        # coalescable events and the unique sequence number otherwise
+        self._pending: OrderedDict = OrderedDict()
+        self._overflowed = False
+        self._draining = False
+        self._closed = False
+
+        self.connected_at = time.time()
+        self.delivered = 0
+        self.coalesced = 0
+        self.overflows = 0
+        self.last_enqueued_seq = start_seq
+        self.last_delivered_seq = start_seq
+        self.last_delivered_at = 0.0
+
+    # ── Producer side ─────────────────────────────────────────────────────
+
+    def put(self, seq: int, frame: bytes, coalesce_key=None) -> bool:
+        """
+        Enqueue *frame* (broadcast sequence number *seq*).
+
+        A frame with a *coalesce_key* replaces an undelivered frame with the
+        same key and moves to the back of the queue.
+
+        Returns:
+            False if the channel is closed or just overflowed (the caller
+            should stop sending to it), True otherwise.
+        """
+        with self._cond:
+            if self._closed or self._overflowed or self._draining:
+                return False
+
+            now = time.time()
+            if coalesce_key is not None and coalesce_key in self._pending:
+                del self._pending[coalesce_key]
+                self.coalesced += 1
+            elif len(self._pending) >= self.max_pending:
+                self._pending.clear()
+                self._overflowed = True
+                self.overflows += 1
+                self._cond.notify()
+                return False
+
+            key = coalesce_key if coalesce_key is not None else seq
+            self._pending[key] = (seq, frame, now)
+            self.last_enqueued_seq = seq
+            self._cond.notify()
+            return True
+
+    def drain(self) -> None:
+        """Stop accepting frames; the channel closes once the queued ones are delivered."""
+        with self._cond:
+            self._draining = True
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """Close the channel; a waiting consumer returns immediately."""
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+
+    # ── Consumer side ─────────────────────────────────────────────────────
+
+    @property
+    def is_open(self) -> bool:
+        with self._cond:
+            return not self._closed
+
+    def get(self, timeout: float) -> bytes | None:
+        """
+        Return the next frame, waiting up to *timeout* seconds.
+
+        Returns ``None`` on timeout or once the channel is closed.  After an
+        overflow the single ``resync`` frame is returned and the channel
+        closes; a draining channel closes once its queue is empty.
+        """
+        with self._cond:
+            if not self._pending and not self._overflowed and not self._closed and not self._draining:
+                self._cond.wait(timeout)
+
+            if self._closed:
+                return None
+            if self._overflowed:
+                self._closed = True
+                return self._resync_frame
+            if not self._pending:
+                if self._draining:
+                    self._closed = True
+                return None
+
+            _, (seq, frame, _) = self._pending.popitem(last=False)
+            self.delivered += 1
+            self.last_delivered_seq = seq
+            self.last_delivered_at = time.time()
+            return frame
+
+    # ── Metrics ───────────────────────────────────────────────────────────
+
+    def stats(self, current_seq: int) -> dict:
+        """Return delivery / lag metrics relative to broadcast *current_seq*."""
+        with self._cond:
+            oldest = next(iter(self._pending.values()), None)
+            return {
+                'session_id': self.session_id,
+                'connected_for': round(time.time() - self.connected_at, 1),
+                'pending': len(self._pending),
+                'max_pending': self.max_pending,
+                'delivered': self.delivered,
+                'coalesced': self.coalesced,
+                'overflows': self.overflows,
+                'lag_events': max(0, current_seq - self.last_delivered_seq),
+                'oldest_pending_age': round(time.time() - oldest[2], 3) if oldest else 0.0,
+                'last_delivered_at': self.last_delivered_at,
+                'draining': self._draining,
+                'closed': self._closed,
+            }
@@ -17,7 +17,7 @@ import threading
 
 from app.config import CONSENSUS_TICKET_THRESHOLD
 from app.state import presence as presence_state
-from app.state import validation_cache
+from app.state import state_documents
 
 _lock = threading.Lock()
 _active: bool = False
@@ -55,7 +55,7 @@ def get_state() -> dict:
     with _lock:
         return {
             'active': _active,
-            'agreed': list(_votes),
+            'agreed': sorted(_votes),
             'required': active_count,
             'unlocked': _active and active_count > 0 and len(_votes) >= active_count,
             'full_assignment_active': _full_assignment_active,
@@ -163,9 +163,13 @@ def revoke_full_assignment_disagree(session_id: str) -> dict:
 
 
 def broadcast_state() -> None:
-    """Broadcast the current consensus state to all connected SSE clients."""
-    state = get_state()
-    validation_cache.broadcast('consensus-state', state, buffer=False)
+    """Publish the current consensus state; clients receive only the delta."""
+    _document.replace(get_state())
+
+
+def get_snapshot_event() -> dict:
+    """Return a ``state-snapshot`` payload for the ``consensus`` document."""
+    return _document.snapshot_event()
 
 
 def check_after_presence_change() -> None:
@@ -208,4 +212,10 @@ def reset_after_implement() -> dict:
         _votes.clear()
         _full_assignment_active = False
         _consensus_checked_ids.clear()
-    return get_state()
\ No newline at end of file
+    return get_state()
+
+
+# ── State document ────────────────────────────────────────────────────────────
+# Registered last because the initial state is built with get_state().
+
+_document = state_documents.register('consensus', get_state())
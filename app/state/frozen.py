@@ -0,0 +1,75 @@
+"""
+Immutable snapshots for read-heavy state modules.
+
+State modules keep their shared structures as deeply frozen values and
+replace them wholesale on every write (copy-on-write).  Readers simply
+return the current reference — no lock, no copy — and can never observe a
+half-applied mutation, because published values are never modified.
+
+:class:`FrozenDict` subclasses ``dict`` so frozen values still serialize
+with ``json.dumps`` / ``jsonify`` and compare equal to plain dicts.
+"""
+
+
+class FrozenDict(dict):
+    """A ``dict`` that refuses mutation after construction."""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError('FrozenDict is read-only; build a new one instead')
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __repr__(self):
+        return f'FrozenDict({dict.__repr__(self)})'
+
+
+EMPTY = FrozenDict()
+
+
+def freeze(value):
+    """
+    Return a deeply immutable version of *value*.
+
+    Dicts become :class:`FrozenDict`, lists and tuples become tuples and
+    sets become frozensets; other values are returned unchanged.  Values
+    that are already a :class:`FrozenDict` are assumed to be deeply frozen.
+    """
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def assoc(mapping: FrozenDict, key, value) -> FrozenDict:
+    """Return a copy of *mapping* with *key* set to (frozen) *value*."""
+    updated = dict(mapping)
+    updated[key] = freeze(value)
+    return FrozenDict(updated)
+
+
+def dissoc(mapping: FrozenDict, keys) -> FrozenDict:
+    """Return a copy of *mapping* without *keys* (the same object if none are present)."""
+    drop = [k for k in keys if k in mapping]
+    if not drop:
+        return mapping
+    updated = dict(mapping)
+    for key in drop:
+        del updated[key]
+    return FrozenDict(updated)
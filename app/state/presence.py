@@ -11,6 +11,7 @@ import time
 from collections import Counter
 
 from app.config import SESSION_EXPIRY_SECONDS, PRESENCE_COLORS
+from services import metrics
 
 _lock = threading.Lock()
 _active_sessions: dict = {}   # session_id -> {last_seen, color, label}
@@ -107,3 +108,6 @@ def get_session_info(session_id: str) -> dict | None:
             'color': info['color'],
             'label': info['label'],
         }
+
+
+metrics.gauge('presence_active_sessions', 'Viewers currently present.', callback=get_active_count)
@@ -8,44 +8,32 @@ matches the original or represents a change.
 This is the authoritative reference for "what did the AI originally
 recommend?" — used by :mod:`ticket_header_rules` to decide whether editor
 attribution should be applied or cleared.
-"""
 
-import threading
+Originals are stored on each ticket's :mod:`ticket_store` record and purged
+with the rest of the ticket's state by :func:`ticket_store.purge_tickets`.
+"""
 
-_lock = threading.Lock()
-_originals: dict = {}   # ticket_id -> {'support_group': str, 'priority': str}
+from app.state import ticket_store
 
 
 def set_original(ticket_id: str, support_group: str, priority: str) -> None:
     """Store the original AI recommendation for a ticket."""
-    with _lock:
-        _originals[ticket_id] = {
-            'support_group': support_group or '',
-            'priority': priority or '',
-        }
+    ticket_store.update(ticket_id, original={
+        'support_group': support_group or '',
+        'priority': priority or '',
+    })
 
 
 def get_original(ticket_id: str) -> dict | None:
     """Return the original recommendation for a ticket, or None if not stored."""
-    with _lock:
-        entry = _originals.get(ticket_id)
-        return dict(entry) if entry else None
+    return ticket_store.get(ticket_id).original
 
 
 def get_all() -> dict:
-    """Return a copy of all stored originals."""
-    with _lock:
-        return {k: dict(v) for k, v in _originals.items()}
-
-
-def purge_tickets(ticket_ids: list[str]) -> None:
-    """Remove stored originals for the given ticket IDs."""
-    with _lock:
-        for tid in ticket_ids:
-            _originals.pop(tid, None)
+    """Return all stored originals (an immutable snapshot; no copy is made)."""
+    return ticket_store.view('original')
 
 
 def clear() -> None:
     """Remove all stored originals."""
-    with _lock:
-        _originals.clear()
\ No newline at end of file
+    ticket_store.clear_field('original')
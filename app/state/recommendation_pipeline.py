@@ -0,0 +1,160 @@
+"""
+Staged execution of the ticket-advice pipeline.
+
+Each stage of :data:`app.logic.ticket_advice.STAGES` (Athena fetch, keyword
+match, embedding, retrieval, LLM) gets its own pool of worker threads and a
+bounded input queue.  A ticket moves from stage to stage, so while one
+ticket waits on the LLM the next is being embedded and a third fetched:
+throughput is bounded by the slowest stage instead of the sum of them all.
+
+Stage queues are priority queues: each ticket carries the scheduler's
+``(tier, score, seq)`` key, re-read every time it is handed to a stage, so
+a ticket prioritised after admission still overtakes the tickets waiting
+in front of every stage instead of queueing behind them.
+
+Backpressure is per stage: a worker that finishes a ticket blocks on the
+next stage's queue while it is full, which in turn stops it taking more
+work from its own queue, back up to :meth:`RecommendationPipeline.run`.
+
+Pool sizes and queue bounds come from ``RECOMMENDATION_PIPELINE_*`` in
+:mod:`app.config`.  The current trace (:mod:`app.state.tracing`) of the
+caller follows the ticket through every stage.
+"""
+
+import contextvars
+import itertools
+import queue
+import threading
+
+from app.logic.ticket_advice import AdviceRequest, STAGES
+from services import metrics
+
+
+_order = itertools.count()   # FIFO tie-break between jobs with equal priority
+
+
+class _Job:
+    __slots__ = ('advice', 'context', 'priority', 'cancelled', 'error', 'done')
+
+    def __init__(self, advice: AdviceRequest, priority, cancelled):
+        self.advice = advice
+        self.context = contextvars.copy_context()
+        self.priority = priority
+        self.cancelled = cancelled
+        self.error: Exception | None = None
+        self.done = threading.Event()
+
+    def entry(self) -> tuple:
+        """Queue entry ordered by the job's current priority, then arrival."""
+        return (self.priority() if self.priority is not None else (), next(_order), self)
+
+
+class _Stage:
+    """One worker pool reading from a bounded priority queue."""
+
+    def __init__(self, name: str, fn, workers: int, queue_size: int):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.queue: queue.PriorityQueue = queue.PriorityQueue(maxsize=max(1, queue_size))
+        self.next: '_Stage | None' = None
+        self.busy = 0
+        self._lock = threading.Lock()
+        self._threads: list = []
+
+    def start(self) -> None:
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=self._work, name=f'pipeline-{self.name}-{len(self._threads) + 1}', daemon=True)
+                self._threads.append(thread)
+                thread.start()
+
+    def _work(self) -> None:
+        while True:
+            job = self.queue.get()[-1]
+            with self._lock:
+                self.busy += 1
+            try:
+                if job.cancelled is not None and job.cancelled():
+                    job.advice.finish(None)
+                else:
+                    job.context.run(self.fn, job.advice)
+            except Exception as exc:
+                job.error = exc
+            finally:
+                with self._lock:
+                    self.busy -= 1
+            if job.error is not None or job.advice.done or self.next is None:
+                job.done.set()
+            else:
+                self.next.queue.put(job.entry())   # blocks while the next stage is saturated
+
+    def stats(self) -> dict:
+        with self._lock:
+            busy = self.busy
+        return {
+            'workers': self.workers,
+            'busy': busy,
+            'queued': self.queue.qsize(),
+            'queue_size': self.queue.maxsize,
+        }
+
+
+class RecommendationPipeline:
+    """The advice stages chained through bounded queues."""
+
+    def __init__(self, workers: dict, queue_size: int, stages=STAGES):
+        """
+        *workers* maps stage name to pool size; *queue_size* bounds the
+        number of tickets waiting in front of each stage.
+        """
+        self._stages = [_Stage(name, fn, workers.get(name, 1), queue_size) for name, fn in stages]
+        for stage, following in zip(self._stages, self._stages[1:]):
+            stage.next = following
+        self._started = False
+        self._start_lock = threading.Lock()
+
+    def run(self, ticket_number: str, priority=None, cancelled=None) -> dict | None:
+        """
+        Run *ticket_number* through every stage and return the advice result
+        (as :func:`~app.logic.ticket_advice.get_ticket_advice` would).
+
+        Blocks until the ticket leaves the pipeline.  *priority* is an
+        optional zero-argument callable returning the ticket's sort key
+        (lower runs first), read whenever the ticket enters a stage queue.
+        *cancelled* is an optional zero-argument callable checked before
+        each stage; once it returns True the remaining stages are skipped
+        and the result is None.
+        Exceptions raised by a stage are re-raised here.
+        """
+        self._ensure_started()
+        job = _Job(AdviceRequest(ticket_number), priority, cancelled)
+        self._stages[0].queue.put(job.entry())
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.advice.result
+
+    def stats(self) -> dict:
+        """``{stage: {workers, busy, queued, queue_size}}`` in pipeline order."""
+        return {stage.name: stage.stats() for stage in self._stages}
+
+    def _ensure_started(self) -> None:
+        if self._started:
+            return
+        with self._start_lock:
+            if not self._started:
+                for stage in self._stages:
+                    stage.start()
+                self._started = True
+
+
+def register_metrics(pipeline: RecommendationPipeline) -> None:
+    """Expose per-stage queue depth and busy workers of *pipeline* as gauges."""
+    metrics.gauge('recommendation_stage_queue_depth', 'Tickets waiting in front of a pipeline stage.',
+                  ('stage',), callback=lambda: {
+                      (name,): s['queued'] for name, s in pipeline.stats().items()})
+    metrics.gauge('recommendation_stage_busy_workers', 'Pipeline stage workers currently running.',
+                  ('stage',), callback=lambda: {
+                      (name,): s['busy'] for name, s in pipeline.stats().items()})
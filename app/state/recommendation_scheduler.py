@@ -0,0 +1,209 @@
+"""
+Priority scheduler for recommendation work.
+
+A fixed pool of long-lived worker threads takes ticket IDs from one priority
+queue (a ``heapq`` ordered by ``(tier, score, submission order)``) and runs
+the handler for each.  Replaces an executor per batch: there is no batch
+deadline, and work submitted later can overtake work submitted earlier.
+
+* **Tiers** — :data:`NOW` (an explicit "recommend this now"),
+  :data:`FOCUS` (a viewer has the ticket open) and :data:`NORMAL`.
+* **Deduplication** — a ticket is queued at most once.  Submitting it again
+  with a better ``(tier, score)`` re-prioritises it; queued entries are
+  invalidated in place and skipped when popped.  Tickets in flight are not
+  re-queued, but a better key is recorded for them (see :meth:`priority`)
+  so downstream queues can move them ahead too.
+* **Cancellation** — :meth:`cancel` drops queued tickets and marks in-flight
+  ones so their handler can discard the result (see :meth:`is_cancelled`).
+
+Listeners registered with :meth:`add_listener` are called (outside the lock)
+whenever the queue or the in-flight set changes, so progress can be
+streamed to clients.
+"""
+
+import heapq
+import itertools
+import threading
+
+from services.output import Output
+
+NOW = 0
+FOCUS = 1
+NORMAL = 2
+
+# Index of the validity flag in a heap entry [tier, score, seq, ticket_id, valid]
+_VALID = 4
+
+
+class RecommendationScheduler:
+    """Long-lived worker pool fed by a deduplicating priority queue."""
+
+    def __init__(self, handler, workers: int, name: str = 'recommendation-worker'):
+        """
+        *handler* is called as ``handler(ticket_id)`` on a worker thread;
+        exceptions are logged and do not stop the worker.
+        """
+        self._handler = handler
+        self._worker_count = max(1, workers)
+        self._name = name
+        self._cond = threading.Condition()
+        self._heap: list = []
+        self._entries: dict = {}     # ticket_id -> live heap entry
+        self._seq = itertools.count()
+        self._in_flight: dict = {}    # ticket_id -> (tier, score, seq) it was admitted with
+        self._cancelled: set = set()  # in-flight tickets whose result must be discarded
+        self._threads: list = []
+        self._listeners: list = []
+
+    # ── Submission ────────────────────────────────────────────────────────
+
+    def submit(self, items, tier: int = NORMAL) -> list[str]:
+        """
+        Queue ``(ticket_id, score)`` pairs at *tier* (lower scores run first).
+
+        Returns:
+            Ticket IDs that were newly queued or moved ahead (in flight
+            tickets only have their :meth:`priority` raised); tickets already
+            at an equal or better position are skipped.
+        """
+        accepted = []
+        with self._cond:
+            for ticket_id, score in items:
+                running = self._in_flight.get(ticket_id)
+                if running is not None:
+                    if (tier, score) < running[:2]:
+                        self._in_flight[ticket_id] = (tier, score, running[2])
+                        accepted.append(ticket_id)
+                    continue
+                existing = self._entries.get(ticket_id)
+                if existing is not None:
+                    if (tier, score) >= (existing[0], existing[1]):
+                        continue
+                    existing[_VALID] = False
+                entry = [tier, score, next(self._seq), ticket_id, True]
+                heapq.heappush(self._heap, entry)
+                self._entries[ticket_id] = entry
+                accepted.append(ticket_id)
+            if accepted:
+                self._ensure_workers()
+                self._cond.notify(len(accepted))
+        if accepted:
+            self._notify()
+        return accepted
+
+    def cancel(self, ticket_ids) -> None:
+        """Drop *ticket_ids* from the queue and flag any in flight as cancelled."""
+        changed = False
+        with self._cond:
+            for ticket_id in ticket_ids:
+                entry = self._entries.pop(ticket_id, None)
+                if entry is not None:
+                    entry[_VALID] = False
+                    changed = True
+                if ticket_id in self._in_flight:
+                    self._cancelled.add(ticket_id)
+            self._compact()
+        if changed:
+            self._notify()
+
+    def clear(self, keep_tier: int | None = NOW) -> None:
+        """Drop every queued ticket except those at *keep_tier* or better (None drops all)."""
+        changed = False
+        with self._cond:
+            for ticket_id, entry in list(self._entries.items()):
+                if keep_tier is None or entry[0] > keep_tier:
+                    entry[_VALID] = False
+                    del self._entries[ticket_id]
+                    changed = True
+            self._compact()
+        if changed:
+            self._notify()
+
+    # ── Introspection ─────────────────────────────────────────────────────
+
+    def is_queued(self, ticket_id: str) -> bool:
+        with self._cond:
+            return ticket_id in self._entries
+
+    def is_cancelled(self, ticket_id: str) -> bool:
+        """True if *ticket_id* was cancelled while its handler was running."""
+        with self._cond:
+            return ticket_id in self._cancelled
+
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._entries)
+
+    def in_flight_count(self) -> int:
+        with self._cond:
+            return len(self._in_flight)
+
+    def priority(self, ticket_id: str) -> tuple:
+        """
+        ``(tier, score, seq)`` of an in-flight ticket (lower runs first),
+        including any promotion since it was admitted; ``()`` if unknown.
+        """
+        with self._cond:
+            return self._in_flight.get(ticket_id, ())
+
+    def snapshot(self) -> dict:
+        """Queued ticket IDs in run order (with their tier) and the in-flight set."""
+        with self._cond:
+            entries = sorted(self._entries.values())
+            in_flight = sorted(self._in_flight)
+        return {
+            'queued': [{'ticket_id': e[3], 'tier': e[0]} for e in entries],
+            'in_flight': in_flight,
+        }
+
+    def add_listener(self, callback) -> None:
+        """Call ``callback()`` after every queue or in-flight change."""
+        self._listeners.append(callback)
+
+    # ── Workers ───────────────────────────────────────────────────────────
+
+    def _ensure_workers(self) -> None:
+        """Start the worker threads on first use.  Caller holds the lock."""
+        while len(self._threads) < self._worker_count:
+            thread = threading.Thread(
+                target=self._work, name=f'{self._name}-{len(self._threads) + 1}', daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _compact(self) -> None:
+        """Rebuild the heap once invalidated entries dominate it.  Caller holds the lock."""
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._entries):
+            self._heap = [e for e in self._heap if e[_VALID]]
+            heapq.heapify(self._heap)
+
+    def _next(self) -> str:
+        with self._cond:
+            while True:
+                while self._heap:
+                    entry = heapq.heappop(self._heap)
+                    if entry[_VALID]:
+                        del self._entries[entry[3]]
+                        self._in_flight[entry[3]] = tuple(entry[:3])
+                        return entry[3]
+                self._cond.wait()
+
+    def _work(self) -> None:
+        while True:
+            ticket_id = self._next()
+            self._notify()
+            try:
+                self._handler(ticket_id)
+            except Exception as exc:
+                Output().add_line(f'{self._name}: handler failed for {ticket_id}: {exc}', level='ERROR')
+            finally:
+                with self._cond:
+                    self._in_flight.pop(ticket_id, None)
+                    self._cancelled.discard(ticket_id)
+                self._notify()
+
+    def _notify(self) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback()
+            except Exception as exc:
+                Output().add_line(f'{self._name}: listener failed: {exc}', level='ERROR')
@@ -3,24 +3,45 @@ Recommendation engine state.
 
 Tracks which tickets have cached recommendations, which are currently
 being processed, and whether the auto-recommend toggle is active.
+
+Queued tickets are admitted by a :class:`RecommendationScheduler` in
+priority order: explicit "recommend now" requests first, then tickets a
+viewer has open, then the rest by ticket priority and age
+(``RECOMMENDATION_PRIORITY_*`` in :mod:`app.config`).  Admitted tickets run
+through the staged :class:`RecommendationPipeline`, up to
+``RECOMMENDATION_PIPELINE_MAX_IN_FLIGHT`` at a time.  Tickets that leave
+the validation queue are cancelled through the :mod:`ticket_store` purge
+hook.
+
+Per-ticket data (cached recommendation, in-flight and error flags) lives
+on each ticket's :mod:`ticket_store` record; the accessors return its
+cached, immutable views without locking or copying.
 """
 
 import threading
-
-from app.config import RECOMMENDATION_MAX_WORKERS
-from app.logic.ticket_advice import get_ticket_advice
+import time
+from datetime import datetime
+
+from app.config import (
+    RECOMMENDATION_PRIORITY_WEIGHT_SECONDS, RECOMMENDATION_PRIORITY_RANKS,
+    RECOMMENDATION_DEFAULT_PRIORITY_RANK, RECOMMENDATION_PIPELINE_WORKERS,
+    RECOMMENDATION_PIPELINE_QUEUE_SIZE, RECOMMENDATION_PIPELINE_MAX_IN_FLIGHT,
+)
 from app.state import validation_cache
 from app.state import ui_state as _ui_state
 from app.state import recommendation_originals
+from app.state import ticket_store
+from app.state import tracing
+from app.state import recommendation_scheduler
+from app.state.recommendation_scheduler import RecommendationScheduler
+from app.state import recommendation_pipeline
+from app.state.recommendation_pipeline import RecommendationPipeline
 from services.output import Output
+from services import metrics
 from app.config import DEBUG
 
 _lock = threading.Lock()
-_cache: dict = {}              # ticket_id -> full recommendation dict
 _toggle: bool = False          # whether auto-recommend is active
-_processing: set = set()       # ticket_ids currently being processed
-_errors: set = set()           # ticket_ids that errored during processing
-_stop_event = threading.Event()  # signal to stop processing new tickets
 
 
 # ── Public accessors ──────────────────────────────────────────────────────────
@@ -37,73 +58,66 @@ def set_active(active: bool) -> None:
 
 
 def get_cache() -> dict:
-    with _lock:
-        return dict(_cache)
+    """Return the recommendation cache (an immutable snapshot; no copy is made)."""
+    return ticket_store.view('recommendation')
 
 
 def get_cached_count() -> int:
-    with _lock:
-        return len(_cache)
+    return len(ticket_store.view('recommendation'))
 
 
 def get_processing_list() -> list[str]:
-    with _lock:
-        return list(_processing)
+    return list(ticket_store.view('processing'))
+
+
+def is_processing() -> bool:
+    """Return True while any recommendation is in flight."""
+    return bool(ticket_store.view('processing'))
 
 
 def get_error_count() -> int:
-    with _lock:
-        return len(_errors)
+    return len(ticket_store.view('errored'))
 
 
 def clear_errors() -> None:
-    with _lock:
-        _errors.clear()
+    ticket_store.clear_field('errored')
 
 
-def purge_tickets(ticket_ids: list[str]) -> None:
-    """Remove tickets from cache, processing set, and errors set."""
-    with _lock:
-        for tid in ticket_ids:
-            _cache.pop(tid, None)
-            _processing.discard(tid)
-            _errors.discard(tid)
+def _is_pending(ticket_id: str) -> bool:
+    """True if *ticket_id* has neither a cached recommendation nor one in flight."""
+    record = ticket_store.get(ticket_id)
+    return record.recommendation is None and not record.processing
 
 
 def signal_stop() -> None:
-    """Signal processing threads to stop submitting new work."""
-    _stop_event.set()
-
-
-def clear_stop() -> None:
-    """Clear the stop signal so new processing can begin."""
-    _stop_event.clear()
+    """
+    Drop queued work; in-flight recommendations complete and are cached.
+    Explicit "recommend now" requests stay queued.
+    """
+    _scheduler.clear(keep_tier=recommendation_scheduler.NOW)
 
 
 # ── Single-ticket processing ─────────────────────────────────────────────────
 
 def process_single(ticket_id: str) -> None:
     """
-    Process a single ticket recommendation via the LLM pipeline and broadcast
-    the result to all connected clients.
-
-    Thread-safe: checks cache and processing set under the lock before
-    starting work.  Skips silently if already cached or in-progress.
-    Respects the stop event.
+    Process a single ticket recommendation via the staged LLM pipeline and
+    broadcast the result to all connected clients.
+
+    Thread-safe: checks the cache and in-flight flag and claims the ticket
+    atomically (under its store shard lock) before starting work.  Skips
+    silently if already cached or in-progress.  A ticket cancelled while
+    running (it left the queue) skips its remaining stages and its result
+    is discarded.
     """
     output = Output()
-
-    if _stop_event.is_set():
+    claimed = ticket_store.modify(ticket_id, lambda record: (
+        {'processing': True, 'errored': False}
+        if record.recommendation is None and not record.processing else None
+    ))
+    if not claimed:
         return
 
-    with _lock:
-        if ticket_id in _cache:
-            return
-        if ticket_id in _processing:
-            return
-        _processing.add(ticket_id)
-        _errors.discard(ticket_id)
-
     try:
         # Broadcast start
         validation_cache.broadcast('recommendation-start', {
@@ -113,11 +127,18 @@ def process_single(ticket_id: str) -> None:
         if DEBUG:
             output.add_line(f'process_single: starting {ticket_id}')
 
-        result = get_ticket_advice(ticket_id)
+        with tracing.trace(ticket_id) as trace:
+            result = _pipeline.run(
+                ticket_id,
+                priority=lambda: _scheduler.priority(ticket_id),
+                cancelled=lambda: _scheduler.is_cancelled(ticket_id),
+            )
 
-        if result and 'error' not in result:
-            with _lock:
-                _cache[ticket_id] = result
+        if _scheduler.is_cancelled(ticket_id):
+            if DEBUG:
+                output.add_line(f'process_single: discarded result for cancelled {ticket_id}')
+        elif result and 'error' not in result:
+            ticket_store.update(ticket_id, recommendation=result)
 
             # Store the original AI recommendations for server-side
             # header-state computation (ticket_header_rules).
@@ -130,6 +151,7 @@ def process_single(ticket_id: str) -> None:
             validation_cache.broadcast('recommendation-complete', {
                 'ticket_id': ticket_id,
                 'data': result,
+                'timings': trace.summary(),
             }, buffer=False)
 
             if DEBUG:
@@ -139,8 +161,7 @@ def process_single(ticket_id: str) -> None:
                 result.get('error', 'Unknown error') if result
                 else 'No result returned'
             )
-            with _lock:
-                _errors.add(ticket_id)
+            ticket_store.update(ticket_id, errored=True)
 
             validation_cache.broadcast('recommendation-error', {
                 'ticket_id': ticket_id,
@@ -151,8 +172,9 @@ def process_single(ticket_id: str) -> None:
                 output.add_line(f'process_single: error for {ticket_id}: {error_msg}')
 
     except Exception as exc:
-        with _lock:
-            _errors.add(ticket_id)
+        if _scheduler.is_cancelled(ticket_id):
+            return
+        ticket_store.update(ticket_id, errored=True)
 
         validation_cache.broadcast('recommendation-error', {
             'ticket_id': ticket_id,
@@ -163,19 +185,13 @@ def process_single(ticket_id: str) -> None:
             output.add_line(f'process_single: exception for {ticket_id}: {exc}')
 
     finally:
-        with _lock:
-            _processing.discard(ticket_id)
+        ticket_store.update(ticket_id, processing=False)
 
-        # Broadcast progress (count both cached and errored as "completed")
-        with _lock:
-            completed = len(_cache) + len(_errors)
+        # Progress is broadcast by the scheduler listener once the ticket
+        # leaves the in-flight set (see broadcast_progress).
+        completed = get_cached_count() + get_error_count()
         total = validation_cache.get_ticket_count()
 
-        validation_cache.broadcast('recommendation-progress', {
-            'completed': completed,
-            'total': total,
-        }, buffer=False)
-
         # Update centralised UI state progress tracker
         _ui_state.update_recommendation_progress(completed, total, ticket_id)
 
@@ -184,76 +200,134 @@ def process_single(ticket_id: str) -> None:
             _ui_state.set_recommendation_complete(total)
 
 
-# ── Batch processing ─────────────────────────────────────────────────────────
+# ── Progress ─────────────────────────────────────────────────────────────────
 
-def process_batch(ticket_ids: list[str]) -> None:
+def broadcast_progress() -> None:
     """
-    Background thread entry point: process recommendations for the given
-    ticket IDs using a ThreadPoolExecutor with controlled concurrency.
-
-    Stops submitting new work when the stop event is set, but allows
-    in-flight requests to complete.
+    Broadcast ``recommendation-progress`` (cached and errored both count as
+    completed) with the scheduler's queued and in-flight counts.  Registered
+    as the scheduler listener, so it runs on every queue change.
     """
-    import concurrent.futures
+    completed = get_cached_count() + get_error_count()
+    total = validation_cache.get_ticket_count()
+    validation_cache.broadcast('recommendation-progress', {
+        'completed': completed,
+        'total': total,
+        'queued': _scheduler.depth(),
+        'in_flight': _scheduler.in_flight_count(),
+    }, buffer=False)
 
-    output = Output()
-    if DEBUG:
-        output.add_line(f'process_batch: starting for {len(ticket_ids)} tickets')
 
-    executor = concurrent.futures.ThreadPoolExecutor(
-        max_workers=RECOMMENDATION_MAX_WORKERS
-    )
-    futures = {}
+# ── Scheduling ───────────────────────────────────────────────────────────────
 
+def _parse_timestamp(value) -> float | None:
+    if not value:
+        return None
     try:
-        for tid in ticket_ids:
-            if _stop_event.is_set():
-                if DEBUG:
-                    output.add_line('process_batch: stop event set, halting submissions')
-                break
-            with _lock:
-                if tid in _cache or tid in _processing:
-                    continue
-            future = executor.submit(process_single, tid)
-            futures[future] = tid
-
-        for future in concurrent.futures.as_completed(futures, timeout=600):
-            try:
-                future.result()
-            except Exception as exc:
-                tid = futures[future]
-                if DEBUG:
-                    output.add_line(f'process_batch: future error for {tid}: {exc}')
-
-    except concurrent.futures.TimeoutError:
-        if DEBUG:
-            output.add_line('process_batch: total timeout exceeded')
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
 
-    finally:
-        executor.shutdown(wait=False)
-        if DEBUG:
-            output.add_line('process_batch: finished')
+
+def _priority_rank(value) -> int:
+    """Rank of a ticket priority such as ``'2'``, ``'High'`` or ``'1 - Critical'``."""
+    text = str(value or '').strip().lower()
+    if text in RECOMMENDATION_PRIORITY_RANKS:
+        return RECOMMENDATION_PRIORITY_RANKS[text]
+    for token in text.replace('-', ' ').split():
+        if token in RECOMMENDATION_PRIORITY_RANKS:
+            return RECOMMENDATION_PRIORITY_RANKS[token]
+    return RECOMMENDATION_DEFAULT_PRIORITY_RANK
+
+
+def _scores(ticket_ids) -> list[tuple[str, float]]:
+    """
+    ``(ticket_id, score)`` pairs, lower scores first: the ticket's creation
+    time pushed back by ``RECOMMENDATION_PRIORITY_WEIGHT_SECONDS`` per priority
+    level.  Tickets no longer in the validation cache score as created now.
+    """
+    tickets = {t['id']: t for t in validation_cache.get_tickets()}
+    now = time.time()
+    pairs = []
+    for tid in ticket_ids:
+        ticket = tickets.get(tid) or {}
+        created = _parse_timestamp(ticket.get('created_at'))
+        score = (_priority_rank(ticket.get('priority')) * RECOMMENDATION_PRIORITY_WEIGHT_SECONDS
+                 + (created if created is not None else now))
+        pairs.append((tid, score))
+    return pairs
 
 
 def queue_for_tickets(ticket_ids: list[str]) -> list[str]:
     """
-    Start a background thread to process recommendations for tickets that
-    are not already cached or in-progress.
+    Queue recommendations for tickets that are not already cached or
+    in-progress.  Tickets already queued keep their place unless this
+    moves them ahead.
 
     Returns the list of ticket IDs that were actually queued.
     """
-    with _lock:
-        ids_to_process = [
-            tid for tid in ticket_ids
-            if tid not in _cache and tid not in _processing
-        ]
-
-    if ids_to_process:
-        clear_stop()
-        threading.Thread(
-            target=process_batch,
-            args=(ids_to_process,),
-            daemon=True,
-        ).start()
-
-    return ids_to_process
\ No newline at end of file
+    ids_to_process = [tid for tid in ticket_ids if _is_pending(tid)]
+    if not ids_to_process:
+        return []
+    queued = _scheduler.submit(_scores(ids_to_process))
+    if DEBUG and queued:
+        Output().add_line(f'queue_for_tickets: {len(queued)} queued, depth {_scheduler.depth()}')
+    return queued
+
+
+def prioritize(ticket_id: str, mode: str) -> bool:
+    """
+    Move *ticket_id* ahead in the recommendation queue.
+
+    ``'now'`` queues it at the front whether or not auto-recommend is on.
+    ``'focus'`` (a viewer opened the ticket) only reorders work that would
+    run anyway: it applies while auto-recommend is on or the ticket is
+    already queued or in flight.  A ticket in flight moves ahead in the
+    pipeline's remaining stage queues.
+
+    Returns True if the ticket was queued or moved ahead.
+    """
+    record = ticket_store.get(ticket_id)
+    if record.recommendation is not None:
+        return False
+    if mode == 'now':
+        tier = recommendation_scheduler.NOW
+    elif mode == 'focus':
+        if not is_active() and not record.processing and not _scheduler.is_queued(ticket_id):
+            return False
+        tier = recommendation_scheduler.FOCUS
+    else:
+        raise ValueError(f'unknown prioritize mode: {mode!r}')
+    return bool(_scheduler.submit(_scores([ticket_id]), tier=tier))
+
+
+def get_queue_snapshot() -> dict:
+    """Queued ticket IDs in run order (with their tier) and the tickets in flight."""
+    return _scheduler.snapshot()
+
+
+def get_pipeline_stats() -> dict:
+    """Per-stage worker and queue occupancy of the recommendation pipeline."""
+    return _pipeline.stats()
+
+
+_pipeline = RecommendationPipeline(RECOMMENDATION_PIPELINE_WORKERS, RECOMMENDATION_PIPELINE_QUEUE_SIZE)
+_scheduler = RecommendationScheduler(process_single, RECOMMENDATION_PIPELINE_MAX_IN_FLIGHT)
+_scheduler.add_listener(broadcast_progress)
+ticket_store.add_purge_listener(_scheduler.cancel)
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
+
+def get_queue_depth() -> int:
+    """Return the number of tickets waiting for a recommendation worker."""
+    return _scheduler.depth()
+
+
+metrics.gauge('recommendation_queue_depth', 'Tickets queued for a recommendation worker.',
+              callback=get_queue_depth)
+metrics.gauge('recommendation_in_flight', 'Recommendations currently being generated.',
+              callback=lambda: len(ticket_store.view('processing')))
+recommendation_pipeline.register_metrics(_pipeline)
+metrics.gauge('recommendations_cached', 'Tickets with a cached recommendation.', callback=get_cached_count)
+metrics.gauge('recommendation_errors', 'Tickets whose last recommendation attempt failed.',
+              callback=get_error_count)
@@ -0,0 +1,165 @@
+"""
+Versioned state documents broadcast as JSON-patch deltas.
+
+The UI button state, the consensus state and the ticket header states used
+to be re-sent in full on every change.  Each is now a
+:class:`VersionedDocument`: when its owner publishes a new value, the
+document diffs it against the previous one and broadcasts only the
+difference as a ``state-patch`` event::
+
+    {"doc": "ui", "base": 41, "version": 42,
+     "ops": [{"op": "replace", "path": "/buttons/get_recommendations/disabled", "value": false}]}
+
+Ops follow RFC 6902 (``add`` / ``replace`` / ``remove``, JSON-pointer
+paths).  Clients start from a ``state-snapshot`` (sent in the SSE burst or
+fetched from ``/api/state-snapshot``), apply patches whose ``base`` equals
+their version, and fetch a new snapshot only when they detect a gap.
+
+Each document's ``(version, state)`` pair is a frozen snapshot swapped on
+write, so reading it takes no lock.
+"""
+
+import copy
+import threading
+
+from app.state import validation_cache
+from app.state.frozen import EMPTY, FrozenDict, freeze
+
+_registry_lock = threading.Lock()
+_documents: dict = {}   # name -> VersionedDocument
+
+
+# ── JSON patch helpers ────────────────────────────────────────────────────────
+
+def _escape(key) -> str:
+    """Escape a key for use as a JSON-pointer segment."""
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def diff(old, new, path: str = '') -> list[dict]:
+    """
+    Return the JSON-patch ops that turn *old* into *new*.
+
+    Dicts are compared key by key; any other value (lists included) is
+    replaced whole when it differs.  Both sides must be frozen (see
+    :func:`~app.state.frozen.freeze`) so a list and the tuple it was stored
+    as compare equal.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'remove', 'path': f'{path}/{_escape(key)}'})
+        for key, value in new.items():
+            child = f'{path}/{_escape(key)}'
+            if key not in old:
+                ops.append({'op': 'add', 'path': child, 'value': copy.deepcopy(value)})
+            else:
+                ops.extend(diff(old[key], value, child))
+        return ops
+    if old != new:
+        return [{'op': 'replace', 'path': path, 'value': copy.deepcopy(new)}]
+    return []
+
+
+# ── Document ──────────────────────────────────────────────────────────────────
+
+class VersionedDocument:
+    """A server-owned state dict whose changes are broadcast as patches."""
+
+    def __init__(self, name: str, state: dict | None = None):
+        """
+        Args:
+            name: Document name carried in ``state-patch`` / ``state-snapshot``.
+            state: Initial state (version 0).
+        """
+        self.name = name
+        self._lock = threading.Lock()   # serialises writers; held across broadcast so patches go out in version order
+        self._current: tuple[int, FrozenDict] = (0, freeze(state) if state else EMPTY)
+
+    def snapshot(self) -> tuple[int, dict]:
+        """Return ``(version, state)``; the state is immutable and not copied."""
+        return self._current
+
+    def snapshot_event(self, state: dict | None = None) -> dict:
+        """Return a ``state-snapshot`` payload, optionally with a personalised *state*."""
+        version, current = self.snapshot()
+        return {'doc': self.name, 'version': version, 'state': current if state is None else state}
+
+    def replace(self, state: dict) -> int | None:
+        """
+        Make *state* the document and broadcast the difference.
+
+        Returns:
+            The new version, or ``None`` when nothing changed (no broadcast).
+        """
+        state = freeze(state)
+        with self._lock:
+            ops = diff(self._current[1], state)
+            if not ops:
+                return None
+            return self._publish(ops, state)
+
+    def set(self, key: str, value) -> int | None:
+        """Set top-level *key* to *value*, broadcasting only that entry's delta."""
+        return self.update({key: value})
+
+    def update(self, entries: dict) -> int | None:
+        """Set several top-level keys at once, broadcasting their deltas in one patch."""
+        entries = {key: freeze(value) for key, value in entries.items()}
+        with self._lock:
+            current = self._current[1]
+            ops = []
+            for key, value in entries.items():
+                if key in current:
+                    ops.extend(diff(current[key], value, f'/{_escape(key)}'))
+                else:
+                    ops.append({'op': 'add', 'path': f'/{_escape(key)}', 'value': copy.deepcopy(value)})
+            if not ops:
+                return None
+            updated = dict(current)
+            updated.update(entries)
+            return self._publish(ops, FrozenDict(updated))
+
+    def remove(self, keys: list[str]) -> int | None:
+        """Remove top-level *keys* that are present, in one patch."""
+        with self._lock:
+            current = self._current[1]
+            present = [k for k in keys if k in current]
+            if not present:
+                return None
+            updated = {k: v for k, v in current.items() if k not in present}
+            return self._publish([{'op': 'remove', 'path': f'/{_escape(k)}'} for k in present],
+                                 FrozenDict(updated))
+
+    def _publish(self, ops: list[dict], state: FrozenDict) -> int:
+        """Swap in *state* as the next version and broadcast *ops*.  Caller holds ``_lock``."""
+        version = self._current[0] + 1
+        self._current = (version, state)
+        validation_cache.broadcast('state-patch', {
+            'doc': self.name,
+            'base': version - 1,
+            'version': version,
+            'ops': ops,
+        }, buffer=False)
+        return version
+
+
+# ── Registry ──────────────────────────────────────────────────────────────────
+
+def register(name: str, state: dict | None = None) -> VersionedDocument:
+    """Create (or return the existing) document called *name*."""
+    with _registry_lock:
+        if name not in _documents:
+            _documents[name] = VersionedDocument(name, state)
+        return _documents[name]
+
+
+def get(name: str) -> VersionedDocument | None:
+    with _registry_lock:
+        return _documents.get(name)
+
+
+def names() -> list[str]:
+    with _registry_lock:
+        return list(_documents)
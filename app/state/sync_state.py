@@ -4,61 +4,62 @@ Cross-client state synchronisation.
 Stores checkbox states, assignment selections (support group / priority
 radio buttons), poll timer, and implement-in-progress flag so that all
 connected clients stay in sync.
+
+Per-ticket checkbox, assignment and editor state lives in
+:mod:`ticket_store`; the getters return its cached, immutable views without
+locking or copying.
 """
 
 import threading
 
 from app.state import validation_cache
+from app.state import state_documents
 from app.state import ticket_header_rules
+from app.state import ticket_store
 from app.state import recommendation_originals
+from app.state.frozen import EMPTY, assoc, dissoc
 
 _lock = threading.Lock()
-_checkbox_state: dict = {}           # ticket_id -> bool
-_assignment_selections: dict = {}    # ticket_id -> {field: value, ...}
-_assignment_editors: dict = {}       # ticket_id -> {field: {session_id, label, color}}
 _next_poll_epoch_ms: int = 0
 _implement_in_progress: bool = False
 _validation_toggle_on: bool = False  # "Get validation tickets" toggle state
 
+# ticket_id -> header state; changes reach clients as ``state-patch`` deltas
+_headers_document = state_documents.register('headers')
+ticket_store.add_purge_listener(_headers_document.remove)
+
 
 # ── Checkbox sync ─────────────────────────────────────────────────────────────
 
 def set_checkbox(ticket_id: str, checked: bool) -> None:
-    with _lock:
-        _checkbox_state[ticket_id] = checked
+    ticket_store.update(ticket_id, checked=checked)
 
 
 def set_all_checkboxes(checked: bool, ticket_ids: list[str] | None = None) -> None:
     """
     Set all checkboxes to *checked*.  If *ticket_ids* is provided, also
     ensures those IDs are included (covers tickets from the validation cache
-    that may not yet be in ``_checkbox_state``).
+    that may not yet have a checkbox state).
     """
-    with _lock:
-        for tid in list(_checkbox_state.keys()):
-            _checkbox_state[tid] = checked
-        if ticket_ids:
-            for tid in ticket_ids:
-                _checkbox_state[tid] = checked
+    ticket_store.set_field_for_all('checked', checked, ticket_ids or ())
 
 
 def get_checkbox_state() -> dict:
-    with _lock:
-        return dict(_checkbox_state)
+    """Return the checkbox map (an immutable snapshot; no copy is made)."""
+    return ticket_store.view('checked')
 
 
 # ── Assignment selection sync ─────────────────────────────────────────────────
 
 def set_assignment(ticket_id: str, field: str, value: str) -> None:
-    with _lock:
-        if ticket_id not in _assignment_selections:
-            _assignment_selections[ticket_id] = {}
-        _assignment_selections[ticket_id][field] = value
+    ticket_store.modify(ticket_id, lambda record: {
+        'selections': assoc(record.selections, field, value),
+    })
 
 
 def get_assignment_selections() -> dict:
-    with _lock:
-        return {k: dict(v) for k, v in _assignment_selections.items()}
+    """Return the selection map (an immutable snapshot; no copy is made)."""
+    return ticket_store.view('selections')
 
 
 # ── Assignment editor tracking ────────────────────────────────────────────────
@@ -66,30 +67,28 @@ def get_assignment_selections() -> dict:
 def set_assignment_editor(ticket_id: str, field: str, session_id: str,
                           label: str, color: str) -> None:
     """Record which user last changed a particular field on a ticket."""
-    with _lock:
-        if ticket_id not in _assignment_editors:
-            _assignment_editors[ticket_id] = {}
-        _assignment_editors[ticket_id][field] = {
+    ticket_store.modify(ticket_id, lambda record: {
+        'editors': assoc(record.editors, field, {
             'session_id': session_id,
             'label': label,
             'color': color,
-        }
+        }),
+    })
 
 
 def clear_assignment_editor(ticket_id: str, field: str) -> None:
     """Remove editor attribution for a specific field (e.g. when manual SG is cleared)."""
-    with _lock:
-        if ticket_id in _assignment_editors:
-            _assignment_editors[ticket_id].pop(field, None)
-            if not _assignment_editors[ticket_id]:
-                del _assignment_editors[ticket_id]
+    ticket_store.modify(ticket_id, lambda record: (
+        {'editors': dissoc(record.editors, [field])} if field in record.editors else None
+    ))
 
 
 def get_assignment_editors() -> dict:
-    """Return the full editor attribution map: ticket_id -> {field: {session_id, label, color}}."""
-    with _lock:
-        return {k: {f: dict(v) for f, v in fields.items()}
-                for k, fields in _assignment_editors.items()}
+    """Return the full editor attribution map: ticket_id -> {field: {session_id, label, color}}.
+
+    The map is an immutable snapshot; no copy is made.
+    """
+    return ticket_store.view('editors')
 
 
 # ── Poll timer sync ──────────────────────────────────────────────────────────
@@ -131,17 +130,6 @@ def is_implement_in_progress() -> bool:
         return _implement_in_progress
 
 
-# ── Purge helpers ─────────────────────────────────────────────────────────────
-
-def purge_tickets(ticket_ids: list[str]) -> None:
-    """Remove checkbox, assignment, and editor state for the given ticket IDs."""
-    with _lock:
-        for tid in ticket_ids:
-            _checkbox_state.pop(tid, None)
-            _assignment_selections.pop(tid, None)
-            _assignment_editors.pop(tid, None)
-
-
 # ── Broadcast helpers ─────────────────────────────────────────────────────────
 
 def broadcast_checkbox(ticket_id: str | None, checked: bool, is_select_all: bool = False) -> None:
@@ -174,52 +162,50 @@ def broadcast_assignment(ticket_id: str, field: str, value: str,
 def compute_and_broadcast_header(ticket_id: str) -> dict:
     """Compute the authoritative header state for *ticket_id* and broadcast it.
 
-    Uses :mod:`ticket_header_rules` (pure computation) with inputs from
-    :mod:`recommendation_originals` and the local assignment / editor stores.
+    Uses :mod:`ticket_header_rules` (pure computation) with the ticket's
+    original recommendation, selections and editors from :mod:`ticket_store`.
+    Only the fields that changed are broadcast (``state-patch`` on the
+    ``headers`` document).
 
     Returns the computed header state dict.
     """
-    original = recommendation_originals.get_original(ticket_id) or {}
-
-    with _lock:
-        current = dict(_assignment_selections.get(ticket_id, {}))
-        editors = {
-            f: dict(v)
-            for f, v in _assignment_editors.get(ticket_id, {}).items()
-        }
+    record = ticket_store.get(ticket_id)
+    header_state = ticket_header_rules.compute(
+        record.original or EMPTY, record.selections, record.editors)
+    _headers_document.set(ticket_id, header_state)
 
-    header_state = ticket_header_rules.compute(original, current, editors)
     header_state['ticket_id'] = ticket_id
-
-    validation_cache.broadcast('ticket-header-update', header_state, buffer=False)
     return header_state
 
 
 def compute_all_headers() -> dict:
     """Compute header states for ALL tickets that have originals stored.
 
-    Returns a dict of ``ticket_id -> header_state``.  Used for sync-state-burst
-    replay to late-joining clients.
+    Returns a dict of ``ticket_id -> header_state``.  Used for sync-state
+    replay to late-joining clients.  The ``headers`` document is reconciled
+    with the result so it also covers tickets whose header was never
+    broadcast.
     """
-    all_originals = recommendation_originals.get_all()
     result = {}
+    for ticket_id in recommendation_originals.get_all():
+        record = ticket_store.get(ticket_id)
+        result[ticket_id] = ticket_header_rules.compute(
+            record.original or EMPTY, record.selections, record.editors)
 
-    with _lock:
-        for ticket_id, original in all_originals.items():
-            current = dict(_assignment_selections.get(ticket_id, {}))
-            editors = {
-                f: dict(v)
-                for f, v in _assignment_editors.get(ticket_id, {}).items()
-            }
-            result[ticket_id] = ticket_header_rules.compute(
-                original, current, editors)
-
+    _headers_document.update(result)
     return result
 
 
-def broadcast_poll_timer(epoch_ms: int) -> None:
+def get_headers_snapshot_event() -> dict:
+    """Return a ``state-snapshot`` payload for the ``headers`` document."""
+    compute_all_headers()
+    return _headers_document.snapshot_event()
+
+
+def broadcast_poll_timer(epoch_ms: int, paused: bool = False) -> None:
     validation_cache.broadcast('poll-timer-sync', {
         'next_poll_at': epoch_ms,
+        'paused': paused,
     }, buffer=False)
 
 
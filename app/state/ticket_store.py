@@ -0,0 +1,217 @@
+"""
+Sharded per-ticket state store.
+
+One :class:`TicketRecord` per ticket holds everything the server tracks for
+it — checkbox, assignment selections and editors (:mod:`sync_state`), the
+cached recommendation and its processing / error flags
+(:mod:`recommendation_state`) and the original AI recommendation
+(:mod:`recommendation_originals`).  Those modules keep their public APIs and
+delegate here.
+
+Records are spread over ``TICKET_STORE_SHARDS`` shards chosen by ticket ID,
+each with its own lock, so updating one ticket never contends with updates
+to tickets in other shards.  Records are immutable and each shard publishes
+a frozen ``ticket_id -> record`` map that writers replace, so single-ticket
+reads take no lock.  Whole-store views of one field (e.g. every checkbox)
+are built lazily and reused until a shard changes.
+
+:func:`purge_tickets` removes a ticket's state from every module at once;
+modules holding derived per-ticket data register with
+:func:`add_purge_listener`.
+"""
+
+import threading
+
+from app.config import TICKET_STORE_SHARDS
+from app.state.frozen import EMPTY, FrozenDict, freeze
+
+
+class TicketRecord:
+    """Immutable per-ticket state; use :meth:`replace` to derive an updated copy."""
+
+    __slots__ = ('ticket_id', 'checked', 'selections', 'editors',
+                 'recommendation', 'original', 'processing', 'errored')
+
+    # Value of each field when nothing is stored; such fields are left out of views
+    DEFAULTS = {
+        'checked': None,        # bool once the checkbox was synced
+        'selections': EMPTY,    # {field: value}
+        'editors': EMPTY,       # {field: {session_id, label, color}}
+        'recommendation': None, # full recommendation dict
+        'original': None,       # {'support_group': str, 'priority': str}
+        'processing': False,    # recommendation in flight
+        'errored': False,       # last recommendation attempt failed
+    }
+
+    def __init__(self, ticket_id: str, **fields):
+        object.__setattr__(self, 'ticket_id', ticket_id)
+        for name, default in self.DEFAULTS.items():
+            object.__setattr__(self, name, freeze(fields.get(name, default)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('TicketRecord is immutable; use replace()')
+
+    def replace(self, **changes) -> 'TicketRecord':
+        fields = {name: getattr(self, name) for name in self.DEFAULTS}
+        fields.update(changes)
+        return TicketRecord(self.ticket_id, **fields)
+
+    def is_empty(self) -> bool:
+        return all(getattr(self, name) == default for name, default in self.DEFAULTS.items())
+
+    def __repr__(self):
+        stored = {n: getattr(self, n) for n, d in self.DEFAULTS.items() if getattr(self, n) != d}
+        return f'TicketRecord({self.ticket_id!r}, {stored})'
+
+
+class _Shard:
+    __slots__ = ('lock', 'records', 'generation')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records = EMPTY     # FrozenDict: ticket_id -> TicketRecord, replaced on write
+        self.generation = 0      # bumped on every write; invalidates cached views
+
+
+_shards = [_Shard() for _ in range(max(1, TICKET_STORE_SHARDS))]
+_views: dict = {}             # field -> (shard generations, FrozenDict view)
+_purge_listeners: list = []
+
+
+def _shard_for(ticket_id: str) -> _Shard:
+    return _shards[hash(ticket_id) % len(_shards)]
+
+
+def _group_by_shard(ticket_ids) -> dict:
+    """Return ``shard index -> set of ticket IDs``."""
+    groups: dict = {}
+    for tid in ticket_ids:
+        groups.setdefault(hash(tid) % len(_shards), set()).add(tid)
+    return groups
+
+
+def _publish(shard: _Shard, records: dict) -> None:
+    """Swap in *records* for *shard*.  Caller holds ``shard.lock``."""
+    shard.records = FrozenDict(records)
+    shard.generation += 1
+
+
+# ── Reads (lock-free) ─────────────────────────────────────────────────────────
+
+def get(ticket_id: str) -> TicketRecord:
+    """Return the record for *ticket_id* (an empty record if nothing is stored)."""
+    record = _shard_for(ticket_id).records.get(ticket_id)
+    return record if record is not None else TicketRecord(ticket_id)
+
+
+def view(field: str) -> FrozenDict:
+    """
+    Return ``ticket_id -> value`` of *field* for every ticket where it is set.
+
+    The view is immutable and cached until any shard changes, so repeated
+    reads between writes cost nothing.
+    """
+    default = TicketRecord.DEFAULTS[field]
+    generations = tuple(shard.generation for shard in _shards)
+    cached = _views.get(field)
+    if cached is not None and cached[0] == generations:
+        return cached[1]
+
+    result = {}
+    for shard in _shards:
+        for ticket_id, record in shard.records.items():
+            value = getattr(record, field)
+            if value != default:
+                result[ticket_id] = value
+    frozen = FrozenDict(result)
+    # A write during the build changes a generation, so a stale view is rebuilt next time
+    _views[field] = (generations, frozen)
+    return frozen
+
+
+# ── Writes (one shard lock) ───────────────────────────────────────────────────
+
+def modify(ticket_id: str, fn) -> bool:
+    """
+    Atomically update one ticket's record.
+
+    *fn* is called with the current record under the shard lock and returns
+    a dict of field changes, or ``None`` to leave the record untouched.
+
+    Returns:
+        True if the record was changed.
+    """
+    shard = _shard_for(ticket_id)
+    with shard.lock:
+        current = shard.records.get(ticket_id) or TicketRecord(ticket_id)
+        changes = fn(current)
+        if changes is None:
+            return False
+        records = dict(shard.records)
+        updated = current.replace(**changes)
+        if updated.is_empty():
+            records.pop(ticket_id, None)
+        else:
+            records[ticket_id] = updated
+        _publish(shard, records)
+        return True
+
+
+def update(ticket_id: str, **changes) -> None:
+    """Set fields on one ticket's record."""
+    modify(ticket_id, lambda record: changes)
+
+
+def set_field_for_all(field: str, value, ticket_ids=()) -> None:
+    """Set *field* to *value* on every ticket where it is set, plus *ticket_ids*."""
+    default = TicketRecord.DEFAULTS[field]
+    extra_by_shard = _group_by_shard(ticket_ids)
+
+    for index, shard in enumerate(_shards):
+        with shard.lock:
+            records = dict(shard.records)
+            targets = {tid for tid, rec in records.items() if getattr(rec, field) != default}
+            targets |= extra_by_shard.get(index, set())
+            if not targets:
+                continue
+            for tid in targets:
+                current = records.get(tid) or TicketRecord(tid)
+                records[tid] = current.replace(**{field: value})
+            _publish(shard, records)
+
+
+def clear_field(field: str) -> None:
+    """Reset *field* to its default on every ticket."""
+    default = TicketRecord.DEFAULTS[field]
+    for shard in _shards:
+        with shard.lock:
+            changed = {
+                tid: rec.replace(**{field: default})
+                for tid, rec in shard.records.items()
+                if getattr(rec, field) != default
+            }
+            if changed:
+                records = dict(shard.records)
+                records.update(changed)
+                _publish(shard, records)
+
+
+# ── Purge ─────────────────────────────────────────────────────────────────────
+
+def add_purge_listener(callback) -> None:
+    """Call ``callback(ticket_ids)`` after every :func:`purge_tickets`."""
+    _purge_listeners.append(callback)
+
+
+def purge_tickets(ticket_ids: list[str]) -> None:
+    """Remove all stored state (sync, recommendation, originals) for *ticket_ids*."""
+    for index, drop in _group_by_shard(ticket_ids).items():
+        shard = _shards[index]
+        with shard.lock:
+            if not any(tid in shard.records for tid in drop):
+                continue
+            records = {tid: rec for tid, rec in shard.records.items() if tid not in drop}
+            _publish(shard, records)
+
+    for callback in list(_purge_listeners):
+        callback(ticket_ids)
@@ -0,0 +1,225 @@
+"""
+Lightweight tracing for the ticket-advice pipeline.
+
+A :func:`trace` covers one ticket's recommendation; :func:`span` times one
+stage inside it (Athena fetch, keyword match, embedding, vector / OneNote
+search, LLM call, post-processing) with optional attributes such as prompt
+length or result counts::
+
+    with tracing.trace(ticket_id) as t:
+        with tracing.span('llm', prompt_chars=len(prompt)) as s:
+            result = model.ask(prompt)
+            s.set(response_chars=len(str(result)))
+    t.summary()   # {'ticket_id', 'total_ms', 'stages': {...}, 'spans': [...]}
+
+Every finished span is also folded into a per-stage histogram (fixed
+millisecond buckets) so :func:`get_metrics` can report counts, means and
+approximate percentiles per stage; the most recent traces are kept for
+inspection.  Spans opened outside a trace still feed the histograms.
+
+The current trace lives in a :mod:`contextvars` variable; work handed to
+another thread keeps it when submitted through :func:`propagate`.
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from app.config import TRACE_HISTOGRAM_BUCKETS_MS, TRACE_RECENT_LIMIT
+from services import metrics
+
+_current: contextvars.ContextVar = contextvars.ContextVar('trace', default=None)
+
+_lock = threading.Lock()
+_histograms: dict = {}        # stage -> _Histogram
+_recent: deque = deque(maxlen=TRACE_RECENT_LIMIT)   # summaries of finished traces
+
+_STAGE_SECONDS = metrics.histogram(
+    'ticket_advice_stage_duration_seconds', 'Ticket-advice pipeline stage latency.', ('stage',),
+    buckets=tuple(ms / 1000 for ms in TRACE_HISTOGRAM_BUCKETS_MS),
+)
+
+
+# ── Histograms ────────────────────────────────────────────────────────────────
+
+class _Histogram:
+    """Fixed-bucket latency histogram (milliseconds).  Caller holds ``_lock``."""
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(TRACE_HISTOGRAM_BUCKETS_MS) + 1)   # last bucket is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(TRACE_HISTOGRAM_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = ms if self.max is None else max(self.max, ms)
+
+    def percentile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the *q* quantile (capped at the observed max)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                if index < len(TRACE_HISTOGRAM_BUCKETS_MS):
+                    return round(min(TRACE_HISTOGRAM_BUCKETS_MS[index], self.max), 1)
+                return round(self.max, 1)
+        return round(self.max, 1)
+
+    def snapshot(self) -> dict:
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count, 1) if self.count else None,
+            'min_ms': round(self.min, 1) if self.min is not None else None,
+            'max_ms': round(self.max, 1) if self.max is not None else None,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'buckets': {
+                **{str(le): n for le, n in zip(TRACE_HISTOGRAM_BUCKETS_MS, self.counts)},
+                '+Inf': self.counts[-1],
+            },
+        }
+
+
+def _observe(stage: str, ms: float) -> None:
+    _STAGE_SECONDS.observe(ms / 1000, stage=stage)
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = _Histogram()
+        histogram.observe(ms)
+
+
+# ── Spans and traces ──────────────────────────────────────────────────────────
+
+class Span:
+    """One timed stage; :meth:`set` adds attributes while it runs."""
+
+    __slots__ = ('stage', 'attrs', 'start', 'duration_ms', 'error')
+
+    def __init__(self, stage: str, attrs: dict):
+        self.stage = stage
+        self.attrs = attrs
+        self.start = time.perf_counter()
+        self.duration_ms = None
+        self.error = None
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+
+class Trace:
+    """The spans recorded for one ticket."""
+
+    def __init__(self, ticket_id: str | None):
+        self.ticket_id = ticket_id
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.total_ms = None
+        self._spans: list = []
+        self._spans_lock = threading.Lock()   # spans may finish on worker threads
+
+    def _add(self, span: Span) -> None:
+        with self._spans_lock:
+            self._spans.append(span)
+
+    def summary(self) -> dict:
+        """Return ``{ticket_id, started_at, total_ms, stages, spans}`` (JSON-serialisable)."""
+        with self._spans_lock:
+            spans = list(self._spans)
+        stages: dict = {}
+        for s in spans:
+            stages[s.stage] = round(stages.get(s.stage, 0.0) + s.duration_ms, 1)
+        total = self.total_ms if self.total_ms is not None else (time.perf_counter() - self.start) * 1000
+        return {
+            'ticket_id': self.ticket_id,
+            'started_at': self.started_at,
+            'total_ms': round(total, 1),
+            'stages': stages,
+            'spans': [
+                {
+                    'stage': s.stage,
+                    'offset_ms': round((s.start - self.start) * 1000, 1),
+                    'duration_ms': round(s.duration_ms, 1),
+                    **({'attrs': dict(s.attrs)} if s.attrs else {}),
+                    **({'error': s.error} if s.error else {}),
+                }
+                for s in spans
+            ],
+        }
+
+
+@contextmanager
+def trace(ticket_id: str | None = None):
+    """Trace one pipeline run; yields the :class:`Trace` (its summary is kept in the recent list)."""
+    current = Trace(ticket_id)
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        _current.reset(token)
+        current.total_ms = (time.perf_counter() - current.start) * 1000
+        _observe('total', current.total_ms)
+        summary = current.summary()
+        with _lock:
+            _recent.append(summary)
+
+
+@contextmanager
+def span(stage: str, **attrs):
+    """Time *stage*; yields the :class:`Span` so attributes can be added as they become known."""
+    current = Span(stage, attrs)
+    try:
+        yield current
+    except Exception as exc:
+        current.error = type(exc).__name__
+        raise
+    finally:
+        current.duration_ms = (time.perf_counter() - current.start) * 1000
+        _observe(stage, current.duration_ms)
+        owner = _current.get()
+        if owner is not None:
+            owner._add(current)
+
+
+def current_trace() -> Trace | None:
+    return _current.get()
+
+
+def propagate(fn):
+    """Return *fn* bound to the caller's context, so spans it opens join the current trace."""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.run(fn, *args, **kwargs)
+    return run
+
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
+
+def get_metrics(recent: int = 10) -> dict:
+    """Return per-stage histogram snapshots and the *recent* latest trace summaries."""
+    with _lock:
+        stages = {stage: h.snapshot() for stage, h in _histograms.items()}
+        traces = list(_recent)[-recent:] if recent > 0 else []
+    return {'stages': stages, 'recent': traces}
+
+
+def reset() -> None:
+    """Clear all histograms and recent traces."""
+    with _lock:
+        _histograms.clear()
+        _recent.clear()
@@ -1,27 +1,37 @@
 """
 Centralised UI state — single source of truth for the three workflow buttons.
 
-Every state mutation calls :func:`button_rules.compute` to obtain the
-authoritative button configuration, stores the result, and broadcasts a
-``ui-state-update`` SSE event so all connected clients render identical
+Every state mutation updates the context inputs of :func:`button_rules.compute`
+and schedules a broadcast of the ``ui`` state document (a ``state-patch``
+carrying only what changed) so all connected clients render identical
 button states at all times.
 
+Broadcasts are coalesced: mutations made within ``UI_STATE_BROADCAST_DELAY``
+of each other (a select-all, a presence heartbeat followed by a consensus
+update, …) produce one recompute and one frame, and a frame whose snapshot
+equals the last one broadcast is skipped.  Reads always see the latest
+mutation — the snapshot is recomputed lazily when the context has changed.
+Snapshots are frozen, so an up-to-date snapshot is returned without taking
+the lock or copying it.
+
 **No other module** is permitted to compute button properties.  The only
 way to change what a button looks like is to mutate the context variables
 in this module and call :func:`recompute`.
 """
 
 import threading
-import copy
 
+from app.config import UI_STATE_BROADCAST_DELAY
 from app.state import button_rules
-from app.state import validation_cache as _vc
+from app.state import state_documents
+from app.state.frozen import FrozenDict, freeze
 
 _lock = threading.Lock()
+_flush_lock = threading.Lock()  # serialises flushes so frames go out in order
 
 # ── Mutable context variables ─────────────────────────────────────────────────
 # These are the *inputs* to button_rules.compute().  Every public function in
-# this module updates one or more of these, then calls _recompute_and_broadcast().
+# this module updates one or more of these, then calls _schedule_broadcast().
 
 _ctx = {
     'validation_toggle_on': False,
@@ -46,112 +56,172 @@ _ctx = {
     },
 }
 
-# The last computed snapshot (output of button_rules.compute).
+# The last computed snapshot (output of button_rules.compute) and whether the
+# context changed since it was computed.
 _snapshot: dict = {}
+_dirty: bool = False
+
+# The last snapshot actually broadcast, and the pending coalescing timer.
+_last_broadcast: dict | None = None
+_flush_timer: threading.Timer | None = None
 
 
 # ── Bootstrap ─────────────────────────────────────────────────────────────────
 
-def _initial_snapshot() -> dict:
-    """Compute the initial snapshot from default context."""
-    return button_rules.compute(dict(_ctx))
+def _compute() -> dict:
+    """Compute a snapshot from the current context.  Caller holds ``_lock``."""
+    # Freezing copies the nested progress dict, so the snapshot never aliases _ctx
+    return freeze(button_rules.compute(dict(_ctx)))
 
-_snapshot = _initial_snapshot()
+_snapshot = _compute()
+_document = state_documents.register('ui', _snapshot)
 
 
 # ── Read ──────────────────────────────────────────────────────────────────────
 
+def _current_snapshot() -> dict:
+    """Return the snapshot, recomputing it if the context changed.
+
+    MUST be called while ``_lock`` is already held.
+    """
+    global _snapshot, _dirty
+    if _dirty:
+        _snapshot = _compute()
+        _dirty = False
+    return _snapshot
+
+
 def get_state(session_id: str | None = None) -> dict:
-    """Return a deep copy of the current UI state snapshot.
+    """Return the current UI state snapshot (immutable; no copy is made).
 
     If *session_id* is provided the ``implement_assignment`` button's tooltip
     is personalised for that user's consensus vote status.
     """
-    with _lock:
-        snap = copy.deepcopy(_snapshot)
+    snap = _snapshot
+    if _dirty:
+        with _lock:
+            snap = _current_snapshot()
 
     # Per-session tooltip override for consensus mode
     if session_id is not None:
-        _apply_per_session_consensus(snap, session_id)
+        snap = _apply_per_session_consensus(snap, session_id)
 
     return snap
 
 
+def get_snapshot_event(session_id: str | None = None) -> dict:
+    """Return a ``state-snapshot`` payload for the ``ui`` document.
+
+    The state is the last *broadcast* version (so later patches apply to
+    it), personalised for *session_id* like :func:`get_state`.
+    """
+    version, snap = _document.snapshot()
+    if session_id is not None:
+        snap = _apply_per_session_consensus(snap, session_id)
+    return {'doc': _document.name, 'version': version, 'state': snap}
+
+
 def get_context() -> dict:
-    """Return a deep copy of the raw context (for debugging / tests)."""
+    """Return a shallow copy of the raw context (for debugging / tests)."""
     with _lock:
         return dict(_ctx)
 
 
-# ── Core recompute + broadcast ────────────────────────────────────────────────
+# ── Coalesced broadcast ───────────────────────────────────────────────────────
 
-def _recompute_and_broadcast() -> dict:
-    """Recompute the snapshot from the current context and broadcast.
+def _schedule_broadcast() -> None:
+    """Mark the context changed and arm the coalescing timer if idle.
 
-    MUST be called while ``_lock`` is already held.
+    MUST be called while ``_lock`` is already held.  Further mutations before
+    the timer fires are folded into the same broadcast.
     """
-    global _snapshot
-    _snapshot = button_rules.compute(dict(_ctx))
-    snap = copy.deepcopy(_snapshot)
-    # Release lock before broadcasting (broadcast acquires its own lock)
-    return snap
+    global _dirty, _flush_timer
+    _dirty = True
+    if _flush_timer is None:
+        _flush_timer = threading.Timer(UI_STATE_BROADCAST_DELAY, flush)
+        _flush_timer.daemon = True
+        _flush_timer.start()
 
 
 def _broadcast(snap: dict) -> None:
-    """Push the snapshot to every connected SSE client."""
-    _vc.broadcast('ui-state-update', snap, buffer=False)
+    """Publish the snapshot; clients receive only the delta as a ``state-patch``."""
+    _document.replace(snap)
+
+
+def flush() -> dict | None:
+    """Broadcast pending mutations now instead of waiting for the timer.
+
+    Returns:
+        The broadcast snapshot, or ``None`` when it equals the last one
+        broadcast (nothing is sent).
+    """
+    global _flush_timer, _dirty, _last_broadcast
+    with _flush_lock:
+        with _lock:
+            if _flush_timer is not None:
+                _flush_timer.cancel()
+                _flush_timer = None
+
+            snap = _current_snapshot()
+            if snap == _last_broadcast:
+                return None
+            _last_broadcast = snap
+
+            # complete_message is one-shot: it rides on this frame only, so
+            # later broadcasts do not re-trigger the completion animation
+            prog = _ctx['recommendation_progress']
+            if prog['complete_message'] is not None:
+                prog['complete_message'] = None
+                _dirty = True
+
+        # Broadcast outside _lock (broadcast acquires its own locks)
+        _broadcast(snap)
+        return snap
 
 
 def recompute() -> dict:
     """Public recompute + broadcast.  Use when external state has changed."""
+    global _dirty
     with _lock:
-        snap = _recompute_and_broadcast()
-    _broadcast(snap)
-    return snap
+        _dirty = True
+    flush()
+    return get_state()
 
 
 # ── Context mutators ──────────────────────────────────────────────────────────
-# Each mutator updates one or more context keys, recomputes, and broadcasts.
+# Each mutator updates one or more context keys and schedules a broadcast.
 
-def set_validation_toggle(on: bool) -> dict:
+def set_validation_toggle(on: bool) -> None:
     """Toggle the 'Get validation tickets' button on or off."""
     with _lock:
         _ctx['validation_toggle_on'] = on
-        snap = _recompute_and_broadcast()
-    _broadcast(snap)
-    return snap
+        _schedule_broadcast()
 
 
-def set_tickets_in_view(count: int) -> dict:
+def set_tickets_in_view(count: int) -> None:
     """Update the number of tickets currently displayed."""
     with _lock:
         _ctx['tickets_in_view'] = count
         _ctx['total_tickets'] = count
-        snap = _recompute_and_broadcast()
-    _broadcast(snap)
-    return snap
+        _schedule_broadcast()
 
 
-def set_recommendations_toggle(on: bool) -> dict:
+def set_recommendations_toggle(on: bool) -> None:
     """Toggle the 'Get recommendations' button on or off."""
     with _lock:
         _ctx['recommendations_toggle_on'] = on
-        snap = _recompute_and_broadcast()
-    _broadcast(snap)
-    return snap
+        _schedule_broadcast()
 
 
-def set_checkbox_counts(checked: int, total: int) -> dict:
-    """Update checkbox selection counts and recompute."""
+def set_checkbox_counts(checked: int, total: int) -> None:
+    """Update checkbox selection counts."""
     with _lock:
         _ctx['checked_count'] = checked
         _ctx['total_tickets'] = total
-        snap = _recompute_and_broadcast()
-    _broadcast(snap)
-    return snap
+        _schedule_broadcast()
 
 
-def set_user_count(count: int) -> dict:
+def set_user_count(count: int) -> None:
     """Update the number of active presence sessions."""
     with _lock:
         _ctx['user_count'] = count
@@ -162,13 +232,11 @@ def set_user_count(count: int) -> dict:
             _ctx['consensus_required'] = 0
             _ctx['consensus_unlocked'] = False
             _ctx['full_assignment_active'] = False
-        snap = _recompute_and_broadcast()
-    _broadcast(snap)
-    return snap
+        _schedule_broadcast()
 
 
 def set_consensus_state(*, active: bool, agreed: int, required: int,
-                        unlocked: bool, full_assignment_active: bool | None = None) -> dict:
+                        unlocked: bool, full_assignment_active: bool | None = None) -> None:
     """Update consensus-related context variables."""
     with _lock:
         _ctx['consensus_active'] = active
@@ -177,18 +245,14 @@ def set_consensus_state(*, active: bool, agreed: int, required: int,
         _ctx['consensus_unlocked'] = unlocked
         if full_assignment_active is not None:
             _ctx['full_assignment_active'] = full_assignment_active
-        snap = _recompute_and_broadcast()
-    _broadcast(snap)
-    return snap
+        _schedule_broadcast()
 
 
-def set_implement_in_progress(in_progress: bool) -> dict:
+def set_implement_in_progress(in_progress: bool) -> None:
     """Mark implement-assignment as in-progress or complete."""
     with _lock:
         _ctx['implement_in_progress'] = in_progress
-        snap = _recompute_and_broadcast()
-    _broadcast(snap)
-    return snap
+        _schedule_broadcast()
 
 
 def update_recommendation_progress(current: int, total: int,
@@ -196,38 +260,35 @@ def update_recommendation_progress(current: int, total: int,
     """Update the recommendation progress indicator.
 
     Called frequently (once per ticket) so it updates the context but does
-    NOT broadcast the full state — the existing recommendation-start /
+    NOT schedule a broadcast — the existing recommendation-start /
     recommendation-progress SSE events handle per-ticket updates.  The
-    context is kept in sync for late-joining clients.
+    context is kept in sync for late-joining clients and rides along on the
+    next coalesced broadcast.
     """
+    global _dirty
     with _lock:
         prog = _ctx['recommendation_progress']
         prog['visible'] = True
         prog['current'] = current
         prog['total'] = total
         prog['current_ticket_id'] = ticket_id
+        _dirty = True
 
 
-def set_recommendation_complete(total: int) -> dict:
+def set_recommendation_complete(total: int) -> None:
     """Mark recommendation processing as complete.
 
-    Sets ``complete_message`` so the current broadcast carries the completion
-    indicator, then immediately clears it so subsequent broadcasts (triggered
-    by unrelated state changes like presence heartbeats) do not re-trigger
-    the completion animation on connected clients.
+    Sets the one-shot ``complete_message``; :func:`flush` clears it once the
+    broadcast carrying it has been sent.
     """
     with _lock:
         prog = _ctx['recommendation_progress']
         prog['visible'] = False
         prog['complete_message'] = f'{total} recommendations complete'
-        snap = _recompute_and_broadcast()
-        # Clear the one-shot complete_message so it doesn't persist
-        prog['complete_message'] = None
-    _broadcast(snap)
-    return snap
+        _schedule_broadcast()
 
 
-def reset() -> dict:
+def reset() -> None:
     """Reset all context to defaults (e.g. when leaving multi-ticket mode)."""
     with _lock:
         _ctx.update({
@@ -252,33 +313,35 @@ def reset() -> dict:
                 'complete_message': None,
             },
         })
-        snap = _recompute_and_broadcast()
-    _broadcast(snap)
-    return snap
+        _schedule_broadcast()
 
 
 # ── Per-session consensus tooltip helper ──────────────────────────────────────
 
-def _apply_per_session_consensus(snap: dict, session_id: str) -> None:
-    """Adjust the implement button tooltip based on whether *session_id* has
-    voted in the current consensus round.
+def _apply_per_session_consensus(snap: dict, session_id: str) -> dict:
+    """Return *snap* with the implement button tooltip adjusted for whether
+    *session_id* has voted in the current consensus round.
 
     This is called at read-time (get_state) so the broadcast snapshot stays
     generic while each client's initial-state fetch gets a personalised tooltip.
+    Snapshots are frozen, so only the path to the changed button is copied.
     """
     from app.state import consensus_state as _cs
 
-    imp = snap.get('buttons', {}).get('implement_assignment', {})
+    buttons = snap.get('buttons', {})
+    imp = buttons.get('implement_assignment', {})
     if imp.get('mode') != 'consensus':
-        return
+        return snap
 
     cs = _cs.get_state()
     agreed_list = cs.get('agreed', [])
     has_agreed = session_id in agreed_list
 
     if has_agreed:
-        imp['tooltip'] = 'You voted to agree on bulk ticket assignment'
-        imp['style'] = 'consensus-on'
+        imp = FrozenDict(imp, tooltip='You voted to agree on bulk ticket assignment',
+                         style='consensus-on')
     else:
-        imp['tooltip'] = 'You have not yet agreed on bulk ticket assignment'
-        imp['style'] = 'consensus-off'
+        imp = FrozenDict(imp, tooltip='You have not yet agreed on bulk ticket assignment',
+                         style='consensus-off')
+
+    return FrozenDict(snap, buttons=FrozenDict(buttons, implement_assignment=imp))
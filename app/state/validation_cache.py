@@ -3,20 +3,63 @@ Shared validation-ticket broadcast state.
 
 Manages the cached list of validation tickets, the loading state, and the
 SSE broadcast infrastructure that pushes events to all connected clients.
+
+Events are encoded into an SSE frame (``bytes``) once, at broadcast time, and
+the same immutable frame is shared by every client queue and the mid-load
+replay buffer, so payloads are serialized once regardless of viewer count.
+
+Each connection reads from a :class:`ClientChannel`, which coalesces
+state-style events for slow consumers and sends an explicit ``resync`` event
+instead of silently dropping a client whose backlog overflows.
+
+Every broadcast frame carries a monotonically increasing SSE event ID and is
+kept in a bounded ring buffer.  A reconnecting client that presents its last
+seen ID (``Last-Event-ID``) is sent only the frames it missed; it falls back
+to the full initial snapshot only when the gap is older than the buffer.
+
+The cached ticket list is an immutable tuple of frozen tickets that writers
+replace wholesale, so :func:`get_tickets` returns it without locking or
+copying.
 """
 
+import json
 import threading
 import time
-import queue as _queue_module
+import uuid
+from collections import deque
 
-from app.config import VALIDATION_CACHE_TTL
+from app.config import VALIDATION_CACHE_TTL, SSE_REPLAY_BUFFER_SIZE, SSE_MAX_CLIENTS
+from app.state.client_channel import ClientChannel
+from app.state.frozen import freeze
+from services import metrics
 
 _lock = threading.Lock()
+_broadcast_lock = threading.Lock()  # orders fan-out; lock order is _broadcast_lock, then _lock
 _state: str = 'idle'          # 'idle' | 'loading' | 'loaded'
-_tickets: list = []           # cached ticket dicts (set when state == 'loaded')
+_tickets: tuple = ()          # frozen cached tickets (set when state == 'loaded'); replaced, never mutated
 _fetched_at: float = 0.0
-_clients: dict = {}           # session_id -> queue.Queue (one per SSE connection)
-_load_buffer: list = []       # events broadcast during the current load session
+_clients: dict = {}           # session_id -> ClientChannel (one per SSE connection)
+_load_buffer: list = []       # SSE frames broadcast during the current load session
+_next_index: int = 0          # next free accordion index for incrementally added tickets
+_epoch: str = uuid.uuid4().hex[:8]  # distinguishes event IDs across server restarts
+_event_seq: int = 0           # sequence number of the last broadcast frame
+_replay: deque = deque(maxlen=SSE_REPLAY_BUFFER_SIZE)  # (seq, frame) of recent broadcasts
+_overflow_count: int = 0      # clients sent resync because their backlog overflowed
+_draining: bool = False       # set on shutdown; no new clients are accepted
+
+# Events where only the latest value matters: event type -> payload field that
+# scopes the value (None = one value per client).  Undelivered frames with the
+# same key are replaced instead of queued.  ``state-patch`` deltas are never
+# coalesced — each one builds on the previous version.
+COALESCABLE_EVENTS = {
+    'recommendation-progress': None,
+}
+
+_BROADCAST_EVENTS = metrics.counter(
+    'sse_broadcast_events_total', 'Events broadcast to SSE clients by event type.', ('event',))
+_CLIENT_OVERFLOWS = metrics.counter(
+    'sse_client_overflows_total', 'SSE clients dropped (sent resync) because their backlog overflowed.')
+_CLIENT_OVERFLOWS.inc(0)   # export 0 before the first overflow
 
 
 # ── Public state accessors ────────────────────────────────────────────────────
@@ -26,9 +69,9 @@ def get_state() -> str:
         return _state
 
 
-def get_tickets() -> list:
-    with _lock:
-        return list(_tickets)
+def get_tickets() -> tuple:
+    """Return the cached tickets (an immutable snapshot; no copy is made)."""
+    return _tickets
 
 
 def get_fetched_at() -> float:
@@ -37,8 +80,7 @@ def get_fetched_at() -> float:
 
 
 def get_ticket_count() -> int:
-    with _lock:
-        return len(_tickets)
+    return len(_tickets)
 
 
 def is_cache_fresh() -> bool:
@@ -56,10 +98,62 @@ def set_loading() -> None:
 
 def set_loaded(tickets: list) -> None:
     """Transition to 'loaded' state with the given ticket list."""
-    global _state, _tickets, _fetched_at
+    global _state, _tickets, _fetched_at, _next_index
+    frozen = freeze(tickets)
     with _lock:
         _state = 'loaded'
-        _tickets = tickets
+        _tickets = frozen
+        _fetched_at = time.time()
+        _next_index = max((t.get('index', -1) for t in tickets), default=-1) + 1
+
+
+def allocate_indices(count: int) -> list[int]:
+    """
+    Reserve *count* accordion indices for tickets that will be added with
+    :func:`add_tickets`, so every client renders them at the same index.
+    """
+    global _next_index
+    with _lock:
+        start = _next_index
+        _next_index += count
+    return list(range(start, start + count))
+
+
+def add_tickets(tickets: list) -> list:
+    """
+    Append newly arrived tickets to the cached list without replacing it.
+
+    Tickets whose ID is already cached are skipped.  Returns the tickets that
+    were actually added.
+    """
+    global _tickets
+    with _lock:
+        cached_ids = {t.get('id') for t in _tickets}
+        added = freeze([t for t in tickets if t.get('id') not in cached_ids])
+        _tickets = _tickets + added
+    return list(added)
+
+
+def remove_tickets(ticket_ids: list[str]) -> None:
+    """Drop tickets that left the Validation queue from the cached list."""
+    global _tickets
+    drop = set(ticket_ids)
+    with _lock:
+        _tickets = tuple(t for t in _tickets if t.get('id') not in drop)
+
+
+def update_tickets(tickets: list) -> None:
+    """Replace cached tickets that have the same ID as one of *tickets*."""
+    global _tickets
+    updated = {t.get('id'): freeze(t) for t in tickets}
+    with _lock:
+        _tickets = tuple(updated.get(t.get('id'), t) for t in _tickets)
+
+
+def mark_fresh() -> None:
+    """Restart the cache TTL after an incremental refresh."""
+    global _fetched_at
+    with _lock:
         _fetched_at = time.time()
 
 
@@ -71,51 +165,180 @@ def set_idle() -> None:
 
 # ── Client (SSE connection) management ────────────────────────────────────────
 
-def register_client(session_id: str) -> _queue_module.Queue:
+def format_event_id(seq: int) -> str:
+    return f'{_epoch}-{seq}'
+
+
+def _parse_event_id(event_id: str | None) -> int | None:
+    """Return the sequence number of an ID issued by this process, else None."""
+    if not event_id:
+        return None
+    epoch, _, seq = event_id.partition('-')
+    if epoch != _epoch or not seq.isdigit():
+        return None
+    return int(seq)
+
+
+def register_client(session_id: str, last_event_id: str | None = None) -> tuple:
     """
-    Register an SSE client and return its event queue.
+    Register an SSE client and return its :class:`ClientChannel`.
 
     Also returns a snapshot of the current state and load buffer so the
-    caller can send the initial burst.
+    caller can send the initial burst, plus resume information:
+
+    - *missed_frames*: when *last_event_id* is still covered by the replay
+      buffer, the frames broadcast after it (possibly empty) — the caller
+      sends these instead of the initial burst.  ``None`` when a full
+      snapshot is needed.
+    - *current_event_id*: ID of the newest broadcast at registration time;
+      the caller tags its snapshot with it so later resumes start there.
+    """
+    resume_seq = _parse_event_id(last_event_id)
+    resync_frame = encode_event('resync', {'reason': 'overflow'})
+
+    # Holding _broadcast_lock makes the channel see exactly the frames after
+    # _event_seq, so missed + queued frames never overlap or leave a gap.
+    with _broadcast_lock:
+        with _lock:
+            channel = ClientChannel(session_id, resync_frame, start_seq=_event_seq)
+            previous = _clients.get(session_id)
+            _clients[session_id] = channel
+            current_state = _state
+            load_buffer_snapshot = list(_load_buffer)
+            cached_tickets = _tickets
+            current_event_id = format_event_id(_event_seq)
+
+            missed_frames = None
+            if resume_seq is not None and resume_seq <= _event_seq:
+                oldest = _replay[0][0] if _replay else _event_seq + 1
+                if resume_seq >= oldest - 1:
+                    missed_frames = [frame for seq, frame in _replay if seq > resume_seq]
+
+    # A reconnect replaces the session's previous connection
+    if previous is not None:
+        previous.close()
+
+    return (channel, current_state, load_buffer_snapshot, cached_tickets,
+            missed_frames, current_event_id)
+
+
+def accepts_client(session_id: str) -> bool:
+    """
+    Return whether a broadcast connection for *session_id* may be opened.
+
+    False while the server drains for shutdown, or when ``SSE_MAX_CLIENTS``
+    connections are open (a reconnect that replaces the session's own
+    connection is always allowed).
     """
-    client_queue: _queue_module.Queue = _queue_module.Queue(maxsize=200)
     with _lock:
-        _clients[session_id] = client_queue
-        current_state = _state
-        load_buffer_snapshot = list(_load_buffer)
-        cached_tickets = list(_tickets)
-    return client_queue, current_state, load_buffer_snapshot, cached_tickets
+        if _draining:
+            return False
+        return session_id in _clients or len(_clients) < SSE_MAX_CLIENTS
 
 
-def unregister_client(session_id: str, client_queue: _queue_module.Queue) -> None:
+def drain_clients() -> int:
     """
-    Remove a client queue, but only if it still points to the same object
-    (prevents a reconnecting client's new queue from being evicted).
+    Begin graceful shutdown of the broadcast streams.
+
+    New connections are refused and every open channel delivers what it has
+    queued and then ends its stream; browsers reconnect with their last
+    event ID.  Returns the number of channels drained.
     """
+    global _draining
+    with _lock:
+        _draining = True
+        channels = list(_clients.values())
+    for channel in channels:
+        channel.drain()
+    return len(channels)
+
+
+def get_client_stats() -> dict:
+    """Return per-client delivery and lag metrics for every open connection."""
     with _lock:
-        if _clients.get(session_id) is client_queue:
+        channels = list(_clients.values())
+        current_seq = _event_seq
+        overflow_count = _overflow_count
+    return {
+        'event_id': format_event_id(current_seq),
+        'overflowed_clients': overflow_count,
+        'max_clients': SSE_MAX_CLIENTS,
+        'draining': _draining,
+        'clients': [ch.stats(current_seq) for ch in channels],
+    }
+
+
+def unregister_client(session_id: str, channel: ClientChannel) -> None:
+    """
+    Close and remove a client channel, but only unregister it if it still is
+    the session's current one (prevents a reconnecting client's new channel
+    from being evicted).
+    """
+    channel.close()
+    with _lock:
+        if _clients.get(session_id) is channel:
             _clients.pop(session_id, None)
 
 
 # ── Broadcast ─────────────────────────────────────────────────────────────────
 
+def encode_event(event_type: str, data: dict, event_id: str | None = None) -> bytes:
+    """Encode one SSE event as a ready-to-send frame, optionally with an ``id:`` line."""
+    frame = f"event: {event_type}\ndata: {json.dumps(data)}\n\n".encode('utf-8')
+    if event_id is not None:
+        frame = f"id: {event_id}\n".encode('utf-8') + frame
+    return frame
+
+
 def broadcast(event_type: str, data: dict, buffer: bool = True) -> None:
     """
     Push a single SSE event to every connected client.
 
-    When *buffer* is True and the current state is ``'loading'``, the event
-    is also appended to ``_load_buffer`` so that clients connecting mid-load
-    can replay missed events.
+    The event is serialized once, outside any lock, then tagged with the next
+    event ID and kept in the replay ring buffer.  When *buffer* is True and
+    the current state is ``'loading'``, the frame is also appended to
+    ``_load_buffer`` so that clients connecting mid-load can replay missed
+    events.  Coalescable events (:data:`COALESCABLE_EVENTS`) replace their
+    undelivered predecessor in each client channel; a client whose backlog
+    overflows is sent ``resync`` and removed, and resumes from the ring
+    buffer when it reconnects.
     """
-    with _lock:
-        if buffer and _state == 'loading':
-            _load_buffer.append({'event': event_type, 'data': data})
-
-        dead: list[str] = []
-        for sid, q in _clients.items():
-            try:
-                q.put_nowait({'event': event_type, 'data': data})
-            except _queue_module.Full:
-                dead.append(sid)
-        for sid in dead:
-            del _clients[sid]
\ No newline at end of file
+    global _event_seq, _overflow_count
+    _BROADCAST_EVENTS.inc(event=event_type)
+    body = encode_event(event_type, data)
+    coalesce_key = None
+    if event_type in COALESCABLE_EVENTS:
+        scope = COALESCABLE_EVENTS[event_type]
+        coalesce_key = (event_type, data.get(scope) if scope else None)
+
+    # _broadcast_lock keeps every client's queue in event-ID order;
+    # _lock is only held to assign the ID and snapshot the client list.
+    dead: list = []
+    with _broadcast_lock:
+        with _lock:
+            _event_seq += 1
+            frame = f"id: {format_event_id(_event_seq)}\n".encode('utf-8') + body
+            _replay.append((_event_seq, frame))
+            if buffer and _state == 'loading':
+                _load_buffer.append(frame)
+            targets = list(_clients.items())
+
+        seq = _event_seq
+        for sid, channel in targets:
+            if not channel.put(seq, frame, coalesce_key):
+                dead.append((sid, channel))
+
+    if dead:
+        with _lock:
+            if not _draining:   # draining channels refuse frames without overflowing
+                _overflow_count += len(dead)
+                _CLIENT_OVERFLOWS.inc(len(dead))
+            for sid, channel in dead:
+                if _clients.get(sid) is channel:
+                    del _clients[sid]
+
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
+
+metrics.gauge('sse_clients', 'Open SSE broadcast connections.', callback=lambda: len(_clients))
+metrics.gauge('validation_tickets_cached', 'Tickets in the validation cache.', callback=lambda: len(_tickets))
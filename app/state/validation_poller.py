@@ -0,0 +1,373 @@
+"""
+Server-side validation queue poller.
+
+A single daemon thread re-reads the Validation queue from Athena once per
+``VALIDATION_POLL_INTERVAL`` and diffs it against the last known queue.
+Purges for tickets that left the queue and auto-queued recommendations for
+new tickets are applied exactly once per tick, and the result is pushed to
+every connected client as a ``queue-diff`` SSE event — clients never query
+Athena for the queue themselves.
+
+New tickets are hydrated here as well: each one is fetched from Athena once,
+in parallel, appended to the validation cache and broadcast to every client
+as a ``ticket`` event flagged ``is_new``.  A ticket that fails to hydrate
+keeps the accordion index it was announced with and is retried on every
+poll until it succeeds or leaves the queue; it is not announced as new again.
+
+The same diff is used to refresh the validation cache incrementally once its
+TTL expires (:func:`refresh`), so reload cost scales with queue churn rather
+than queue size.
+
+Ticks are aligned to wall-clock multiples of the interval and announced via
+the shared ``poll-timer-sync`` event so all clients show the same countdown.
+Polling only runs while the "Get validation tickets" toggle is on and the
+validation cache is loaded, and is paused while recommendations are being
+processed.
+"""
+
+import threading
+import time
+
+from services.athena import Athena
+from services.output import Output
+
+from app.config import DEBUG, VALIDATION_POLL_INTERVAL
+from app.logic.validation_fetch import fetch_validation_tickets
+from app.state import ui_state
+from app.state import validation_cache
+from app.state import recommendation_state
+from app.state import sync_state
+from app.state import ticket_store
+
+# How often the poller re-checks its active / paused inputs between ticks
+_STATE_CHECK_SECONDS = 1.0
+
+_lock = threading.Lock()
+_sync_lock = threading.Lock()  # serialises polls and refreshes (held across Athena calls)
+_thread: threading.Thread | None = None
+_stop_event = threading.Event()
+_queue_ids: list = []          # last known Validation queue (ticket IDs, Athena order)
+_checked_at_ms: int = 0        # epoch ms of the last successful poll (0 = never)
+_unhydrated: dict = {}         # ticket_id -> accordion index, in the queue but not yet fetched
+_refreshing: bool = False      # an incremental cache refresh is running
+
+
+# ── Public accessors ──────────────────────────────────────────────────────────
+
+def get_queue() -> list[str]:
+    """Return the last known Validation queue ticket IDs."""
+    with _lock:
+        return list(_queue_ids)
+
+
+def get_checked_at() -> int:
+    """Return the epoch ms of the last successful poll, or 0 if none yet."""
+    with _lock:
+        return _checked_at_ms
+
+
+def is_running() -> bool:
+    with _lock:
+        return _thread is not None and _thread.is_alive()
+
+
+# ── Lifecycle ────────────────────────────────────────────────────────────────
+
+def start(ticket_ids: list[str]) -> None:
+    """
+    Seed the known queue with *ticket_ids* (the queue the validation load
+    just fetched) and start the poller thread if it is not running yet.
+    """
+    global _thread, _queue_ids, _checked_at_ms
+    with _lock:
+        _queue_ids = list(ticket_ids)
+        _checked_at_ms = int(time.time() * 1000)
+        _unhydrated.clear()   # the load reassigned every index
+        if _thread is not None and _thread.is_alive():
+            return
+        _stop_event.clear()
+        _thread = threading.Thread(target=_run, name='validation-poller', daemon=True)
+        _thread.start()
+
+    if DEBUG:
+        Output().add_line(
+            f'validation_poller: started (interval {VALIDATION_POLL_INTERVAL}s, '
+            f'{len(ticket_ids)} ticket(s) in queue)'
+        )
+
+
+def stop() -> None:
+    """Signal the poller thread to exit after its current wait."""
+    _stop_event.set()
+
+
+# ── Poll loop ────────────────────────────────────────────────────────────────
+
+def _is_active() -> bool:
+    """Polling runs only while the validation toggle is on and tickets are loaded."""
+    return sync_state.is_validation_toggle_on() and validation_cache.get_state() == 'loaded'
+
+
+def _is_paused() -> bool:
+    """Polling pauses while recommendations are being processed."""
+    return recommendation_state.is_processing()
+
+
+def _next_tick(now: float) -> float:
+    """Return the next wall-clock multiple of the poll interval after *now*."""
+    return (int(now // VALIDATION_POLL_INTERVAL) + 1) * VALIDATION_POLL_INTERVAL
+
+
+def _announce(next_tick: float, paused: bool) -> None:
+    """Publish the next poll time so every client shows the same countdown."""
+    epoch_ms = int(next_tick * 1000)
+    sync_state.set_next_poll(epoch_ms)
+    sync_state.broadcast_poll_timer(epoch_ms, paused=paused)
+
+
+def _run() -> None:
+    """Poller thread entry point."""
+    output = Output()
+    next_tick = _next_tick(time.time())
+    announced = None   # (active, paused) last announced to clients
+
+    while not _stop_event.is_set():
+        if time.time() >= next_tick:
+            if _is_active() and not _is_paused():
+                try:
+                    poll_once()
+                except Exception as exc:
+                    output.add_line(f'validation_poller: poll failed: {exc}')
+            next_tick = _next_tick(time.time())
+            announced = None
+
+        active = _is_active()
+        paused = active and _is_paused()
+        if active and announced != (active, paused):
+            _announce(next_tick, paused)
+        announced = (active, paused)
+
+        _stop_event.wait(max(0.0, min(next_tick - time.time(), _STATE_CHECK_SECONDS)))
+
+
+def poll_once() -> dict | None:
+    """
+    Fetch the Validation queue once, apply purges / auto-queueing for the
+    difference against the last known queue, and broadcast ``queue-diff``.
+    New tickets are then hydrated and broadcast as ``ticket`` events.
+
+    Returns:
+        The broadcast payload, or ``None`` when Athena could not be queried
+        (the last known queue is kept).
+    """
+    with _sync_lock:
+        current_ids = Athena().get_validation_tickets()
+        if current_ids is None:
+            Output().add_line('validation_poller: failed to fetch validation tickets from Athena')
+            return None
+        return _apply_queue(get_queue(), current_ids)
+
+
+def is_refreshing() -> bool:
+    with _lock:
+        return _refreshing
+
+
+def start_refresh() -> bool:
+    """
+    Start an incremental refresh of the validation cache in the background.
+
+    Returns:
+        False if a refresh is already running.
+    """
+    global _refreshing
+    with _lock:
+        if _refreshing:
+            return False
+        _refreshing = True
+    threading.Thread(target=refresh, daemon=True).start()
+    return True
+
+
+def refresh() -> dict | None:
+    """
+    Incrementally refresh the validation cache after its TTL expired.
+
+    Diffs the current queue against the cached tickets instead of reloading
+    everything: departed tickets are purged, new ones are hydrated, and
+    cached tickets are re-fetched only when the view reports a different
+    ``last_modified_at`` (tickets without one are kept as cached).  Only the
+    deltas are broadcast — ``queue-diff`` for arrivals / departures and a
+    ``ticket`` event flagged ``refresh`` per changed ticket.
+
+    Returns:
+        The ``queue-diff`` payload plus ``changed`` (re-fetched ticket IDs),
+        or ``None`` when Athena could not be queried.
+    """
+    global _refreshing
+    output = Output()
+    try:
+        with _sync_lock:
+            versions = Athena().get_validation_ticket_versions()
+            if versions is None:
+                output.add_line('validation_poller: refresh failed to fetch validation tickets from Athena')
+                return None
+
+            cached = {t.get('id'): t for t in validation_cache.get_tickets()}
+            changed = [
+                cached[tid] for tid, modified in versions.items()
+                if tid in cached and modified is not None
+                and modified != cached[tid].get('last_modified_at')
+            ]
+
+            payload = _apply_queue(list(cached), list(versions))
+            payload['changed'] = [t['id'] for t in changed]
+
+            if changed:
+                _refetch_changed_tickets(changed)
+
+            validation_cache.mark_fresh()
+
+            if DEBUG:
+                output.add_line(
+                    f'validation_poller: refresh — {len(payload["left_queue"])} left, '
+                    f'{len(payload["new_in_queue"])} new, {len(changed)} changed, '
+                    f'{len(versions)} in queue'
+                )
+            return payload
+
+    except Exception as exc:
+        output.add_line(f'validation_poller: refresh failed: {exc}')
+        return None
+
+    finally:
+        with _lock:
+            _refreshing = False
+
+
+def _apply_queue(known_ids: list[str], current_ids: list[str]) -> dict:
+    """
+    Make *current_ids* the known queue and apply the difference against
+    *known_ids*: purge departed tickets, broadcast ``queue-diff``, hydrate
+    arrivals (retrying earlier failures) and auto-queue recommendations for
+    the ones that hydrated.  Caller holds ``_sync_lock``.
+    """
+    global _queue_ids, _checked_at_ms
+    output = Output()
+
+    current_set = set(current_ids)
+    with _lock:
+        # Tickets that failed to hydrate were already announced: they are
+        # known, never new, and leave the queue like any other ticket.
+        known_set = set(known_ids)
+        known_ids = list(known_ids) + [tid for tid in _unhydrated if tid not in known_set]
+        _queue_ids = list(current_ids)
+        _checked_at_ms = int(time.time() * 1000)
+        checked_at = _checked_at_ms
+        for tid in list(_unhydrated):
+            if tid not in current_set:
+                del _unhydrated[tid]
+        retries = [{'id': tid, 'index': index} for tid, index in _unhydrated.items()]
+
+    known_set = set(known_ids)
+    left_queue = [tid for tid in known_ids if tid not in current_set]
+    new_in_queue = [tid for tid in current_ids if tid not in known_set]
+
+    # Purge caches for tickets that left
+    if left_queue:
+        ticket_store.purge_tickets(left_queue)
+        validation_cache.remove_tickets(left_queue)
+
+    # Indices are assigned here so every client places a new ticket identically
+    indices = validation_cache.allocate_indices(len(new_in_queue))
+    new_tickets = [
+        {'id': tid, 'index': index} for index, tid in zip(indices, new_in_queue)
+    ]
+
+    payload = {
+        'left_queue': left_queue,
+        'new_in_queue': new_in_queue,
+        'new_tickets': new_tickets,
+        'queue_size': len(current_ids),
+        'checked_at': checked_at,
+    }
+    validation_cache.broadcast('queue-diff', payload, buffer=False)
+
+    hydrated = _hydrate_new_tickets(new_tickets, retries) if new_tickets or retries else []
+
+    if left_queue or hydrated:
+        ui_state.set_tickets_in_view(validation_cache.get_ticket_count())
+
+    # Auto-queue recommendations for newly hydrated tickets if toggle is ON
+    if hydrated and recommendation_state.is_active():
+        recommendation_state.queue_for_tickets(hydrated)
+        if DEBUG:
+            output.add_line(
+                f'validation_poller: auto-queued {len(hydrated)} '
+                f'new ticket(s) for recommendations'
+            )
+
+    if DEBUG:
+        output.add_line(
+            f'validation_poller: queue={len(current_ids)}, '
+            f'left={len(left_queue)}, new={len(new_in_queue)}'
+        )
+
+    return payload
+
+
+def _refetch_changed_tickets(tickets: list[dict]) -> None:
+    """
+    Re-fetch cached tickets whose content changed, keeping their accordion
+    index, and broadcast each one as a ``ticket`` event flagged ``refresh``.
+    """
+    output = Output()
+    items = [(t.get('index', 0), t['id']) for t in tickets]
+
+    for index, ticket_id, vt, err in fetch_validation_tickets(items):
+        if vt:
+            validation_cache.update_tickets([vt])
+            validation_cache.broadcast('ticket', dict(vt, refresh=True), buffer=False)
+        else:
+            # Keep the cached copy; it is retried on the next refresh
+            output.add_line(f'validation_poller: failed to refresh {ticket_id}: {err}')
+
+
+def _hydrate_new_tickets(new_tickets: list[dict], retries: list[dict]) -> list[str]:
+    """
+    Fetch newly arrived tickets and earlier failures once (in parallel), add
+    them to the validation cache, and broadcast each one to every client.
+
+    A ticket that fails is remembered with its index and retried on the next
+    poll; only its first failure is broadcast as an ``error`` event.
+
+    Returns:
+        IDs of the tickets that hydrated, in queue order.
+    """
+    output = Output()
+    items = [(t['index'], t['id']) for t in new_tickets + retries]
+    retried = {t['id'] for t in retries}
+    hydrated = set()
+
+    for index, ticket_id, vt, err in fetch_validation_tickets(items):
+        if vt:
+            hydrated.add(ticket_id)
+            validation_cache.add_tickets([vt])
+            validation_cache.broadcast('ticket', dict(vt, is_new=True), buffer=False)
+            if DEBUG:
+                output.add_line(f'validation_poller: hydrated new ticket {ticket_id} (index {index})')
+            continue
+        output.add_line(f'validation_poller: failed to hydrate {ticket_id}: {err}')
+        with _lock:
+            if ticket_id in _queue_ids:
+                _unhydrated[ticket_id] = index
+        if ticket_id not in retried:
+            validation_cache.broadcast('error', {
+                'index': index, 'ticket_id': ticket_id, 'is_new': True,
+                'message': err or 'Failed to fetch ticket data',
+            }, buffer=False)
+
+    with _lock:
+        for ticket_id in hydrated:
+            _unhydrated.pop(ticket_id, None)
+    return [tid for _, tid in items if tid in hydrated]
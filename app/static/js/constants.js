@@ -86,6 +86,7 @@ const CONSTANTS = {
     PRESENCE_LEAVE: '/api/presence/leave',
     TOGGLE_RECOMMENDATIONS: '/api/toggle-recommendations',
     RECOMMENDATION_STATE: '/api/recommendation-state',
+    PRIORITIZE_RECOMMENDATION: '/api/recommendations/prioritize',
     SUPPORT_GROUP_NAMES: '/api/support-group-names',
     CONSENSUS_ACTIVATE: '/api/consensus/activate',
     CONSENSUS_VOTE: '/api/consensus/vote',
@@ -95,10 +96,10 @@ const CONSTANTS = {
     TOGGLE_VALIDATION: '/api/toggle-validation',
     SYNC_CHECKBOX: '/api/sync-checkbox',
     SYNC_ASSIGNMENT_SELECTION: '/api/sync-assignment-selection',
-    SYNC_POLL_TIMER: '/api/sync-poll-timer',
     SYNC_IMPLEMENT: '/api/sync-implement',
     SYNC_STATE: '/api/sync-state',
-    UI_STATE: '/api/ui-state'
+    UI_STATE: '/api/ui-state',
+    STATE_SNAPSHOT: '/api/state-snapshot'
   },
 
   // Default configuration values
@@ -2,7 +2,7 @@
  * Main entry point - Service Desk Helper Application
  * 
  * This file initializes all managers and handles high-level application logic.
- * Button state is driven EXCLUSIVELY by the server via ui-state-update SSE
+ * Button state is driven EXCLUSIVELY by the server via 'ui' state-patch SSE
  * events.  No function in this file computes button properties locally.
  */
 
@@ -12,16 +12,18 @@ debugLog('[MAIN] - Service Desk Helper script loaded. ToggleButton available:',
 let searchUIManager;
 let assignmentUIManager;
 let navigationManager;
-// ─── Validation queue polling state ──────────────────────────────────────────
-let validationPollingInterval = null;
-let validationAlignmentTimeout = null;
+// ─── Validation queue countdown state ────────────────────────────────────────
+// The queue itself is polled server-side; clients only show the countdown.
+let validationNextPollAt = 0;
 let validationCountdownInterval = null;
 let validationCountdownSeconds = 0;
-let nextPendingTicketIndex = 10000;
 // ─────────────────────────────────────────────────────────────────────────────
 
 // ─── Validation broadcast state ───────────────────────────────────────────────
 let validationBroadcastSource = null;
+let lastBroadcastEventId = '';  // resume point sent when the stream is reopened
+// Versioned server state ('ui', 'consensus', 'headers'): name -> { version, state, pending }
+let stateDocuments = {};
 // ─────────────────────────────────────────────────────────────────────────────
 
 // ─── Presence heartbeat state ─────────────────────────────────────────────────
@@ -77,7 +79,7 @@ function initializeManagers() {
   navigationManager.initialize({
     onSwitchToSearch: () => {
       debugLog('[MAIN] - Switched to search mode callback');
-      stopValidationPolling();
+      stopCountdownTimer();
       stopPresenceHeartbeat();
       stopValidationBroadcastListener();
     },
@@ -116,6 +118,13 @@ function attachEventListeners() {
     }
   });
 
+  // Opening a validation ticket moves its recommendation ahead in the
+  // server's queue (delegated: accordion items are rendered incrementally)
+  document.addEventListener('show.bs.collapse', (e) => {
+    const item = e.target.closest(`#${CONSTANTS.SELECTORS.VALIDATION_ACCORDION} > .accordion-item[data-ticket-id]`);
+    if (item) prioritizeRecommendation(item.dataset.ticketId, 'focus');
+  });
+
   debugLog('[MAIN] - Event listeners attached');
 }
 
@@ -125,7 +134,7 @@ function attachAssignmentEventListeners() {
   assignmentUIManager.attachToggleListeners(
     () => {
       debugLog('[MAIN] - Single ticket mode selected');
-      stopValidationPolling();
+      stopCountdownTimer();
       stopPresenceHeartbeat();
       stopValidationBroadcastListener();
       TicketRenderer.clear();
@@ -268,7 +277,7 @@ function handleSingleTicketAssignment(ticketId, searchButton) {
 
 /**
  * Handle "Get validation tickets" toggle click.
- * POSTs to server; button visual updated by ui-state-update SSE.
+ * POSTs to server; button visual updated by 'ui' state-patch SSE.
  */
 async function handleGetValidationTicketsToggle() {
   debugLog('[MAIN] - Get validation tickets toggle clicked');
@@ -299,9 +308,9 @@ async function handleGetValidationTicketsToggle() {
           }
         }
       }
-      startValidationPolling();
+      resumeValidationCountdown();
     } else {
-      stopValidationPolling();
+      stopCountdownTimer();
     }
   } catch (error) {
     debugLog('[MAIN] - Error toggling validation:', error);
@@ -311,7 +320,7 @@ async function handleGetValidationTicketsToggle() {
 
 /**
  * Handle "Get recommendations" toggle click.
- * POSTs to server; button visual updated by ui-state-update SSE.
+ * POSTs to server; button visual updated by 'ui' state-patch SSE.
  */
 async function handleGetRecommendations() {
   debugLog('[MAIN] - Get ticket recommendations toggle clicked');
@@ -328,15 +337,15 @@ async function handleGetRecommendations() {
     debugLog('[MAIN] - Toggle recommendations response:', result);
 
     if (!result.active) {
-      // Toggled OFF: resume polling
+      // Toggled OFF: resume the queue countdown
       assignmentUIManager.hideRecommendationProgress();
-      startValidationPolling();
+      resumeValidationCountdown();
     } else {
-      // Toggled ON: stop polling while processing
-      stopValidationPolling();
+      // Toggled ON: the server pauses queue polling while processing
+      stopCountdownTimer();
       TicketRenderer.showPollingPausedMessage();
     }
-    // Button visual is updated by ui-state-update SSE event
+    // Button visual is updated by 'ui' state-patch SSE event
   } catch (error) {
     debugLog('[MAIN] - Error toggling recommendations:', error);
     alert('Error toggling recommendations: ' + error.message);
@@ -592,7 +601,7 @@ async function sendConsensusVote(agree) {
       debugLog('[MAIN] - Consensus vote response:', state);
       // Update local vote tracking
       assignmentUIManager._myConsensusVote = agree;
-      // Button state is updated by ui-state-update SSE event
+      // Button state is updated by 'ui' state-patch SSE event
     }
   } catch (error) { debugLog('[MAIN] - Error sending consensus vote:', error); }
 }
@@ -612,31 +621,14 @@ async function sendConsensusBannerDisagree() {
   } catch (error) { debugLog('[MAIN] - Error sending consensus disagree:', error); }
 }
 
-// ─── Validation queue polling ────────────────────────────────────────────────
-
-function startValidationPolling() {
-  stopValidationPolling();
-  const interval = CONSTANTS.DEFAULTS.VALIDATION_POLL_INTERVAL;
-  const msUntilNextTick = interval - (Date.now() % interval);
-  const secondsUntilNextTick = Math.max(1, Math.round(msUntilNextTick / 1000));
-
-  debugLog('[MAIN] - Starting validation polling (interval:', interval, 'ms)');
-  startCountdownTimer(secondsUntilNextTick);
-
-  const nextPollAt = Date.now() + msUntilNextTick;
-  syncPollTimer(nextPollAt);
+// ─── Validation queue updates ────────────────────────────────────────────────
+// The server polls the Validation queue once for every client and pushes the
+// result as 'queue-diff' events; the next poll time arrives via
+// 'poll-timer-sync'.  Clients never query the queue themselves.
 
-  validationAlignmentTimeout = setTimeout(() => {
-    validationAlignmentTimeout = null;
-    handleValidationPoll();
-    validationPollingInterval = setInterval(handleValidationPoll, interval);
-  }, msUntilNextTick);
-}
-
-function stopValidationPolling() {
-  if (validationAlignmentTimeout !== null) { clearTimeout(validationAlignmentTimeout); validationAlignmentTimeout = null; }
-  if (validationPollingInterval !== null) { clearInterval(validationPollingInterval); validationPollingInterval = null; }
-  stopCountdownTimer();
+function resumeValidationCountdown() {
+  const msRemaining = validationNextPollAt - Date.now();
+  if (msRemaining > 0) startCountdownTimer(Math.max(1, Math.round(msRemaining / 1000)));
 }
 
 function startCountdownTimer(initialSeconds) {
@@ -655,44 +647,31 @@ function stopCountdownTimer() {
   TicketRenderer.updateCountdownDisplay(null);
 }
 
-async function handleValidationPoll() {
-  debugLog('[MAIN] - Running validation ticket poll');
+function _applyQueueDiff(data) {
+  debugLog('[MAIN] - Broadcast queue-diff:', data);
   TicketRenderer.removeLeftQueueTickets();
   TicketRenderer.clearNewTicketBadges();
 
   const displayedIds = TicketRenderer.getDisplayedTicketIds();
   if (displayedIds.size === 0) return;
 
-  const idsParam = Array.from(displayedIds).join(',');
-
-  try {
-    const response = await fetch(`${CONSTANTS.API.CHECK_VALIDATION_TICKETS}?ids=${encodeURIComponent(idsParam)}`);
-    if (!response.ok) return;
-    const data = await response.json();
-
-    if (data.left_queue && data.left_queue.length > 0) TicketRenderer.markTicketsLeftQueue(data.left_queue);
-    if (data.new_in_queue && data.new_in_queue.length > 0) {
-      for (const ticketId of data.new_in_queue) {
-        const pendingIndex = nextPendingTicketIndex++;
-        TicketRenderer.addPendingTicket(ticketId, pendingIndex);
-        fetchAndHydrateTicket(ticketId, pendingIndex);
-      }
-    }
+  const leftQueue = (data.left_queue || []).filter(id => displayedIds.has(id));
+  if (leftQueue.length > 0) TicketRenderer.markTicketsLeftQueue(leftQueue);
+  // New tickets are hydrated server-side and arrive as 'ticket' events
+  // flagged is_new; show a placeholder at the server-assigned index meanwhile
+  for (const { id, index } of (data.new_tickets || [])) {
+    if (!displayedIds.has(id)) TicketRenderer.addPendingTicket(id, index);
+  }
 
-    TicketRenderer.updateLastCheckedTime(new Date());
-    const nextPollAt = Date.now() + CONSTANTS.DEFAULTS.VALIDATION_POLL_INTERVAL;
-    startCountdownTimer(Math.round(CONSTANTS.DEFAULTS.VALIDATION_POLL_INTERVAL / 1000));
-    syncPollTimer(nextPollAt);
-  } catch (error) { debugLog('[MAIN] - Poll error:', error); }
+  TicketRenderer.updateLastCheckedTime(data.checked_at ? new Date(data.checked_at) : new Date());
 }
 
-async function fetchAndHydrateTicket(ticketId, pendingIndex) {
-  try {
-    const response = await fetch(`${CONSTANTS.API.GET_SINGLE_VALIDATION_TICKET}?id=${encodeURIComponent(ticketId)}`);
-    if (!response.ok) return;
-    const ticketData = await response.json();
-    TicketRenderer.hydrateTicket(ticketId, ticketData, pendingIndex);
-  } catch (error) { debugLog('[MAIN] - Error hydrating ticket', ticketId, ':', error); }
+function _applyNewTicket(ticket) {
+  const pending = document.querySelector(
+    `#${CONSTANTS.SELECTORS.VALIDATION_ACCORDION} [data-ticket-id="${ticket.id}"].ticket-pending`
+  );
+  if (pending) TicketRenderer.hydrateTicket(ticket.id, ticket, ticket.index);
+  else TicketRenderer.appendValidationTicket(ticket, ticket.index);
 }
 
 // ─── Validation broadcast listener ───────────────────────────────────────────
@@ -707,7 +686,10 @@ function startValidationBroadcastListener() {
   if (!myPresenceColor) myPresenceColor = localStorage.getItem(CONSTANTS.STORAGE_KEYS.PRESENCE_COLOR) || null;
   if (!myDisplayName) myDisplayName = localStorage.getItem(CONSTANTS.STORAGE_KEYS.PRESENCE_DISPLAY_NAME) || null;
 
-  const url = `${CONSTANTS.API.VALIDATION_BROADCAST}?session_id=${encodeURIComponent(mySessionId)}`;
+  let url = `${CONSTANTS.API.VALIDATION_BROADCAST}?session_id=${encodeURIComponent(mySessionId)}`;
+  // EventSource only sends Last-Event-ID on its own reconnects, so pass it
+  // explicitly when the stream is reopened (watchdog) to replay just the gap
+  if (lastBroadcastEventId) url += `&last_event_id=${encodeURIComponent(lastBroadcastEventId)}`;
   debugLog('[MAIN] - Opening validation broadcast listener:', url);
   validationBroadcastSource = new EventSource(url);
 
@@ -735,13 +717,21 @@ function startValidationBroadcastListener() {
       debugLog('[MAIN] - Completion fallback triggered');
       _resetWatchdog();
       try { TicketRenderer.updateStreamingProgress(loadedCount, totalCount, true); } catch (e) {}
-      startValidationPolling();
+      resumeValidationCountdown();
     }, 5000);
   }
 
+  // Every listener records the ID of the last event received
+  function _onBroadcast(type, handler) {
+    validationBroadcastSource.addEventListener(type, (event) => {
+      if (event.lastEventId) lastBroadcastEventId = event.lastEventId;
+      handler(event);
+    });
+  }
+
   // ── SSE event handlers ─────────────────────────────────────────────────
 
-  validationBroadcastSource.addEventListener('state', (event) => {
+  _onBroadcast('state', (event) => {
     const data = JSON.parse(event.data);
     if (data.state === 'loading') {
       const accordion = document.getElementById(CONSTANTS.SELECTORS.VALIDATION_ACCORDION);
@@ -752,7 +742,7 @@ function startValidationBroadcastListener() {
     }
   });
 
-  validationBroadcastSource.addEventListener('count', (event) => {
+  _onBroadcast('count', (event) => {
     const data = JSON.parse(event.data);
     totalCount = data.count;
     if (totalCount === 0) { _resetWatchdog(); TicketRenderer.renderError('No validation tickets found.'); }
@@ -764,8 +754,10 @@ function startValidationBroadcastListener() {
     }
   });
 
-  validationBroadcastSource.addEventListener('ticket', (event) => {
+  _onBroadcast('ticket', (event) => {
     const ticket = JSON.parse(event.data);
+    if (ticket.is_new) { _applyNewTicket(ticket); return; }
+    if (ticket.refresh) { TicketRenderer.refreshValidationTicket(ticket); return; }
     TicketRenderer.appendValidationTicket(ticket, ticket.index);
     loadedCount++;
     TicketRenderer.updateStreamingProgress(loadedCount, totalCount, false);
@@ -773,17 +765,18 @@ function startValidationBroadcastListener() {
     if (totalCount > 0 && loadedCount >= totalCount) _scheduleCompletionFallback();
   });
 
-  validationBroadcastSource.addEventListener('complete', (event) => {
+  _onBroadcast('complete', (event) => {
     const data = JSON.parse(event.data);
     _resetWatchdog();
     if (completionFallbackTimer !== null) { clearTimeout(completionFallbackTimer); completionFallbackTimer = null; }
     try { TicketRenderer.updateStreamingProgress(loadedCount, totalCount, true); } catch (e) {}
-    startValidationPolling();
+    resumeValidationCountdown();
   });
 
-  validationBroadcastSource.addEventListener('error', (event) => {
+  _onBroadcast('error', (event) => {
     try {
       const errorData = JSON.parse(event.data);
+      if (errorData.is_new) return;
       if (errorData.ticket_id) { loadedCount++; _startWatchdog(); }
       else { _resetWatchdog(); TicketRenderer.renderError('Error loading validation tickets: ' + errorData.message); }
     } catch (e) {}
@@ -791,55 +784,57 @@ function startValidationBroadcastListener() {
 
   // ── Sync events ────────────────────────────────────────────────────────
 
-  validationBroadcastSource.addEventListener('consensus-state', (event) => {
-    try {
-      const state = JSON.parse(event.data);
-      debugLog('[MAIN] - Broadcast consensus-state:', state);
-      // Consensus state is now handled by ui-state-update via button_rules
-      // Update local vote tracking
-      if (mySessionId && state.agreed) {
-        assignmentUIManager._myConsensusVote = state.agreed.includes(mySessionId);
-      }
-    } catch (e) {}
-  });
-
-  validationBroadcastSource.addEventListener('checkbox-sync', (event) => {
+  _onBroadcast('checkbox-sync', (event) => {
     try { _applySyncedCheckboxState(JSON.parse(event.data)); } catch (e) {}
   });
 
-  validationBroadcastSource.addEventListener('assignment-selection-sync', (event) => {
+  _onBroadcast('assignment-selection-sync', (event) => {
     try { _applySyncedAssignmentSelection(JSON.parse(event.data)); } catch (e) {}
   });
 
-  validationBroadcastSource.addEventListener('poll-timer-sync', (event) => {
+  _onBroadcast('poll-timer-sync', (event) => {
     try { _applySyncedPollTimer(JSON.parse(event.data)); } catch (e) {}
   });
 
-  validationBroadcastSource.addEventListener('implement-complete', (event) => {
+  _onBroadcast('queue-diff', (event) => {
+    try { _applyQueueDiff(JSON.parse(event.data)); } catch (e) {}
+  });
+
+  // The server dropped this connection's backlog (client too slow); reopen
+  // now and resume from the last event received instead of waiting for the
+  // browser's automatic reconnect
+  _onBroadcast('resync', () => {
+    debugLog('[MAIN] - Broadcast resync — reconnecting from', lastBroadcastEventId);
+    _resetWatchdog();
+    if (validationBroadcastSource) { validationBroadcastSource.close(); validationBroadcastSource = null; }
+    startValidationBroadcastListener();
+  });
+
+  _onBroadcast('implement-complete', (event) => {
     try {
       const data = JSON.parse(event.data);
       if (data.assigned_ticket_ids && data.assigned_ticket_ids.length > 0)
         TicketRenderer.removeAssignedTickets(data.assigned_ticket_ids);
       if (data.results) TicketRenderer.renderAssignmentResults(data);
-      // Button state driven by ui-state-update SSE
+      // Button state driven by 'ui' state-patch SSE
     } catch (e) {}
   });
 
-  validationBroadcastSource.addEventListener('recommendation-toggle', (event) => {
+  _onBroadcast('recommendation-toggle', (event) => {
     try {
       const data = JSON.parse(event.data);
       if (data.active) {
-        stopValidationPolling();
+        stopCountdownTimer();
         TicketRenderer.showPollingPausedMessage();
       } else {
         assignmentUIManager.hideRecommendationProgress();
-        startValidationPolling();
+        resumeValidationCountdown();
       }
-      // Button visual driven by ui-state-update SSE
+      // Button visual driven by 'ui' state-patch SSE
     } catch (e) {}
   });
 
-  validationBroadcastSource.addEventListener('recommendation-start', (event) => {
+  _onBroadcast('recommendation-start', (event) => {
     try {
       const data = JSON.parse(event.data);
       if (assignmentUIManager && data.ticket_id) {
@@ -851,7 +846,7 @@ function startValidationBroadcastListener() {
     } catch (e) {}
   });
 
-  validationBroadcastSource.addEventListener('recommendation-complete', (event) => {
+  _onBroadcast('recommendation-complete', (event) => {
     try {
       const data = JSON.parse(event.data);
       const ticketItem = document.querySelector(`[data-ticket-id="${data.ticket_id}"]`);
@@ -863,7 +858,7 @@ function startValidationBroadcastListener() {
     } catch (e) {}
   });
 
-  validationBroadcastSource.addEventListener('recommendation-error', (event) => {
+  _onBroadcast('recommendation-error', (event) => {
     try {
       const data = JSON.parse(event.data);
       const ticketItem = document.querySelector(`[data-ticket-id="${data.ticket_id}"]`);
@@ -874,52 +869,134 @@ function startValidationBroadcastListener() {
     } catch (e) {}
   });
 
-  validationBroadcastSource.addEventListener('recommendation-progress', (event) => {
+  _onBroadcast('recommendation-progress', (event) => {
     try {
       const data = JSON.parse(event.data);
       if (assignmentUIManager && assignmentUIManager.isRecommendationToggleActive()) {
         if (data.completed > 0 && data.completed >= data.total) {
           assignmentUIManager.showRecommendationComplete(data.total);
-          startValidationPolling();
+          resumeValidationCountdown();
         }
       }
     } catch (e) {}
   });
 
-  validationBroadcastSource.addEventListener('sync-state-burst', (event) => {
+  _onBroadcast('sync-state-burst', (event) => {
     try { _applySyncStateBurst(JSON.parse(event.data)); } catch (e) {}
   });
 
-  // ── ticket-header-update: SERVER-DRIVEN HEADER STATE ───────────────────
-  validationBroadcastSource.addEventListener('ticket-header-update', (event) => {
-    try {
-      const headerState = JSON.parse(event.data);
-      debugLog('[MAIN] - Broadcast ticket-header-update:', headerState.ticket_id, headerState.header_style);
-      TicketRenderer.applyServerHeaderState(headerState);
-    } catch (e) {}
+  // ── Versioned state documents: button state, consensus, ticket headers ─
+  // A snapshot replaces the document; patches apply on top of it.
+  _onBroadcast('state-snapshot', (event) => {
+    try { _applyStateSnapshot(JSON.parse(event.data)); } catch (e) {}
   });
 
-  // ── ui-state-update: THE SINGLE SOURCE OF TRUTH FOR BUTTON STATE ───────
-  validationBroadcastSource.addEventListener('ui-state-update', (event) => {
-    try {
-      const state = JSON.parse(event.data);
-      debugLog('[MAIN] - Broadcast ui-state-update:', state);
-      if (assignmentUIManager) assignmentUIManager.applyUIState(state);
-
-      // Handle countdown visibility from server state
-      if (state.countdown_visible === false) {
-        stopCountdownTimer();
-      }
-    } catch (e) {}
+  _onBroadcast('state-patch', (event) => {
+    try { _applyStatePatch(JSON.parse(event.data)); } catch (e) {}
   });
 
   validationBroadcastSource.onerror = (err) => {
     debugLog('[MAIN] - Broadcast connection error (will auto-reconnect):', err);
+    // EventSource gives up for good on a non-200 response (503 while the
+    // server drains or is at its connection limit), so retry with jitter
+    const source = validationBroadcastSource;
+    if (source && source.readyState === EventSource.CLOSED) {
+      setTimeout(() => {
+        if (validationBroadcastSource !== source) return;
+        validationBroadcastSource = null;
+        startValidationBroadcastListener();
+      }, 3000 + Math.random() * 4000);
+    }
   };
 }
 
 function stopValidationBroadcastListener() {
   if (validationBroadcastSource) { validationBroadcastSource.close(); validationBroadcastSource = null; }
+  // The view is torn down with the stream, so the next one needs a full snapshot
+  lastBroadcastEventId = '';
+  stateDocuments = {};
+}
+
+// ─── Versioned state documents ───────────────────────────────────────────────
+
+function _applyStateSnapshot(data) {
+  debugLog('[MAIN] - State snapshot:', data.doc, 'v' + data.version);
+  stateDocuments[data.doc] = { version: data.version, state: data.state, pending: false };
+  _onStateDocumentChanged(data.doc, data.state, null);
+}
+
+function _applyStatePatch(patch) {
+  const doc = stateDocuments[patch.doc];
+  if (doc && doc.pending) return;                  // snapshot on its way
+  if (doc && patch.version <= doc.version) return;  // already in our snapshot
+  if (!doc || patch.base !== doc.version) {
+    debugLog('[MAIN] - State patch gap:', patch.doc, doc ? 'v' + doc.version : 'none', '→ base v' + patch.base);
+    _requestStateSnapshot(patch.doc);
+    return;
+  }
+
+  const changedKeys = new Set();
+  for (const op of patch.ops) {
+    _applyPatchOp(doc.state, op);
+    changedKeys.add(_decodePointer(op.path)[0]);
+  }
+  doc.version = patch.version;
+  _onStateDocumentChanged(patch.doc, doc.state, changedKeys);
+}
+
+function _requestStateSnapshot(name) {
+  stateDocuments[name] = Object.assign(stateDocuments[name] || { version: -1, state: {} }, { pending: true });
+  const params = new URLSearchParams({ doc: name, session_id: mySessionId || '' });
+  fetch(`${CONSTANTS.API.STATE_SNAPSHOT}?${params}`)
+    .then(r => r.json())
+    .then(data => _applyStateSnapshot(data))
+    .catch(err => {
+      debugLog('[MAIN] - Error fetching state snapshot:', err);
+      // Let the next patch trigger another attempt
+      if (stateDocuments[name]) stateDocuments[name].pending = false;
+    });
+}
+
+function _decodePointer(path) {
+  return path.split('/').slice(1).map(seg => seg.replace(/~1/g, '/').replace(/~0/g, '~'));
+}
+
+function _applyPatchOp(target, op) {
+  const keys = _decodePointer(op.path);
+  const last = keys.pop();
+  let parent = target;
+  for (const key of keys) {
+    if (parent[key] === undefined || parent[key] === null) parent[key] = {};
+    parent = parent[key];
+  }
+  if (op.op === 'remove') delete parent[last];
+  else parent[last] = op.value;
+}
+
+/**
+ * Render a state document after a snapshot or patch.
+ * @param {string} name - 'ui', 'consensus' or 'headers'
+ * @param {Object} state - The full, patched document
+ * @param {Set|null} changedKeys - Top-level keys touched by the patch (null = all)
+ */
+function _onStateDocumentChanged(name, state, changedKeys) {
+  if (name === 'ui') {
+    // THE SINGLE SOURCE OF TRUTH FOR BUTTON STATE
+    if (assignmentUIManager) assignmentUIManager.applyUIState(state);
+    // Handle countdown visibility from server state
+    if (state.countdown_visible === false) stopCountdownTimer();
+  } else if (name === 'consensus') {
+    // Consensus buttons are driven by the ui document; only track our vote here
+    if (mySessionId && state.agreed && assignmentUIManager) {
+      assignmentUIManager._myConsensusVote = state.agreed.includes(mySessionId);
+    }
+  } else if (name === 'headers') {
+    // SERVER-DRIVEN HEADER STATE
+    const ticketIds = changedKeys ? [...changedKeys] : Object.keys(state);
+    for (const ticketId of ticketIds) {
+      if (state[ticketId]) TicketRenderer.applyServerHeaderState({ ticket_id: ticketId, ...state[ticketId] });
+    }
+  }
 }
 
 // ─── Cross-client sync handlers ──────────────────────────────────────────────
@@ -965,7 +1042,7 @@ function _applySyncedAssignmentSelection(data) {
         if (clearBtn) clearBtn.style.display = 'none';
         if (typeof TicketRenderer !== 'undefined' && TicketRenderer._setAiRadiosDisabled) TicketRenderer._setAiRadiosDisabled(parseInt(index), false);
         // Header styling is driven EXCLUSIVELY by the server via
-        // 'ticket-header-update' SSE events.  Do NOT manipulate header
+        // headers 'state-patch' SSE events.  Do NOT manipulate header
         // classes locally.
       }
     } else if (field === 'manual_support_group') {
@@ -977,7 +1054,7 @@ function _applySyncedAssignmentSelection(data) {
         const clearBtn = container.querySelector(`.manual-sg-clear`); if (clearBtn) clearBtn.style.display = '';
         if (typeof TicketRenderer !== 'undefined' && TicketRenderer._setAiRadiosDisabled) TicketRenderer._setAiRadiosDisabled(parseInt(index), true);
         // Header styling is driven EXCLUSIVELY by the server via
-        // 'ticket-header-update' SSE events.  Do NOT manipulate header
+        // headers 'state-patch' SSE events.  Do NOT manipulate header
         // classes locally.
       } else {
         if (manualInput) manualInput.value = '';
@@ -986,7 +1063,7 @@ function _applySyncedAssignmentSelection(data) {
         if (typeof TicketRenderer !== 'undefined' && TicketRenderer._setAiRadiosDisabled) TicketRenderer._setAiRadiosDisabled(parseInt(index), false);
         const firstRadio = container.querySelector(`input[name="sg-selector-batch-${index}"]`); if (firstRadio) firstRadio.checked = true;
         // Header styling is driven EXCLUSIVELY by the server via
-        // 'ticket-header-update' SSE events.  Do NOT manipulate header
+        // headers 'state-patch' SSE events.  Do NOT manipulate header
         // classes locally.
       }
     } else if (field === 'priority_radio') {
@@ -994,13 +1071,19 @@ function _applySyncedAssignmentSelection(data) {
       radios.forEach(r => { r.checked = (r.value === value); });
     }
 
-    // Editor attribution is now handled by the server via 'ticket-header-update'
+    // Editor attribution is now handled by the server via the headers 'state-patch' event
     // SSE events.  No client-side editor state management needed here.
   } finally { _applyingSyncedAssignment = false; }
 }
 
 function _applySyncedPollTimer(data) {
   if (!data.next_poll_at) return;
+  validationNextPollAt = data.next_poll_at;
+  if (data.paused) {
+    stopCountdownTimer();
+    TicketRenderer.showPollingPausedMessage();
+    return;
+  }
   const secondsRemaining = Math.max(0, Math.round((data.next_poll_at - Date.now()) / 1000));
   startCountdownTimer(secondsRemaining);
 }
@@ -1029,13 +1112,6 @@ function _applySyncStateBurst(data) {
     } finally { _applyingSyncedAssignment = false; }
   }
 
-  // Apply server-computed header states (single source of truth)
-  if (data.headers) {
-    for (const [ticketId, headerState] of Object.entries(data.headers)) {
-      TicketRenderer.applyServerHeaderState({ ticket_id: ticketId, ...headerState });
-    }
-  }
-
   if (data.next_poll_at) _applySyncedPollTimer(data);
 }
 
@@ -1054,18 +1130,18 @@ function syncAssignmentSelection(ticketId, field, value) {
   // Send the actual value to the server — the server is the single source
   // of truth for determining whether a value matches the original AI
   // recommendation.  The server computes and broadcasts the authoritative
-  // header state via the 'ticket-header-update' SSE event.
+  // header state via the headers 'state-patch' SSE event.
   fetch(CONSTANTS.API.SYNC_ASSIGNMENT_SELECTION, {
     method: 'POST', headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify({ ticket_id: ticketId, field, value, session_id: mySessionId || '' })
   }).catch(err => debugLog('[MAIN] - Error syncing assignment selection:', err));
 }
 
-function syncPollTimer(nextPollAtMs) {
-  fetch(CONSTANTS.API.SYNC_POLL_TIMER, {
+function prioritizeRecommendation(ticketId, mode) {
+  fetch(CONSTANTS.API.PRIORITIZE_RECOMMENDATION, {
     method: 'POST', headers: { 'Content-Type': 'application/json' },
-    body: JSON.stringify({ next_poll_at: nextPollAtMs })
-  }).catch(err => debugLog('[MAIN] - Error syncing poll timer:', err));
+    body: JSON.stringify({ ticket_id: ticketId, mode, session_id: mySessionId || '' })
+  }).catch(err => debugLog('[MAIN] - Error prioritizing recommendation:', err));
 }
 
 debugLog('[MAIN] - Main script loaded and initialized.');
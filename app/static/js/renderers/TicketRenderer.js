@@ -679,7 +679,7 @@ class TicketRenderer {
       TicketRenderer._setAiRadiosDisabled(ticketIndex, true);
 
       // Header styling is driven EXCLUSIVELY by the server via
-      // 'ticket-header-update' SSE events.  Do NOT manipulate header
+      // headers 'state-patch' SSE events.  Do NOT manipulate header
       // classes locally — the server's ticket_header_rules.py is the
       // single source of truth.
 
@@ -707,7 +707,7 @@ class TicketRenderer {
       TicketRenderer._setAiRadiosDisabled(ticketIndex, false);
 
       // Header styling is driven EXCLUSIVELY by the server via
-      // 'ticket-header-update' SSE events.  Do NOT manipulate header
+      // headers 'state-patch' SSE events.  Do NOT manipulate header
       // classes locally.
 
       // Sync manual SG clear to other clients
@@ -1038,7 +1038,6 @@ class TicketRenderer {
    * @private
    */
   static _renderValidationAccordionItem(ticket, index) {
-    const createdDate = formatDate(ticket.created_at);
     const checkboxId = `${CONSTANTS.SELECTORS.TICKET_CHECKBOX_PREFIX}${index}`;
 
     return `
@@ -1058,7 +1057,26 @@ class TicketRenderer {
         </div>
         <div id="validationCollapse${index}" class="accordion-collapse collapse">
           <div class="accordion-body">
-            <div class="row">
+            ${this._renderValidationTicketDetails(ticket)}
+            <div id="recommendations-${index}" class="recommendations-container mt-3" style="display: none;"
+                 data-ticket-id="${ticket.id}" data-ticket-index="${index}"></div>
+          </div>
+        </div>
+      </div>
+    `;
+  }
+
+  /**
+   * Render the field columns of a validation accordion item
+   * @param {Object} ticket - Validation ticket data
+   * @returns {string} HTML string
+   * @private
+   */
+  static _renderValidationTicketDetails(ticket) {
+    const createdDate = formatDate(ticket.created_at);
+
+    return `
+            <div class="row ticket-details">
               <div class="col-md-6">
                 <p><strong>Description:</strong> ${ticket.full_description || ticket.description || 'N/A'}</p>
                 <p><strong>Status:</strong> ${ticket.status || 'N/A'}</p>
@@ -1073,13 +1091,33 @@ class TicketRenderer {
                 <p><strong>Support Group:</strong> ${ticket.support_group || 'N/A'}</p>
                 <p><strong>Resolution Notes:</strong> ${ticket.resolution_notes || 'N/A'}</p>
               </div>
-            </div>
-            <div id="recommendations-${index}" class="recommendations-container mt-3" style="display: none;"
-                 data-ticket-id="${ticket.id}" data-ticket-index="${index}"></div>
-          </div>
-        </div>
-      </div>
-    `;
+            </div>`;
+  }
+
+  /**
+   * Update the title and fields of an already rendered validation ticket in
+   * place (incremental cache refresh).  The checkbox, recommendations and
+   * header state are left untouched.
+   * @param {Object} ticket - Refreshed validation ticket data
+   */
+  static refreshValidationTicket(ticket) {
+    const item = document.querySelector(
+      `#${CONSTANTS.SELECTORS.VALIDATION_ACCORDION} > .accordion-item[data-ticket-id="${ticket.id}"]`
+    );
+    if (!item) {
+      this.appendValidationTicket(ticket, ticket.index);
+      return;
+    }
+    if (item.classList.contains('ticket-pending')) {
+      this.hydrateTicket(ticket.id, ticket, ticket.index);
+      return;
+    }
+
+    const titleSpan = item.querySelector('.ticket-title');
+    if (titleSpan) titleSpan.textContent = `${ticket.id} - ${ticket.title || 'N/A'}`;
+    const details = item.querySelector('.ticket-details');
+    if (details) details.outerHTML = this._renderValidationTicketDetails(ticket);
+    debugLog('[RENDERER] - Refreshed validation ticket', ticket.id);
   }
 
   /**
@@ -1467,7 +1505,7 @@ class TicketRenderer {
    *
    * This is the **single source of truth** for header styling and editor
    * attribution.  The server's ticket_header_rules.py computes the state
-   * and broadcasts it via the 'ticket-header-update' SSE event.
+   * and broadcasts it via the headers 'state-patch' SSE event.
    *
    * @param {Object} headerState - Pre-computed header state from the server
    * @param {string} headerState.ticket_id - The ticket ID
@@ -1544,7 +1582,7 @@ class TicketRenderer {
    *
    * @deprecated Use applyServerHeaderState() instead. This method is kept
    * for backward compatibility but the server is now the single source of
-   * truth for header state via 'ticket-header-update' SSE events.
+   * truth for header state via headers 'state-patch' SSE events.
    *
    * @param {string} ticketId - The ticket ID
    * @param {Object} editors - Map of field → {session_id, label, color}
@@ -4,7 +4,7 @@
  * The three workflow buttons ("Get validation tickets", "Get ticket
  * recommendations", "Implement ticket assignment") are rendered EXCLUSIVELY
  * by applyUIState(), which receives its data from the server via SSE
- * ui-state-update events.  No method in this class computes button
+ * 'ui' state-patch events.  No method in this class computes button
  * properties (disabled, label, style) locally.
  *
  * The server's button_rules.py is the single source of truth.
@@ -220,7 +220,7 @@ class AssignmentUIManager {
 
   showRecommendationComplete(total) {
     // Guard: only show the completion message once per recommendation cycle.
-    // Prevents repeated calls from ui-state-update SSE events from restarting
+    // Prevents repeated calls from 'ui' state-patch SSE events from restarting
     // the animation and keeping the label visible indefinitely.
     if (this._recommendationCompleteShown) return;
     this._recommendationCompleteShown = true;
@@ -266,7 +266,7 @@ class AssignmentUIManager {
    * and CSS classes for the three workflow buttons.  The server's
    * button_rules.py is the single source of truth.
    *
-   * @param {Object} state - The full ui-state-update payload from the server
+   * @param {Object} state - The full 'ui' state document from the server
    */
   applyUIState(state) {
     if (!state || !state.buttons) return;
@@ -0,0 +1,82 @@
+"""
+Shared helpers for the benchmark suites: percentile summaries, run metadata
+and result files.
+
+Every suite writes one JSON document per run to ``benchmarks/results/``
+(``<suite>-<UTC timestamp>-<commit>.json``) with a ``meta`` block naming the
+commit, so two runs can be diffed with ``python -m benchmarks.compare``.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0 for an empty list)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize_ms(samples_seconds: list) -> dict:
+    """Count, mean, p50/p95/p99 and max of *samples_seconds*, in milliseconds."""
+    values = sorted(s * 1000.0 for s in samples_seconds)
+    if not values:
+        return {'count': 0}
+    return {
+        'count': len(values),
+        'mean_ms': round(sum(values) / len(values), 3),
+        'p50_ms': round(percentile(values, 50), 3),
+        'p95_ms': round(percentile(values, 95), 3),
+        'p99_ms': round(percentile(values, 99), 3),
+        'max_ms': round(values[-1], 3),
+    }
+
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(
+            ['git', *args], cwd=ROOT, capture_output=True, text=True, timeout=10,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def run_metadata(suite: str, params: dict) -> dict:
+    """Commit, host and parameter description recorded with every result file."""
+    return {
+        'suite': suite,
+        'commit': _git('rev-parse', '--short', 'HEAD') or 'unknown',
+        'branch': _git('rev-parse', '--abbrev-ref', 'HEAD'),
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'params': params,
+    }
+
+
+def write_results(suite: str, results: dict, path: str | None = None) -> str:
+    """Write *results* as JSON (default: a new file in ``benchmarks/results``) and return the path."""
+    if path is None:
+        meta = results.get('meta', {})
+        stamp = time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{suite}-{stamp}-{meta.get('commit', 'unknown')}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return path
+
+
+def log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
@@ -0,0 +1,96 @@
+"""
+Compare two benchmark result files.
+
+Walks every numeric value the two runs have in common and prints the change.
+Latencies, durations, memory and allocation figures are lower-is-better;
+throughput and ops/sec figures are higher-is-better.  With ``--threshold``
+the exit status is 1 when any such figure regresses by more than that
+percentage, so the comparison can gate a CI job.
+
+Usage:
+    python -m benchmarks.compare BASELINE.json CANDIDATE.json [--threshold 10] [--all]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Ensure the project root is on sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HIGHER_IS_BETTER = ('throughput', 'ops_per_sec', 'per_sec', 'rps', 'delivered_ratio')
+LOWER_IS_BETTER = ('_ms', 'seconds', '_mb', 'bytes', 'blocks', 'errors', 'reconnects')
+
+
+def _flatten(value, prefix=''):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == 'meta':
+                continue
+            yield from _flatten(item, f'{prefix}.{key}' if prefix else str(key))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix, float(value)
+
+
+def direction(path: str) -> int:
+    """+1 when larger is better, -1 when smaller is better, 0 when neutral."""
+    leaf = path.rsplit('.', 1)[-1]
+    if any(token in leaf for token in HIGHER_IS_BETTER):
+        return 1
+    if any(token in leaf for token in LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def compare(baseline: dict, candidate: dict) -> list:
+    """Return ``(path, old, new, percent change, regression %)`` for every shared metric."""
+    old_values = dict(_flatten(baseline))
+    rows = []
+    for path, new in _flatten(candidate):
+        if path not in old_values:
+            continue
+        old = old_values[path]
+        change = ((new - old) / old * 100.0) if old else (0.0 if new == old else float('inf'))
+        sign = direction(path)
+        regression = -change * sign if sign else 0.0
+        rows.append((path, old, new, change, regression))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files.')
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, help='fail when a metric regresses by more than this percentage')
+    parser.add_argument('--all', action='store_true', help='also list neutral and unchanged metrics')
+    args = parser.parse_args()
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.candidate, 'r', encoding='utf-8') as f:
+        candidate = json.load(f)
+
+    print(f"baseline  {baseline.get('meta', {}).get('commit')}  {args.baseline}")
+    print(f"candidate {candidate.get('meta', {}).get('commit')}  {args.candidate}")
+    print()
+
+    regressions = []
+    for path, old, new, change, regression in compare(baseline, candidate):
+        if not args.all and (direction(path) == 0 or old == new):
+            continue
+        flag = ''
+        if args.threshold is not None and regression > args.threshold:
+            flag = '  REGRESSION'
+            regressions.append(path)
+        elif regression < 0:
+            flag = '  improved'
+        print(f'{path:70} {old:>14.3f} {new:>14.3f} {change:>+9.1f}%{flag}')
+
+    if regressions:
+        print(f'\n{len(regressions)} metric(s) regressed by more than {args.threshold}%')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
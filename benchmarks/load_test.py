@@ -0,0 +1,619 @@
+"""
+End-to-end load test for the validation and recommendation flows.
+
+Starts the local upstream stand-ins (``mock_services``) and the app as two
+separate child processes, so the stand-ins' synthetic corpus and CPU work
+(embeddings, JSON) neither count towards the app's memory nor compete for
+its GIL, then simulates *N* concurrent viewers.  Each viewer holds an
+SSE connection to ``/api/validation-broadcast`` (reconnecting with its last
+event ID like the browser does), sends presence heartbeats, polls
+``/api/check-validation-tickets`` and ``/api/ui-state``, and clicks
+checkboxes and assignment radios at a configurable rate.
+
+Phases:
+
+1. connect every viewer and wait for its initial state;
+2. trigger a validation load of *M* tickets and time until every viewer has
+   received ``complete``;
+3. turn recommendations on and time the batch until every ticket has a
+   ``recommendation-complete`` (or ``-error``) event;
+4. keep the viewers interacting for the remaining ``--duration``.
+
+Reported: per-endpoint throughput and p50/p95/p99 latency, SSE connect time,
+SSE delivery lag (assignment selections carry a unique value, so each
+broadcast is matched to the POST that caused it), the server's own
+per-client SSE stats, and the app process's resident memory.  Results are
+written as JSON to ``benchmarks/results/``; compare two runs with
+``python -m benchmarks.compare``.
+
+Usage:
+    python -m benchmarks.load_test [--viewers 20] [--tickets 50] [--duration 60]
+    python -m benchmarks.load_test --target http://127.0.0.1:5000 --pid 12345
+
+Mock knobs can be passed through after ``--``, e.g.
+``python -m benchmarks.load_test -- --latency llm=3000 --error-rate athena=0.02``.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import uuid
+
+# Ensure the project root is on sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import ROOT, log, run_metadata, summarize_ms, write_results
+
+
+# ── HTTP ──────────────────────────────────────────────────────────────────────
+
+class Recorder:
+    """Latency samples and error counts per endpoint, shared by all viewers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples: dict = {}
+        self._errors: dict = {}
+
+    def record(self, endpoint: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._samples.setdefault(endpoint, []).append(seconds)
+            if not ok:
+                self._errors[endpoint] = self._errors.get(endpoint, 0) + 1
+
+    def summary(self, window_seconds: float) -> dict:
+        with self._lock:
+            samples = {k: list(v) for k, v in self._samples.items()}
+            errors = dict(self._errors)
+        result = {}
+        for endpoint, values in sorted(samples.items()):
+            stats = summarize_ms(values)
+            stats['errors'] = errors.get(endpoint, 0)
+            stats['throughput_rps'] = round(len(values) / window_seconds, 3) if window_seconds > 0 else 0.0
+            result[endpoint] = stats
+        return result
+
+
+class Client:
+    """Keep-alive HTTP client for one thread; reconnects after any failure."""
+
+    def __init__(self, base_url: str, recorder: Recorder, timeout: float = 60.0):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.host, self.port = parsed.hostname, parsed.port or 80
+        self.recorder = recorder
+        self.timeout = timeout
+        self._conn = None
+
+    def request(self, method: str, path: str, body: dict | None = None, endpoint: str | None = None):
+        """Send one request and return ``(status, parsed JSON or None)``; status 0 on failure."""
+        endpoint = endpoint or f"{method} {path.split('?', 1)[0]}"
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload is not None else {}
+        start = time.perf_counter()
+        status, data = 0, None
+        try:
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._conn.request(method, path, body=payload, headers=headers)
+            response = self._conn.getresponse()
+            raw = response.read()
+            status = response.status
+            if response.getheader('Connection', '').lower() == 'close':
+                self.close()
+            try:
+                data = json.loads(raw) if raw else None
+            except ValueError:
+                data = None
+        except (OSError, http.client.HTTPException):
+            self.close()
+        self.recorder.record(endpoint, time.perf_counter() - start, 200 <= status < 400)
+        return status, data
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# ── Simulated viewer ──────────────────────────────────────────────────────────
+
+class LagTracker:
+    """Send times of marked assignment values, matched against SSE arrivals."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sent: dict = {}
+        self.samples: list = []
+        self.expected = 0
+
+    def mark(self, value: str, viewers: int) -> None:
+        with self._lock:
+            self._sent[value] = time.perf_counter()
+            self.expected += viewers
+
+    def arrived(self, value: str) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            sent = self._sent.get(value)
+            if sent is not None:
+                self.samples.append(now - sent)
+
+
+class Viewer:
+    """One browser tab: an SSE reader thread plus an activity thread."""
+
+    def __init__(self, index: int, base_url: str, recorder: Recorder, lag: LagTracker, args):
+        self.index = index
+        self.base_url = base_url
+        self.recorder = recorder
+        self.lag = lag
+        self.args = args
+        self.session_id = str(uuid.uuid4())
+        self.rng = random.Random(args.seed * 1000 + index)
+
+        self.stop = threading.Event()
+        self.connected = threading.Event()
+        self.loaded = threading.Event()
+        self.interactive = threading.Event()
+
+        self.lock = threading.Lock()
+        self.ticket_ids: list = []
+        self.recommended: set = set()
+        self.event_counts: dict = {}
+        self.bytes_received = 0
+        self.reconnects = 0
+        self.last_event_id = None
+        self._conn = None
+
+    # SSE ---------------------------------------------------------------------
+
+    def run_stream(self) -> None:
+        parsed = urllib.parse.urlsplit(self.base_url)
+        while not self.stop.is_set():
+            query = {'session_id': self.session_id}
+            if self.last_event_id:
+                query['last_event_id'] = self.last_event_id
+            start = time.perf_counter()
+            try:
+                self._conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=60)
+                self._conn.request('GET', '/api/validation-broadcast?' + urllib.parse.urlencode(query),
+                                   headers={'Accept': 'text/event-stream'})
+                response = self._conn.getresponse()
+                if response.status != 200:
+                    response.read()
+                    self.recorder.record('SSE connect', time.perf_counter() - start, False)
+                    time.sleep(1.0)
+                    continue
+                self._read_frames(response, start)
+            except (OSError, http.client.HTTPException):
+                pass
+            finally:
+                if self._conn is not None:
+                    self._conn.close()
+            if not self.stop.is_set():
+                self.reconnects += 1
+                time.sleep(self.rng.uniform(0.1, 0.5))
+
+    def _read_frames(self, response, start: float) -> None:
+        first = True
+        event, data_lines, event_id = 'message', [], None
+        while not self.stop.is_set():
+            line = response.readline()
+            if not line:
+                return   # server closed the stream (drain / resync)
+            self.bytes_received += len(line)
+            line = line.decode('utf-8').rstrip('\r\n')
+            if line:
+                field, _, value = line.partition(':')
+                value = value[1:] if value.startswith(' ') else value
+                if field == 'event':
+                    event = value
+                elif field == 'data':
+                    data_lines.append(value)
+                elif field == 'id':
+                    event_id = value
+                continue
+            if not data_lines:
+                continue   # keepalive comment
+            if first:
+                self.recorder.record('SSE connect', time.perf_counter() - start, True)
+                self.connected.set()
+                first = False
+            if event_id:
+                self.last_event_id = event_id
+            self._on_event(event, '\n'.join(data_lines))
+            event, data_lines, event_id = 'message', [], None
+
+    def _on_event(self, event: str, raw: str) -> None:
+        with self.lock:
+            self.event_counts[event] = self.event_counts.get(event, 0) + 1
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return
+        if event == 'ticket' and isinstance(data, dict) and data.get('id'):
+            with self.lock:
+                if data['id'] not in self.ticket_ids:
+                    self.ticket_ids.append(data['id'])
+        elif event == 'complete':
+            self.loaded.set()
+        elif event in ('recommendation-complete', 'recommendation-error'):
+            with self.lock:
+                self.recommended.add(data.get('ticket_id'))
+        elif event == 'assignment-selection-sync':
+            value = str(data.get('value', ''))
+            if value.startswith('bench-'):
+                self.lag.arrived(value)
+
+    # Activity ----------------------------------------------------------------
+
+    def run_activity(self) -> None:
+        client = Client(self.base_url, self.recorder)
+        args = self.args
+        next_heartbeat = next_poll = time.monotonic()
+        next_action = time.monotonic() + self._action_gap()
+        while not self.stop.is_set():
+            now = time.monotonic()
+            if now >= next_heartbeat:
+                client.request('POST', '/api/presence/heartbeat', {
+                    'session_id': self.session_id, 'display_name': f'Bench Viewer {self.index}',
+                })
+                next_heartbeat = now + args.heartbeat_interval
+            if self.interactive.is_set() and now >= next_poll:
+                with self.lock:
+                    ids = ','.join(self.ticket_ids)
+                client.request('GET', '/api/check-validation-tickets?' + urllib.parse.urlencode({'ids': ids}))
+                client.request('GET', '/api/ui-state?' + urllib.parse.urlencode({'session_id': self.session_id}))
+                next_poll = now + args.poll_interval
+            if self.interactive.is_set() and now >= next_action:
+                self._act(client)
+                next_action = now + self._action_gap()
+            deadlines = [next_heartbeat]
+            if self.interactive.is_set():
+                deadlines += [next_poll, next_action]
+            self.stop.wait(max(0.01, min(0.5, min(deadlines) - time.monotonic())))
+        client.request('POST', '/api/presence/leave', {'session_id': self.session_id})
+        client.close()
+
+    def _action_gap(self) -> float:
+        rate = self.args.action_rate
+        return self.rng.expovariate(rate) if rate > 0 else float('inf')
+
+    def _act(self, client: Client) -> None:
+        with self.lock:
+            if not self.ticket_ids:
+                return
+            ticket_id = self.rng.choice(self.ticket_ids)
+        if self.rng.random() < 0.5:
+            client.request('POST', '/api/sync-checkbox', {
+                'ticket_id': ticket_id, 'checked': self.rng.random() < 0.5,
+            })
+        else:
+            value = f'bench-{uuid.uuid4().hex[:12]}'
+            self.lag.mark(value, self.args.viewers)
+            client.request('POST', '/api/sync-assignment-selection', {
+                'ticket_id': ticket_id, 'field': 'manual_support_group',
+                'value': value, 'session_id': self.session_id,
+            })
+
+    def close(self) -> None:
+        self.stop.set()
+        conn = self._conn
+        if conn is not None and conn.sock is not None:
+            try:
+                conn.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+# ── App process ───────────────────────────────────────────────────────────────
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _rss_mb(pid: int):
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        return None
+    return None
+
+
+class MemorySampler(threading.Thread):
+    """Samples the app process's resident set size (Linux ``/proc``)."""
+
+    def __init__(self, pid, interval: float = 0.5):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples: list = []
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while self.pid and not self._stop_event.is_set():
+            rss = _rss_mb(self.pid)
+            if rss is not None:
+                self.samples.append(rss)
+            self._stop_event.wait(self.interval)
+
+    def stop(self) -> dict:
+        self._stop_event.set()
+        if not self.samples:
+            return {'available': False}
+        return {
+            'available': True,
+            'rss_start_mb': round(self.samples[0], 1),
+            'rss_peak_mb': round(max(self.samples), 1),
+            'rss_end_mb': round(self.samples[-1], 1),
+            'rss_growth_mb': round(self.samples[-1] - self.samples[0], 1),
+        }
+
+
+# Serves the app the way ``python -m mock_services --run-app`` does, but
+# without the stand-ins in the same process.
+_APP_COMMAND = (
+    'import sys, threading; sys.path.insert(0, "."); '
+    'from app.factory import create_app, warm_up_warehouse; '
+    'app = create_app(); '
+    'threading.Thread(target=warm_up_warehouse, daemon=True).start(); '
+    'app.run(host="127.0.0.1", port=int(sys.argv[1]), threaded=True)'
+)
+
+
+def start_mock(args, mock_args: list, timeout: float = 30.0):
+    """
+    Launch ``python -m mock_services --print-env`` and return
+    ``(process, environment, log path)``; the environment points the app at it.
+    """
+    from mock_services.server import app_environment
+
+    port = _free_port()
+    log_file = tempfile.NamedTemporaryFile(prefix='load-test-mock-', suffix='.log', delete=False)
+    command = [
+        sys.executable, '-u', '-m', 'mock_services', '--print-env', '--port', str(port),
+        '--validation-tickets', str(args.tickets), '--seed', str(args.seed), *mock_args,
+    ]
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.PIPE, stderr=log_file, text=True)
+
+    expected = set(app_environment(f'http://127.0.0.1:{port}'))
+    environment = {}
+    deadline = time.monotonic() + timeout
+    while not expected <= set(environment) and time.monotonic() < deadline:
+        line = process.stdout.readline()
+        if not line:
+            break   # exited before printing everything
+        key, _, value = line.strip().partition('=')
+        if key in expected:
+            environment[key] = value.strip("'")
+    if not expected <= set(environment):
+        process.kill()
+        raise SystemExit(f'Mock upstreams did not start; see {log_file.name}')
+    return process, environment, log_file.name
+
+
+def start_app(environment: dict):
+    """Launch the app against *environment* and return ``(process, base url, log path)``."""
+    app_port = _free_port()
+    log_file = tempfile.NamedTemporaryFile(prefix='load-test-app-', suffix='.log', delete=False)
+    process = subprocess.Popen(
+        [sys.executable, '-c', _APP_COMMAND, str(app_port)], cwd=ROOT,
+        env={**os.environ, **environment}, stdout=log_file, stderr=subprocess.STDOUT,
+    )
+    return process, f'http://127.0.0.1:{app_port}', log_file.name
+
+
+def _stop(process) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def wait_ready(base_url: str, timeout: float, process=None) -> bool:
+    client = Client(base_url, Recorder(), timeout=5)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            return False
+        status, _ = client.request('GET', '/api/ui-state')
+        if status == 200:
+            client.close()
+            return True
+        time.sleep(0.25)
+    return False
+
+
+# ── Run ───────────────────────────────────────────────────────────────────────
+
+def _wait_all(events, timeout: float):
+    """Wait for every event; return seconds taken (None on timeout) and how many were set."""
+    start = time.perf_counter()
+    deadline = start + timeout
+    for event in events:
+        event.wait(max(0.0, deadline - time.perf_counter()))
+    done = sum(1 for e in events if e.is_set())
+    return (round(time.perf_counter() - start, 3) if done == len(events) else None), done
+
+
+def run(args, base_url: str, pid) -> dict:
+    recorder = Recorder()
+    lag = LagTracker()
+    control = Client(base_url, recorder)
+    viewers = [Viewer(i, base_url, recorder, lag, args) for i in range(args.viewers)]
+    memory = MemorySampler(pid)
+    memory.start()
+
+    threads = []
+    for viewer in viewers:
+        for target in (viewer.run_stream, viewer.run_activity):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            threads.append(thread)
+        time.sleep(args.ramp_up / max(1, args.viewers))
+
+    phases = {}
+    connect_seconds, connected = _wait_all([v.connected for v in viewers], args.load_timeout)
+    phases['connect'] = {'seconds': connect_seconds, 'viewers_connected': connected}
+    log(f'{connected}/{len(viewers)} viewers connected')
+
+    # Validation load
+    start = time.perf_counter()
+    status, body = control.request('POST', '/api/trigger-validation-load', {}, endpoint='POST /api/trigger-validation-load')
+    seconds, loaded = _wait_all([v.loaded for v in viewers], args.load_timeout)
+    phases['validation_load'] = {
+        'trigger_status': (body or {}).get('status', status),
+        'seconds': seconds,
+        'viewers_complete': loaded,
+        'tickets_received': max((len(v.ticket_ids) for v in viewers), default=0),
+    }
+    log(f'validation load: {loaded}/{len(viewers)} viewers complete in {seconds}s')
+
+    activity_start = time.perf_counter()
+    for viewer in viewers:
+        viewer.interactive.set()
+
+    # Recommendation batch (viewers keep interacting meanwhile)
+    if not args.no_recommendations:
+        total = max((len(v.ticket_ids) for v in viewers), default=0)
+        start = time.perf_counter()
+        control.request('POST', '/api/toggle-recommendations', {'active': True})
+        deadline = start + args.recommendation_timeout
+        watcher = viewers[0]
+        while time.perf_counter() < deadline:
+            with watcher.lock:
+                done = len(watcher.recommended)
+            if done >= total:
+                break
+            time.sleep(0.1)
+        elapsed = time.perf_counter() - start
+        with watcher.lock:
+            done = len(watcher.recommended)
+        phases['recommendations'] = {
+            'tickets': total,
+            'completed': done,
+            'seconds': round(elapsed, 3) if done >= total else None,
+            'throughput_per_sec': round(done / elapsed, 3) if elapsed > 0 else 0.0,
+        }
+        log(f'recommendations: {done}/{total} in {elapsed:.1f}s')
+
+    remaining = args.duration - (time.perf_counter() - activity_start)
+    if remaining > 0:
+        log(f'steady state for {remaining:.0f}s')
+        time.sleep(remaining)
+    window = time.perf_counter() - activity_start
+
+    _, client_stats = control.request('GET', '/api/validation-broadcast/clients', endpoint='GET /api/validation-broadcast/clients')
+    _, stage_metrics = control.request('GET', '/api/metrics', endpoint='GET /api/metrics')
+
+    if not args.no_recommendations:
+        control.request('POST', '/api/toggle-recommendations', {'active': False})
+    for viewer in viewers:
+        viewer.close()
+    for thread in threads:
+        thread.join(timeout=5)
+    control.close()
+
+    event_totals: dict = {}
+    for viewer in viewers:
+        for event, count in viewer.event_counts.items():
+            event_totals[event] = event_totals.get(event, 0) + count
+    lag_stats = summarize_ms(lag.samples)
+    lag_stats['expected'] = lag.expected
+    lag_stats['delivered_ratio'] = round(len(lag.samples) / lag.expected, 4) if lag.expected else None
+
+    return {
+        'phases': phases,
+        'endpoints': recorder.summary(window),
+        'activity_window_seconds': round(window, 3),
+        'sse': {
+            'viewers': len(viewers),
+            'reconnects': sum(v.reconnects for v in viewers),
+            'events_received': sum(event_totals.values()),
+            'bytes_received': sum(v.bytes_received for v in viewers),
+            'events_by_type': dict(sorted(event_totals.items())),
+            'delivery_lag': lag_stats,
+            'server_client_stats': client_stats,
+        },
+        'server_metrics': stage_metrics,
+        'memory': memory.stop(),
+    }
+
+
+def main() -> None:
+    argv = sys.argv[1:]
+    mock_args = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, mock_args = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description='End-to-end load test against the local upstream stand-ins.')
+    parser.add_argument('--viewers', type=int, default=20, help='concurrent simulated viewers')
+    parser.add_argument('--tickets', type=int, default=50, help='validation tickets served by the stand-ins')
+    parser.add_argument('--duration', type=float, default=60, help='seconds of interaction after the load')
+    parser.add_argument('--ramp-up', type=float, default=2, help='seconds over which viewers connect')
+    parser.add_argument('--heartbeat-interval', type=float, default=10)
+    parser.add_argument('--poll-interval', type=float, default=15)
+    parser.add_argument('--action-rate', type=float, default=0.5, help='checkbox/assignment clicks per viewer per second')
+    parser.add_argument('--load-timeout', type=float, default=120)
+    parser.add_argument('--recommendation-timeout', type=float, default=600)
+    parser.add_argument('--no-recommendations', action='store_true')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--target', help='benchmark an already running app instead of starting one')
+    parser.add_argument('--pid', type=int, help='app process ID for memory sampling with --target')
+    parser.add_argument('--output', help='result file (default: benchmarks/results/load_test-<time>-<commit>.json)')
+    args = parser.parse_args(argv)
+
+    process = mock_process = None
+    app_log = None
+    try:
+        if args.target:
+            base_url, pid = args.target.rstrip('/'), args.pid
+        else:
+            mock_process, environment, mock_log = start_mock(args, mock_args)
+            log(f"Mock upstreams started (pid {mock_process.pid}, log {mock_log})")
+            process, base_url, app_log = start_app(environment)
+            pid = process.pid   # memory is sampled for the app only
+        if not wait_ready(base_url, 60, process):
+            log(f'App did not become ready at {base_url}' + (f'; see {app_log}' if app_log else ''))
+            raise SystemExit(1)
+        log(f'App ready at {base_url}')
+        results = run(args, base_url, pid)
+    finally:
+        for child in (process, mock_process):
+            if child is not None:
+                _stop(child)
+
+    params = {k: v for k, v in vars(args).items() if k not in ('output', 'pid')}
+    params['mock_args'] = mock_args
+    results['meta'] = run_metadata('load_test', params)
+    path = write_results('load_test', results, args.output)
+
+    log('')
+    log(f"{'endpoint':45} {'count':>7} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'err':>5}")
+    for endpoint, stats in results['endpoints'].items():
+        log(f"{endpoint:45} {stats['count']:>7} {stats['throughput_rps']:>8} {stats.get('p50_ms', 0):>9} "
+            f"{stats.get('p95_ms', 0):>9} {stats.get('p99_ms', 0):>9} {stats['errors']:>5}")
+    lag_stats = results['sse']['delivery_lag']
+    log(f"SSE lag p50/p95/p99: {lag_stats.get('p50_ms')}/{lag_stats.get('p95_ms')}/{lag_stats.get('p99_ms')} ms; "
+        f"memory: {results['memory']}")
+    log(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
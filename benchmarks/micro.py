@@ -0,0 +1,260 @@
+"""
+Micro-benchmarks for the pure-CPU functions on the request path.
+
+Each case runs one function over a generated ticket corpus (built by
+``mock_services.synthetic`` from the real ``services/*.json`` reference
+data) at several corpus sizes and reports:
+
+``ops_per_sec`` / ``mean_us``
+    From the fastest of several timed passes over the corpus (garbage
+    collection disabled while timing, as ``timeit`` does).
+``alloc_peak_bytes_per_op``
+    Mean peak of memory allocated while one call runs (``tracemalloc``,
+    measured on a sample of the corpus in a separate, untimed pass).
+``alloc_retained_bytes``
+    Memory still held after that sample, e.g. by caches.
+
+Cases: ``match_support_groups``, ``match_locations``, ``eus_map_warm`` /
+``eus_map_cold`` (``map_eus_to_location_group`` with a shared or a fresh
+mapper), ``normalize_athena``, ``normalize_databricks``,
+``button_rules``, ``ticket_header_rules`` and
+``format_validation_ticket``.
+
+Usage:
+    python -m benchmarks.micro [--sizes 100,1000,10000] [--cases match_locations,button_rules]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# Ensure the project root is on sys.path; service modules import their
+# siblings by bare name, so ``services/`` is added as well.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'services'))
+
+from benchmarks.common import log, run_metadata, write_results
+from mock_services.synthetic import DATABRICKS_COLUMNS, SyntheticData
+
+from services.field_mapping import FieldMapper
+from services.keyword_match import KeywordMatch
+from app.logic.support_groups import EusLocationMapper, load_support_groups_from_json, map_eus_to_location_group
+from app.logic.ticket_format import format_validation_ticket
+from app.state import button_rules
+from app.state import ticket_header_rules
+
+PRIORITIES = ('1', '2', '3', '4')
+EDITORS = [
+    {'session_id': f'session-{i}', 'label': f'U{i}', 'color': color}
+    for i, color in enumerate(('#0d6efd', '#198754', '#fd7e14', '#6f42c1'))
+]
+
+
+class Case:
+    """One benchmarked function: *prepare* turns the corpus into argument tuples."""
+
+    def __init__(self, name, fn, prepare, before_pass=None):
+        self.name = name
+        self.fn = fn
+        self.prepare = prepare
+        self.before_pass = before_pass
+
+
+# ── Corpus ────────────────────────────────────────────────────────────────────
+
+class Corpus:
+    """Upstream-shaped inputs for *size* synthetic tickets, generated once and sliced."""
+
+    def __init__(self, size: int, seed: int):
+        data = SyntheticData(seed=seed, validation_tickets=size, other_active_incidents=0,
+                             history_tickets=0, description_words=60)
+        rng = random.Random(seed)
+        self.tickets = list(data.tickets.values())
+        self.athena_rows = [SyntheticData.athena_row(t) for t in self.tickets]
+        self.athena_details = [SyntheticData.athena_detail(t) for t in self.tickets]
+        self.normalized_rows = [FieldMapper.normalize_athena_data(r) for r in self.athena_rows]
+        self.normalized_details = [FieldMapper.normalize_athena_data(d) for d in self.athena_details]
+        self.databricks_rows = [
+            dict(zip(DATABRICKS_COLUMNS, SyntheticData.databricks_row(t))) for t in self.tickets
+        ]
+        group_names = [g['name'] for g in data.groups]
+        self.button_contexts = [self._button_context(rng) for _ in self.tickets]
+        self.header_inputs = [self._header_input(rng, group_names) for _ in self.tickets]
+
+    @staticmethod
+    def _button_context(rng: random.Random) -> dict:
+        users = rng.randint(1, 6)
+        total = rng.randint(0, 200)
+        checked = rng.randint(0, total)
+        consensus = users > 1 and rng.random() < 0.3
+        return {
+            'validation_toggle_on': rng.random() < 0.8,
+            'tickets_in_view': total,
+            'recommendations_toggle_on': rng.random() < 0.5,
+            'checked_count': checked,
+            'total_tickets': total,
+            'user_count': users,
+            'consensus_active': consensus,
+            'consensus_agreed': rng.randint(0, users) if consensus else 0,
+            'consensus_required': users if consensus else 0,
+            'consensus_unlocked': consensus and rng.random() < 0.3,
+            'full_assignment_active': consensus and rng.random() < 0.2,
+            'implement_in_progress': rng.random() < 0.05,
+            'user_has_agreed': rng.random() < 0.5,
+        }
+
+    @staticmethod
+    def _header_input(rng: random.Random, group_names: list) -> tuple:
+        original = {'support_group': rng.choice(group_names), 'priority': rng.choice(PRIORITIES)}
+        current, editors = {}, {}
+        if rng.random() < 0.5:
+            current['support_group_radio'] = rng.choice((original['support_group'], rng.choice(group_names)))
+            editors['support_group_radio'] = rng.choice(EDITORS)
+        if rng.random() < 0.2:
+            current['manual_support_group'] = rng.choice(group_names)
+            editors['manual_support_group'] = rng.choice(EDITORS)
+        if rng.random() < 0.5:
+            current['priority_radio'] = rng.choice(PRIORITIES)
+            editors['priority_radio'] = rng.choice(EDITORS)
+        return original, current, editors
+
+
+def build_cases() -> list:
+    keyword_match = KeywordMatch()
+    ir_groups = load_support_groups_from_json('ir')
+    cold = {'mapper': EusLocationMapper()}
+
+    def fresh_mapper():
+        cold['mapper'] = EusLocationMapper()
+
+    return [
+        Case('match_support_groups', keyword_match.match_support_groups,
+             lambda c, n: [(t,) for t in c.normalized_details[:n]]),
+        Case('match_locations', keyword_match.match_locations,
+             lambda c, n: [(t,) for t in c.normalized_details[:n]]),
+        Case('eus_map_warm', map_eus_to_location_group,
+             lambda c, n: [(t['location'], ir_groups) for t in c.tickets[:n]]),
+        Case('eus_map_cold', lambda location, groups: cold['mapper'].map(location, groups),
+             lambda c, n: [(t['location'], ir_groups) for t in c.tickets[:n]],
+             before_pass=fresh_mapper),
+        Case('normalize_athena', FieldMapper.normalize_athena_data,
+             lambda c, n: [(d,) for d in c.athena_details[:n]]),
+        Case('normalize_databricks', FieldMapper.normalize_databricks_data,
+             lambda c, n: [(r,) for r in c.databricks_rows[:n]]),
+        Case('button_rules', button_rules.compute,
+             lambda c, n: [(ctx,) for ctx in c.button_contexts[:n]]),
+        Case('ticket_header_rules', ticket_header_rules.compute,
+             lambda c, n: c.header_inputs[:n]),
+        Case('format_validation_ticket', format_validation_ticket,
+             lambda c, n: [(row, i) for i, row in enumerate(c.normalized_rows[:n])]),
+    ]
+
+
+# ── Measurement ───────────────────────────────────────────────────────────────
+
+def time_case(case: Case, items: list, min_passes: int, min_time: float) -> dict:
+    fn = case.fn
+    if case.before_pass is None:
+        for args in items:   # warm-up: reference data, caches, regex compilation
+            fn(*args)
+
+    timings = []
+    total = 0.0
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(timings) < min_passes or (total < min_time and len(timings) < 1000):
+            if case.before_pass is not None:
+                case.before_pass()
+            start = time.perf_counter()
+            for args in items:
+                fn(*args)
+            elapsed = time.perf_counter() - start
+            timings.append(elapsed)
+            total += elapsed
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    best = min(timings)
+    timings.sort()
+    median = timings[len(timings) // 2]
+    return {
+        'passes': len(timings),
+        'ops_per_sec': round(len(items) / best, 1) if best > 0 else 0.0,
+        'mean_us': round(best / len(items) * 1e6, 3),
+        'median_pass_mean_us': round(median / len(items) * 1e6, 3),
+    }
+
+
+def measure_allocations(case: Case, items: list) -> dict:
+    if case.before_pass is not None:
+        case.before_pass()
+    fn = case.fn
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        peak_total = 0
+        for args in items:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            fn(*args)
+            peak_total += tracemalloc.get_traced_memory()[1] - before
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    return {
+        'alloc_peak_bytes_per_op': round(peak_total / len(items), 1),
+        'alloc_retained_bytes': retained,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Micro-benchmarks for the pure-CPU request-path functions.')
+    parser.add_argument('--sizes', default='100,1000,10000', help='comma-separated corpus sizes')
+    parser.add_argument('--cases', help='comma-separated case names (default: all)')
+    parser.add_argument('--min-passes', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.5, help='minimum seconds timed per case and size')
+    parser.add_argument('--alloc-sample', type=int, default=200, help='calls measured with tracemalloc')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help='result file (default: benchmarks/results/micro-<time>-<commit>.json)')
+    args = parser.parse_args()
+
+    sizes = sorted({int(s) for s in args.sizes.split(',') if s.strip()})
+    cases = build_cases()
+    if args.cases:
+        wanted = {c.strip() for c in args.cases.split(',')}
+        unknown = wanted - {c.name for c in cases}
+        if unknown:
+            raise SystemExit(f"Unknown case(s): {', '.join(sorted(unknown))}")
+        cases = [c for c in cases if c.name in wanted]
+
+    log(f'Generating corpus of {sizes[-1]} tickets...')
+    corpus = Corpus(sizes[-1], args.seed)
+
+    results = {'cases': {}}
+    log(f"{'case':28} {'size':>7} {'ops/sec':>12} {'mean us':>10} {'peak B/op':>11} {'retained B':>11}")
+    for case in cases:
+        per_size = results['cases'][case.name] = {}
+        for size in sizes:
+            items = case.prepare(corpus, size)
+            stats = time_case(case, items, args.min_passes, args.min_time)
+            stats.update(measure_allocations(case, items[:args.alloc_sample]))
+            per_size[str(size)] = stats
+            log(f"{case.name:28} {size:>7} {stats['ops_per_sec']:>12} {stats['mean_us']:>10} "
+                f"{stats['alloc_peak_bytes_per_op']:>11} {stats['alloc_retained_bytes']:>11}")
+
+    params = {k: v for k, v in vars(args).items() if k != 'output'}
+    params['sizes'] = sizes
+    results['meta'] = run_metadata('micro', params)
+    path = write_results('micro', results, args.output)
+    log(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Gunicorn configuration for production serving.
+
+    gunicorn -c gunicorn.conf.py run:app
+
+Uses gevent workers so each SSE stream is a greenlet rather than a thread.
+Limits and timeouts come from the "Production server" section of
+``app/config.py``.
+
+Only one worker process is supported: presence, consensus, UI / sync state
+and the validation cache live in process memory, so loading this config
+with ``SERVER_WORKERS > 1`` raises.
+
+Requires the optional production dependencies (``requirements-prod.txt``).
+"""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.config import (
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_WORKERS,
+    SERVER_WORKER_CONNECTIONS,
+    SERVER_GRACEFUL_TIMEOUT,
+)
+
+if SERVER_WORKERS > 1:
+    raise RuntimeError(
+        f'SERVER_WORKERS = {SERVER_WORKERS} is not supported: presence, consensus, UI / sync '
+        'state and the validation cache are per-process.  Run a single worker.'
+    )
+
+bind = f'{SERVER_HOST}:{SERVER_PORT}'
+workers = SERVER_WORKERS
+worker_class = 'gevent'
+worker_connections = SERVER_WORKER_CONNECTIONS
+graceful_timeout = SERVER_GRACEFUL_TIMEOUT
+timeout = 60        # heartbeat timeout for a blocked worker; SSE streams yield keepalives well within it
+keepalive = 5
+
+
+def post_worker_init(worker):
+    """Warm up the warehouse and drain broadcast streams when the worker is told to stop."""
+    import gevent
+
+    from app.factory import warm_up_warehouse
+    from app.state import validation_cache
+
+    threading.Thread(target=warm_up_warehouse, daemon=True).start()
+
+    def drain_on_exit():
+        # Worker.alive turns False on SIGTERM / SIGQUIT; end the streams
+        # so they finish within graceful_timeout instead of being killed.
+        while worker.alive:
+            gevent.sleep(0.5)
+        drained = validation_cache.drain_clients()
+        worker.log.info('Drained %d broadcast stream(s)', drained)
+
+    gevent.spawn(drain_on_exit)
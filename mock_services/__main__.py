@@ -0,0 +1,107 @@
+"""
+Run the upstream stand-ins, optionally together with the app.
+
+Usage:
+    python -m mock_services [--port 8765] [--print-env]
+    python -m mock_services --run-app [--app-port 5000]
+
+``--print-env`` prints ``.env`` lines pointing the app at the server, for
+running the app (or ``serve.py``) in another process.  ``--run-app`` starts
+the server in a background thread, exports the same variables and serves the
+Flask app from this process, so nothing leaves the machine.
+
+Knobs (repeatable ``service=value`` pairs; services are athena, databricks,
+embedding, llm)::
+
+    --latency llm=3000 --latency databricks=500 --error-rate athena=0.05
+    --pending-rate 0.2 --embedding-dim 1536 --validation-tickets 200
+"""
+
+import argparse
+import os
+import sys
+import threading
+
+# Ensure the project root is on sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_services import config
+from mock_services.server import MockServer, MockSettings, app_environment
+
+
+def _pairs(values, cast):
+    result = {}
+    for item in values or []:
+        service, _, value = item.partition('=')
+        if not value:
+            raise SystemExit(f'Expected service=value, got {item!r}')
+        result[service.strip()] = cast(value)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Local stand-ins for Athena, Databricks, embedding and LLM endpoints.')
+    parser.add_argument('--host', default=config.HOST)
+    parser.add_argument('--port', type=int, default=config.PORT)
+    parser.add_argument('--latency', action='append', metavar='SERVICE=MS', help='mean latency per upstream')
+    parser.add_argument('--jitter', type=float, default=config.LATENCY_JITTER)
+    parser.add_argument('--error-rate', action='append', metavar='SERVICE=P', help='HTTP 503 probability per upstream')
+    parser.add_argument('--malformed-rate', type=float, default=config.LLM_MALFORMED_RATE)
+    parser.add_argument('--pending-rate', type=float, default=config.STATEMENT_PENDING_RATE)
+    parser.add_argument('--pending-polls', type=int, default=config.STATEMENT_PENDING_POLLS)
+    parser.add_argument('--description-words', type=int, default=config.DESCRIPTION_WORDS)
+    parser.add_argument('--embedding-dim', type=int, default=config.EMBEDDING_DIM)
+    parser.add_argument('--explanation-words', type=int, default=config.LLM_EXPLANATION_WORDS)
+    parser.add_argument('--seed', type=int, default=config.SEED)
+    parser.add_argument('--validation-tickets', type=int, default=config.VALIDATION_TICKETS)
+    parser.add_argument('--other-incidents', type=int, default=config.OTHER_ACTIVE_INCIDENTS)
+    parser.add_argument('--history-tickets', type=int, default=config.HISTORY_TICKETS)
+    parser.add_argument('--print-env', action='store_true', help='print .env lines for the app and keep serving')
+    parser.add_argument('--run-app', action='store_true', help='also serve the Flask app from this process')
+    parser.add_argument('--app-port', type=int, default=5000)
+    args = parser.parse_args()
+
+    settings = MockSettings(
+        latency_ms=_pairs(args.latency, float),
+        latency_jitter=args.jitter,
+        error_rate=_pairs(args.error_rate, float),
+        llm_malformed_rate=args.malformed_rate,
+        statement_pending_rate=args.pending_rate,
+        statement_pending_polls=args.pending_polls,
+        description_words=args.description_words,
+        embedding_dim=args.embedding_dim,
+        llm_explanation_words=args.explanation_words,
+        seed=args.seed,
+        validation_tickets=args.validation_tickets,
+        other_active_incidents=args.other_incidents,
+        history_tickets=args.history_tickets,
+    )
+    server = MockServer(args.host, args.port, settings)
+    environment = app_environment(server.url)
+
+    if args.print_env:
+        for key, value in environment.items():
+            print(f"{key}='{value}'")
+    print(f'Mock upstreams listening on {server.url} '
+          f'({len(server.data.tickets)} synthetic tickets)', file=sys.stderr)
+
+    if not args.run_app:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    # Exported before the app is imported; load_dotenv() never overrides them
+    os.environ.update(environment)
+    server.start()
+
+    from app.factory import create_app, warm_up_warehouse
+
+    app = create_app()
+    threading.Thread(target=warm_up_warehouse, daemon=True).start()
+    app.run(host=args.host, port=args.app_port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Default knobs for the local upstream stand-ins.
+
+Every value here can be overridden per server (``MockServer(settings=...)``),
+from the command line (``python -m mock_services --help``) or at runtime by
+POSTing a JSON object to ``/_mock/settings``.
+"""
+
+# ── Server ────────────────────────────────────────────────────────────────────
+HOST = '127.0.0.1'
+PORT = 8765
+
+# ── Latency ───────────────────────────────────────────────────────────────────
+# Mean simulated response time per upstream, in milliseconds.
+LATENCY_MS = {
+    'athena': 80,
+    'databricks': 250,
+    'embedding': 60,
+    'llm': 1500,
+}
+# Uniform jitter applied to each delay, as a fraction of the mean (0.25 = ±25%).
+LATENCY_JITTER = 0.25
+
+# ── Failures ──────────────────────────────────────────────────────────────────
+# Probability that a request is answered with HTTP 503 instead of its payload.
+ERROR_RATE = {
+    'athena': 0.0,
+    'databricks': 0.0,
+    'embedding': 0.0,
+    'llm': 0.0,
+}
+# Probability that a chat completion returns text that is not valid JSON
+# (exercises the client's parse-and-retry path).
+LLM_MALFORMED_RATE = 0.0
+# Probability that a SQL statement is answered PENDING; the statement then
+# succeeds after STATEMENT_PENDING_POLLS status polls.
+STATEMENT_PENDING_RATE = 0.0
+STATEMENT_PENDING_POLLS = 1
+
+# ── Payload size ──────────────────────────────────────────────────────────────
+DESCRIPTION_WORDS = 60          # words in each synthetic ticket description
+EMBEDDING_DIM = 1024            # length of each embedding vector
+LLM_EXPLANATION_WORDS = 80      # words in detailed_explanation
+ONENOTE_CONTENT_WORDS = 200     # words in each OneNote search hit
+
+# ── Synthetic data ────────────────────────────────────────────────────────────
+SEED = 1234
+VALIDATION_TICKETS = 40         # tickets in the 'Validation' support group
+OTHER_ACTIVE_INCIDENTS = 400    # active IRs outside Validation (filtered client-side)
+HISTORY_TICKETS = 2000          # resolved tickets in the Databricks athena_tickets table
@@ -0,0 +1,455 @@
+"""
+Local HTTP stand-ins for every upstream the app calls.
+
+One :class:`MockServer` (a threaded ``http.server``) answers, under separate
+path prefixes:
+
+``/athena``
+    ``POST /auth/token``, the incident / service-request views
+    (``POST /api/v1/{incident,servicerequest}/view``), single work items
+    (``GET /api/v1/{incident,servicerequest,changerequest}/<id>``), priority
+    updates (``PUT`` on the same URLs), ``POST /v1/task/ticket/dispatch``,
+    ``POST /v1/workitem/<entity id>/comment`` and the support group
+    enumerations (``GET /api/v1/enum/{ir,sr}-support-groups``).
+``/databricks``
+    The SQL warehouse start/status calls and the SQL statements API
+    (``POST /api/2.0/sql/statements``, ``GET /api/2.0/sql/statements/<id>``)
+    including PENDING statements that complete after a number of polls.
+``/serving-endpoints``
+    ``embeddings/invocations`` and ``chat/invocations``.
+``/_mock``
+    ``GET|POST /settings`` to read or change the knobs at runtime and
+    ``GET /stats`` for per-route request counts.
+
+Every response passes through the latency and error-rate knobs of its
+upstream (see ``mock_services/config.py``).  :func:`app_environment` returns
+the environment variables that point the app at a running server.
+"""
+
+import copy
+import hashlib
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mock_services import config
+from mock_services.synthetic import SyntheticData
+
+ATHENA_VIEW_TEMPLATE = '[{"condition": "and", "filters": [{"property": "name", "operator": "eq", "value": "{{TICKET_ID}}"}]}]'
+
+_IDS_IN = re.compile(r"\bId\s+IN\s*\(([^)]*)\)", re.IGNORECASE)
+_LIKE = re.compile(r"LIKE\s+'%(.*?)%'", re.IGNORECASE)
+_LIMIT = re.compile(r"\bLIMIT\s+(\d+)", re.IGNORECASE)
+
+
+class MockSettings:
+    """Mutable knob set; per-upstream dicts are merged key by key on update."""
+
+    FIELDS = (
+        'LATENCY_MS', 'LATENCY_JITTER', 'ERROR_RATE', 'LLM_MALFORMED_RATE',
+        'STATEMENT_PENDING_RATE', 'STATEMENT_PENDING_POLLS', 'DESCRIPTION_WORDS',
+        'EMBEDDING_DIM', 'LLM_EXPLANATION_WORDS', 'ONENOTE_CONTENT_WORDS', 'SEED',
+        'VALIDATION_TICKETS', 'OTHER_ACTIVE_INCIDENTS', 'HISTORY_TICKETS',
+    )
+
+    def __init__(self, **overrides):
+        self._lock = threading.Lock()
+        self._values = {name.lower(): copy.deepcopy(getattr(config, name)) for name in self.FIELDS}
+        self.update(overrides)
+
+    def update(self, overrides: dict) -> None:
+        with self._lock:
+            for key, value in overrides.items():
+                key = key.lower()
+                if key not in self._values:
+                    raise KeyError(f'Unknown mock setting: {key}')
+                if isinstance(self._values[key], dict):
+                    self._values[key] = {**self._values[key], **value}
+                else:
+                    self._values[key] = value
+
+    def __getattr__(self, name):
+        values = self.__dict__.get('_values')
+        if values is None or name not in values:
+            raise AttributeError(name)
+        return values[name]
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return copy.deepcopy(self._values)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'MockUpstream/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass  # one line per request would dominate a load test
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def _dispatch(self, method: str) -> None:
+        path = self.path.split('?', 1)[0]
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            status, body = self.server.mock.handle(method, path, self.headers, raw)
+        except Exception as exc:  # a broken stand-in should look like a broken upstream
+            status, body = 500, {'error': f'{type(exc).__name__}: {exc}'}
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class MockServer:
+    """
+    Threaded localhost server backing the Athena, Databricks, embedding and
+    LLM stand-ins with one :class:`SyntheticData` population.
+
+    Usage::
+
+        server = MockServer(port=0).start()
+        os.environ.update(app_environment(server.url))
+        ...
+        server.stop()
+    """
+
+    def __init__(self, host: str = config.HOST, port: int = config.PORT, settings: MockSettings = None):
+        self.settings = settings or MockSettings()
+        self.data = SyntheticData(
+            seed=self.settings.seed,
+            validation_tickets=self.settings.validation_tickets,
+            other_active_incidents=self.settings.other_active_incidents,
+            history_tickets=self.settings.history_tickets,
+            description_words=self.settings.description_words,
+        )
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self._thread = None
+
+        self._stats_lock = threading.Lock()
+        self._stats: dict = {}
+        self._statements: dict = {}     # statement id -> [polls remaining, completed response]
+        self._statement_ids = itertools.count(1)
+        self._tokens = itertools.count(1)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'MockServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='mock-upstreams', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    # ── Routing ───────────────────────────────────────────────────────────────
+
+    def handle(self, method: str, path: str, headers, raw: bytes):
+        """Return ``(status, body)`` for one request after applying the knobs."""
+        route = self._route(method, path)
+        if route is None:
+            return 404, {'error': f'No mock route for {method} {path}'}
+        service, name, handler, args = route
+
+        with self._stats_lock:
+            key = f'{method} {name}'
+            self._stats[key] = self._stats.get(key, 0) + 1
+
+        if service is not None:
+            settings = self.settings
+            delay = settings.latency_ms.get(service, 0) / 1000.0
+            if delay > 0:
+                jitter = settings.latency_jitter
+                time.sleep(max(0.0, delay * random.uniform(1 - jitter, 1 + jitter)))
+            if random.random() < settings.error_rate.get(service, 0.0):
+                return 503, {'error': f'Injected {service} failure'}
+
+        body = None
+        if raw:
+            content_type = headers.get('Content-Type', '')
+            if 'json' in content_type:
+                body = json.loads(raw)
+            else:
+                body = raw.decode('utf-8', 'replace')
+        return handler(body, *args)
+
+    def _route(self, method: str, path: str):
+        parts = [p for p in path.split('/') if p]
+        if not parts:
+            return None
+        head, rest = parts[0], parts[1:]
+
+        if head == '_mock':
+            if rest == ['settings']:
+                return None, 'settings', self._settings, ()
+            if rest == ['stats'] and method == 'GET':
+                return None, 'stats', lambda body: (200, self.stats()), ()
+
+        elif head == 'athena':
+            if method == 'POST' and rest == ['auth', 'token']:
+                return 'athena', 'athena auth', self._athena_auth, ()
+            if rest[:2] == ['api', 'v1'] and len(rest) >= 3:
+                kind = rest[2]
+                if method == 'POST' and rest[3:] == ['view'] and kind in ('incident', 'servicerequest'):
+                    return 'athena', f'athena {kind} view', self._athena_view, (kind,)
+                if kind in ('incident', 'servicerequest', 'changerequest'):
+                    if method == 'GET' and len(rest) == 4:
+                        return 'athena', f'athena {kind}', self._athena_ticket, (rest[3],)
+                    if method == 'PUT' and len(rest) == 3:
+                        return 'athena', f'athena {kind} priority', self._athena_priority, ()
+                if method == 'GET' and kind == 'enum' and len(rest) == 4:
+                    return 'athena', 'athena support groups', self._athena_support_groups, ()
+            if method == 'POST' and rest == ['v1', 'task', 'ticket', 'dispatch']:
+                return 'athena', 'athena dispatch', self._athena_dispatch, ()
+            if method == 'POST' and len(rest) == 4 and rest[:2] == ['v1', 'workitem'] and rest[3] == 'comment':
+                return 'athena', 'athena comment', self._athena_comment, (rest[2],)
+
+        elif head == 'databricks' and rest[:2] == ['api', '2.0']:
+            rest = rest[2:]
+            if rest[:2] == ['sql', 'statements']:
+                if method == 'POST' and len(rest) == 2:
+                    return 'databricks', 'sql statement', self._sql_execute, ()
+                if method == 'GET' and len(rest) == 3:
+                    return 'databricks', 'sql statement poll', self._sql_poll, (rest[2],)
+            if rest[:2] == ['sql', 'warehouses'] and len(rest) >= 3:
+                if method == 'POST' and rest[3:] == ['start']:
+                    return 'databricks', 'warehouse start', lambda body: (200, {}), ()
+                if method == 'GET' and len(rest) == 3:
+                    return 'databricks', 'warehouse status', lambda body: (200, {'id': rest[2], 'state': 'RUNNING'}), ()
+            if method == 'GET' and rest == ['clusters', 'list']:
+                return 'databricks', 'clusters', lambda body: (200, {'clusters': []}), ()
+
+        elif head == 'serving-endpoints' and method == 'POST' and rest[1:] == ['invocations']:
+            if rest[0] == 'embeddings':
+                return 'embedding', 'embedding', self._embedding, ()
+            if rest[0] == 'chat':
+                return 'llm', 'chat completion', self._chat_completion, ()
+
+        return None
+
+    def _settings(self, body):
+        if isinstance(body, dict):
+            try:
+                self.settings.update(body)
+            except (KeyError, TypeError) as exc:
+                return 400, {'error': str(exc)}
+        return 200, self.settings.as_dict()
+
+    # ── Athena ────────────────────────────────────────────────────────────────
+
+    def _athena_auth(self, body):
+        return 200, {'access_token': f'mock-token-{next(self._tokens)}', 'token_type': 'Bearer', 'expires_in': 3600}
+
+    def _athena_view(self, body, kind):
+        prefix = 'IR' if kind == 'incident' else 'SR'
+        filters = list(_flatten_filters(body or []))
+        rows = []
+        for ticket in self.data.active(prefix):
+            if all(self._filter_matches(ticket, f) for f in filters):
+                rows.append(SyntheticData.athena_row(ticket))
+        return 200, {'result': rows, 'count': len(rows)}
+
+    def _filter_matches(self, ticket: dict, flt: dict) -> bool:
+        prop = str(flt.get('property', '')).lower()
+        value = str(flt.get('value', ''))
+        operator = flt.get('operator', 'eq')
+        if prop in ('name', 'id'):
+            return ticket['id'].upper() == value.upper()
+        if prop == 'supportgroup':
+            return self.data.group_for_guid(value) == ticket['support_group']
+        if prop == 'contactmethod':
+            if operator == 'contains':
+                return value.lower() in ticket['contact_method'].lower()
+            return ticket['contact_method'].lower() == value.lower()
+        # Status GUIDs (and anything else) select the active population the view already returns
+        return True
+
+    def _athena_ticket(self, body, ticket_id):
+        ticket = self.data.get(ticket_id)
+        if ticket is None:
+            return 404, {'error': f'Work item {ticket_id} not found'}
+        return 200, SyntheticData.athena_detail(ticket)
+
+    def _athena_priority(self, body):
+        body = body or {}
+        if not self.data.set_priority(body.get('entityId', ''), body.get('priority')):
+            return 404, {'error': 'Unknown entityId'}
+        return 200, {'success': True}
+
+    def _athena_dispatch(self, body):
+        body = body or {}
+        group = body.get('incidentSupportGroupId') or body.get('serviceRequestSupportGroupId')
+        assigned = None if body.get('clearAssignedTo', True) else 'Mock Analyst'
+        changed = self.data.dispatch(body.get('entityIds', []), group, assigned)
+        return 200, {'success': True, 'updated': changed}
+
+    def _athena_comment(self, body, entity_id):
+        if entity_id not in self.data.by_entity:
+            return 404, {'error': 'Unknown entityId'}
+        return 200, {'success': True}
+
+    def _athena_support_groups(self, body):
+        return 200, self.data.support_group_tree()
+
+    # ── Databricks SQL ────────────────────────────────────────────────────────
+
+    def _sql_execute(self, body):
+        statement = (body or {}).get('statement', '')
+        statement_id = f'mock-{next(self._statement_ids)}'
+        response = {
+            'statement_id': statement_id,
+            'status': {'state': 'SUCCEEDED'},
+            'result': {'data_array': self._sql_rows(statement)},
+        }
+        if random.random() < self.settings.statement_pending_rate:
+            with self._stats_lock:
+                self._statements[statement_id] = [self.settings.statement_pending_polls, response]
+            return 200, {'statement_id': statement_id, 'status': {'state': 'PENDING'}}
+        return 200, response
+
+    def _sql_poll(self, body, statement_id):
+        with self._stats_lock:
+            entry = self._statements.get(statement_id)
+            if entry is None:
+                return 404, {'error_code': 'NOT_FOUND', 'message': f'Statement {statement_id} not found'}
+            entry[0] -= 1
+            if entry[0] > 0:
+                return 200, {'statement_id': statement_id, 'status': {'state': 'RUNNING'}}
+            del self._statements[statement_id]
+        return 200, entry[1]
+
+    def _sql_rows(self, statement: str) -> list:
+        limit_match = _LIMIT.search(statement)
+        limit = int(limit_match.group(1)) if limit_match else 20
+        rng = random.Random(hashlib.sha1(statement.encode('utf-8')).digest())
+
+        if 'ticket_embedding' in statement:
+            ids = rng.sample(self.data.history_ids, min(limit, len(self.data.history_ids)))
+            scores = sorted((rng.uniform(0.55, 0.95) for _ in ids), reverse=True)
+            return [[tid, str(score)] for tid, score in zip(ids, scores)]
+        if 'onenote_documentation' in statement:
+            words = self.settings.onenote_content_words
+            scores = sorted((rng.uniform(0.4, 0.9) for _ in range(limit)), reverse=True)
+            return [
+                [f'How to: {self.data.words(rng, 4)}', self.data.words(rng, words),
+                 'Service Desk', rng.choice(self.data.groups)['name'], str(score)]
+                for score in scores
+            ]
+        if re.search(r'\bCOUNT\s*\(', statement, re.IGNORECASE):
+            return [[str(len(self.data.history_ids))]]
+
+        ids_match = _IDS_IN.search(statement)
+        if ids_match:
+            wanted = re.findall(r"'([^']+)'", ids_match.group(1))
+            tickets = [self.data.get(tid) for tid in wanted]
+        else:
+            like = _LIKE.search(statement)
+            needle = like.group(1).lower() if like else ''
+            tickets = [
+                self.data.tickets[tid] for tid in self.data.history_ids
+                if needle in self.data.tickets[tid]['description'].lower()
+            ]
+        return [SyntheticData.databricks_row(t) for t in tickets if t is not None][:limit]
+
+    # ── Model serving ─────────────────────────────────────────────────────────
+
+    def _embedding(self, body):
+        text = str((body or {}).get('input', ''))
+        rng = random.Random(hashlib.sha1(text.encode('utf-8')).digest())
+        vector = [rng.gauss(0.0, 1.0) for _ in range(self.settings.embedding_dim)]
+        norm = sum(x * x for x in vector) ** 0.5 or 1.0
+        return 200, {
+            'object': 'list',
+            'data': [{'object': 'embedding', 'index': 0, 'embedding': [round(x / norm, 6) for x in vector]}],
+            'usage': {'prompt_tokens': len(text.split())},
+        }
+
+    def _chat_completion(self, body):
+        messages = (body or {}).get('messages') or [{}]
+        prompt = str(messages[-1].get('content', ''))
+        rng = random.Random(hashlib.sha1(prompt.encode('utf-8')).digest())
+        if rng.random() < self.settings.llm_malformed_rate:
+            content = 'I think this ticket belongs with the desktop team.'
+        else:
+            # Prefer groups named in the prompt (the keyword-match candidates)
+            named = [g['name'] for g in self.data.groups if g['name'] in prompt]
+            picks = rng.sample(named, min(3, len(named)))
+            while len(picks) < 3:
+                picks.append(rng.choice(self.data.groups)['name'])
+            content = json.dumps({
+                'recommended_support_group': picks[0],
+                'second_choice_support_group': picks[1],
+                'third_choice_support_group': picks[2],
+                'recommended_priority_level': rng.choice(('1', '2', '3')),
+                'detailed_explanation': self.data.words(rng, self.settings.llm_explanation_words),
+            })
+        return 200, {
+            'id': f'chatcmpl-{rng.getrandbits(32):08x}',
+            'object': 'chat.completion',
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': len(prompt.split()), 'completion_tokens': len(content.split())},
+        }
+
+
+def _flatten_filters(groups):
+    """Yield every leaf ``{property, operator, value}`` of an Athena filter tree."""
+    for item in groups if isinstance(groups, list) else [groups]:
+        if not isinstance(item, dict):
+            continue
+        if 'filters' in item:
+            yield from _flatten_filters(item['filters'])
+        if 'property' in item:
+            yield item
+
+
+def app_environment(base_url: str) -> dict:
+    """Environment variables that point every upstream client at *base_url*."""
+    athena = f'{base_url}/athena'
+    return {
+        'ATHENA_USERNAME': 'mock-user',
+        'ATHENA_PASSWORD': 'mock-password',
+        'ATHENA_CLIENT_ID': 'mock-client',
+        'ATHENA_BASE_URL': athena,
+        'ATHENA_AUTH_URL': f'{athena}/auth/token',
+        'ATHENA_INCIDENT_VIEW_URL': f'{athena}/api/v1/incident/view',
+        'ATHENA_SERVICEREQUEST_VIEW_URL': f'{athena}/api/v1/servicerequest/view',
+        'ATHENA_INCIDENT_URL': f'{athena}/api/v1/incident/',
+        'ATHENA_SERVICEREQUEST_URL': f'{athena}/api/v1/servicerequest/',
+        'ATHENA_CHANGEREQUEST_URL': f'{athena}/api/v1/changerequest/',
+        'ATHENA_JSON_TEMPLATE': ATHENA_VIEW_TEMPLATE,
+        'ATHENA_IR_SUPPORT_GROUP_GUID': f'{athena}/api/v1/enum/ir-support-groups',
+        'ATHENA_SR_SUPPORT_GROUP_GUID': f'{athena}/api/v1/enum/sr-support-groups',
+        'DATABRICKS_API_KEY': 'mock-api-key',
+        'DATABRICKS_SERVER_HOSTNAME': base_url.split('://', 1)[-1],
+        'DATABRICKS_BASE_URL': f'{base_url}/databricks',
+        'DATABRICKS_HTTP_PATH': '/sql/1.0/warehouses/mockwarehouse',
+        'DATABRICKS_EMBEDDING_URL': f'{base_url}/serving-endpoints/embeddings/invocations',
+        'DATABRICKS_SONNET_4.5_URL': f'{base_url}/serving-endpoints/chat/invocations',
+    }
@@ -0,0 +1,271 @@
+"""
+Synthetic ticket data for the upstream stand-ins.
+
+Tickets are generated deterministically from a seed using the real reference
+data in ``services/`` (support group names and keywords, location sites), so
+keyword matching, location resolution and the LLM prompt builder see
+realistic inputs.  Each ticket is stored once in a neutral form and rendered
+on demand in the shape of the upstream that serves it: Athena view rows and
+detail records (camelCase) or Databricks ``athena_tickets`` rows (35
+positional columns).
+"""
+
+import json
+import os
+import random
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+SERVICES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'services')
+
+# GUID the app's service-request validation query filters on server-side
+VALIDATION_GROUP_GUID = 'c954d465-65a0-9e43-9b02-b353e87bdb37'
+
+# Column order of prepared.ticketing.athena_tickets (see Databricks.execute_sql_query)
+DATABRICKS_COLUMNS = [
+    'TicketType', 'Location', 'Floor', 'Room', 'CreatedDate', 'ResolvedDate', 'Priority', 'Id', 'Title',
+    'Description', 'SupportGroup', 'Source', 'Status', 'Impact', 'Urgency', 'AssignedToUserName',
+    'AssignedToBaseManagedEntityId', 'AffectedUserName', 'AffectedBaseManagedEntityId', 'LastModifiedDate',
+    'Escalated', 'First_Call_Resolution', 'Classification/Area', 'ResolutionCategory', 'ResolutionNotes',
+    'CommandCenter', 'ConfirmedResolution', 'Increments', 'FeedbackValue', 'Feedback_Notes', 'Tags',
+    'Specialty', 'Next_Steps', 'User_Assign_Change', 'Support_Group_Change',
+]
+
+PRIORITIES = ('High', 'Medium', 'Low')
+SOURCES = ('Portal', 'Phone', 'Email', 'Walk-up')
+FILLER = (
+    'user', 'reports', 'unable', 'to', 'access', 'the', 'after', 'update', 'error', 'message', 'when',
+    'trying', 'since', 'this', 'morning', 'please', 'assist', 'workstation', 'login', 'screen', 'shows',
+    'issue', 'persists', 'restart', 'clinic', 'department', 'printer', 'badge', 'password', 'reset',
+)
+FIRST_NAMES = ('Alex', 'Jordan', 'Sam', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn')
+LAST_NAMES = ('Smith', 'Patel', 'Nguyen', 'Garcia', 'Kim', 'Brown', 'Lee', 'Lopez', 'Clark', 'Young')
+
+
+def _load_json(name: str):
+    with open(os.path.join(SERVICES_DIR, name), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def guid_for(name: str) -> str:
+    """Stable GUID for a support group name (the Validation group keeps the real one)."""
+    if name == 'Validation':
+        return VALIDATION_GROUP_GUID
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f'support-group:{name}'))
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+class SyntheticData:
+    """
+    In-memory ticket population shared by all mock endpoints.
+
+    Writes made through the Athena stand-in (dispatch, priority changes)
+    update the stored tickets under a lock, so a ticket dispatched out of
+    the Validation group leaves the queue on the next refresh.
+    """
+
+    def __init__(self, seed: int, validation_tickets: int, other_active_incidents: int,
+                 history_tickets: int, description_words: int):
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.description_words = description_words
+
+        self.groups = [g for g in _load_json('support_group_keywords.json') if g.get('name')]
+        self.group_fullnames = {
+            g['name']: g.get('fullname', g['name']) for g in _load_json('support_group_description.json')
+        }
+        self.sites = [
+            (category['category'], site['name'])
+            for category in _load_json('locations.json').get('locations', [])
+            for site in category.get('sites', [])
+        ]
+
+        self.tickets: dict = {}          # ticket id -> neutral ticket dict
+        self.by_entity: dict = {}        # entity id -> ticket id
+        self.history_ids: list = []
+
+        now = datetime.now(timezone.utc)
+        next_ir, next_sr = 4900000, 1200000
+        for i in range(validation_tickets):
+            if i % 4 == 3:
+                ticket_id, next_sr = f'SR{next_sr}', next_sr + 1
+            else:
+                ticket_id, next_ir = f'IR{next_ir}', next_ir + 1
+            self._add(self._make(ticket_id, 'Validation', 'Active', now))
+        for _ in range(other_active_incidents):
+            ticket_id, next_ir = f'IR{next_ir}', next_ir + 1
+            self._add(self._make(ticket_id, self._rng.choice(self.groups)['name'], 'Active', now))
+        for _ in range(history_tickets):
+            ticket_id, next_ir = f'IR{next_ir}', next_ir + 1
+            ticket = self._make(ticket_id, self._rng.choice(self.groups)['name'], 'Resolved', now)
+            self._add(ticket)
+            self.history_ids.append(ticket_id)
+
+    # ── Generation ────────────────────────────────────────────────────────────
+
+    def words(self, rng: random.Random, count: int, vocabulary=FILLER) -> str:
+        return ' '.join(rng.choice(vocabulary) for _ in range(count))
+
+    def _make(self, ticket_id: str, support_group: str, status: str, now: datetime) -> dict:
+        rng = self._rng
+        # Descriptions mix filler with the keywords of a "true" group so keyword
+        # matching and retrieval have something to find
+        topic = rng.choice(self.groups)
+        keywords = topic.get('keywords') or [topic['name']]
+        description = ' '.join(
+            rng.choice(keywords) if rng.random() < 0.3 else rng.choice(FILLER)
+            for _ in range(self.description_words)
+        )
+        category, site = rng.choice(self.sites) if self.sites else ('', '')
+        created = now - timedelta(minutes=rng.randint(5, 60 * 24 * 30))
+        user = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+        return {
+            'id': ticket_id,
+            'entity_id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'type': 'Incident' if ticket_id.startswith('IR') else 'Service Request',
+            'title': f"{rng.choice(keywords)} {rng.choice(('issue', 'request', 'not working', 'access'))}",
+            'description': description,
+            'priority': rng.choice(PRIORITIES),
+            'status': status,
+            'support_group': support_group,
+            'topic_group': topic['name'],
+            'location': site,
+            'location_category': category,
+            'floor': str(rng.randint(1, 12)),
+            'room': str(rng.randint(100, 999)),
+            'source': rng.choice(SOURCES),
+            'contact_method': f'{user.split()[0].lower()}@example.org',
+            'affected_user': user,
+            'affected_user_entity_id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'company': category,
+            'street_address': site,
+            'assigned_to': '',
+            'created_at': _iso(created),
+            'last_modified_at': _iso(created + timedelta(minutes=rng.randint(0, 240))),
+            'resolved_at': _iso(created + timedelta(hours=rng.randint(1, 72))) if status == 'Resolved' else None,
+            'resolution_notes': self.words(rng, 12) if status == 'Resolved' else '',
+        }
+
+    def _add(self, ticket: dict) -> None:
+        self.tickets[ticket['id']] = ticket
+        self.by_entity[ticket['entity_id']] = ticket['id']
+
+    # ── Queries ───────────────────────────────────────────────────────────────
+
+    def get(self, ticket_id: str):
+        return self.tickets.get(ticket_id.upper())
+
+    def active(self, prefix: str) -> list:
+        with self._lock:
+            return [t for t in self.tickets.values() if t['status'] == 'Active' and t['id'].startswith(prefix)]
+
+    def support_group_tree(self) -> list:
+        """Support group enumeration in the Athena tree shape (``value``/``label``/``children``)."""
+        names = [g['name'] for g in self.groups] + ['Validation']
+        return [
+            {'value': guid_for(name), 'label': name, 'fullname': self.group_fullnames.get(name, name), 'children': []}
+            for name in names
+        ]
+
+    def group_for_guid(self, guid: str):
+        for group in self.groups:
+            if guid_for(group['name']) == guid:
+                return group['name']
+        return 'Validation' if guid == VALIDATION_GROUP_GUID else None
+
+    # ── Writes ────────────────────────────────────────────────────────────────
+
+    def dispatch(self, entity_ids: list, support_group_guid=None, assigned_to=None) -> int:
+        now = _iso(datetime.now(timezone.utc))
+        changed = 0
+        with self._lock:
+            for entity_id in entity_ids:
+                ticket = self.tickets.get(self.by_entity.get(entity_id, ''))
+                if ticket is None:
+                    continue
+                if support_group_guid:
+                    ticket['support_group'] = self.group_for_guid(support_group_guid) or ticket['support_group']
+                if assigned_to is not None:
+                    ticket['assigned_to'] = assigned_to
+                ticket['last_modified_at'] = now
+                changed += 1
+        return changed
+
+    def set_priority(self, entity_id: str, priority) -> bool:
+        with self._lock:
+            ticket = self.tickets.get(self.by_entity.get(entity_id, ''))
+            if ticket is None:
+                return False
+            ticket['priority'] = str(priority)
+            ticket['last_modified_at'] = _iso(datetime.now(timezone.utc))
+            return True
+
+    # ── Upstream shapes ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def athena_row(ticket: dict) -> dict:
+        """Row as returned by the Athena incident / service-request views."""
+        return {
+            'id': ticket['id'],
+            'name': ticket['id'],
+            'entityId': ticket['entity_id'],
+            'entityType': ticket['type'],
+            'title': ticket['title'],
+            'description': ticket['description'],
+            'displayName': f"{ticket['id']} - {ticket['title']}",
+            'priorityValue': ticket['priority'],
+            'statusValue': ticket['status'],
+            'supportGroup': guid_for(ticket['support_group']),
+            'supportGroupValue': ticket['support_group'],
+            'locationValue': ticket['location'],
+            'floorValue': ticket['floor'],
+            'room': ticket['room'],
+            'sourceValue': ticket['source'],
+            'contactMethod': ticket['contact_method'],
+            'createdDate': ticket['created_at'],
+            'lastModified': ticket['last_modified_at'],
+            'assignedTo_DisplayName': ticket['assigned_to'],
+            'affectedUser_DisplayName': ticket['affected_user'],
+            'affectedUser_EntityId': ticket['affected_user_entity_id'],
+        }
+
+    @classmethod
+    def athena_detail(cls, ticket: dict) -> dict:
+        """Single work item as returned by ``GET {ATHENA_*_URL}{ticket id}``."""
+        detail = cls.athena_row(ticket)
+        detail['location'] = {'id': str(uuid.uuid5(uuid.NAMESPACE_URL, ticket['location'])), 'name': ticket['location']}
+        detail['affectedUser'] = {
+            'displayName': ticket['affected_user'],
+            'company': ticket['company'],
+            'streetAddress': ticket['street_address'],
+        }
+        return detail
+
+    @staticmethod
+    def databricks_row(ticket: dict) -> list:
+        """Positional row of ``prepared.ticketing.athena_tickets``."""
+        values = {
+            'TicketType': ticket['type'],
+            'Location': ticket['location'],
+            'Floor': ticket['floor'],
+            'Room': ticket['room'],
+            'CreatedDate': ticket['created_at'],
+            'ResolvedDate': ticket['resolved_at'],
+            'Priority': ticket['priority'],
+            'Id': ticket['id'],
+            'Title': ticket['title'],
+            'Description': ticket['description'],
+            'SupportGroup': ticket['support_group'],
+            'Source': ticket['source'],
+            'Status': ticket['status'],
+            'AssignedToUserName': ticket['assigned_to'],
+            'AffectedUserName': ticket['affected_user'],
+            'AffectedBaseManagedEntityId': ticket['affected_user_entity_id'],
+            'LastModifiedDate': ticket['last_modified_at'],
+            'ResolutionNotes': ticket['resolution_notes'],
+        }
+        return [values.get(column) for column in DATABRICKS_COLUMNS]
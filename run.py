@@ -7,6 +7,9 @@ management live in the ``app/`` package.
 
 Usage:
     python run.py
+
+For production (gevent, many concurrent SSE viewers, graceful shutdown)
+use ``serve.py`` or ``gunicorn -c gunicorn.conf.py run:app``.
 """
 
 import os
@@ -0,0 +1,81 @@
+"""
+Service Desk Helper — Production entry point.
+
+Serves the app with gevent's WSGI server: every connection runs in a
+greenlet instead of an OS thread, so hundreds of idle SSE streams
+(``/api/validation-broadcast``, ``/api/get-ticket-advice-stream``) cost a
+few kilobytes each.  The standard library is monkey-patched before the app
+is imported, which makes the app's locks, queues, timers and background
+threads cooperative as well.
+
+On SIGTERM / SIGINT the server stops accepting connections, drains the
+broadcast streams (queued events are delivered, then each stream ends so
+browsers reconnect with their last event ID) and waits up to
+``SERVER_GRACEFUL_TIMEOUT`` seconds for in-flight requests.
+
+To run under gunicorn use the bundled config (the same gevent worker and
+drain hook; a single worker process, see ``gunicorn.conf.py``)::
+
+    gunicorn -c gunicorn.conf.py run:app
+
+Requires the optional production dependencies (``requirements-prod.txt``).
+
+Usage:
+    python serve.py [--host HOST] [--port PORT] [--connections N]
+"""
+
+try:
+    from gevent import monkey
+except ImportError:  # pragma: no cover - depends on the deployment
+    raise SystemExit('serve.py requires gevent: pip install -r requirements-prod.txt')
+
+monkey.patch_all()
+
+import argparse
+import os
+import signal
+import sys
+import threading
+
+import gevent
+from gevent.pool import Pool
+from gevent.pywsgi import WSGIServer
+
+# Ensure the project root is on sys.path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from services.output import Output
+
+from app.config import SERVER_HOST, SERVER_PORT, SERVER_WORKER_CONNECTIONS, SERVER_GRACEFUL_TIMEOUT
+from app.factory import create_app, warm_up_warehouse
+from app.state import validation_cache
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Serve the Service Desk Helper with gevent.')
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--connections', type=int, default=SERVER_WORKER_CONNECTIONS,
+                        help='maximum concurrent connections')
+    args = parser.parse_args()
+
+    output = Output()
+    app = create_app()
+    server = WSGIServer((args.host, args.port), app, spawn=Pool(args.connections), log=None)
+
+    def shutdown() -> None:
+        drained = validation_cache.drain_clients()
+        output.add_line(f'serve: shutting down, draining {drained} broadcast stream(s)')
+        server.stop(timeout=SERVER_GRACEFUL_TIMEOUT)
+
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        gevent.signal_handler(sig, lambda: gevent.spawn(shutdown))
+
+    threading.Thread(target=warm_up_warehouse, daemon=True).start()
+
+    output.add_line(f'serve: listening on {args.host}:{args.port} (max {args.connections} connections)')
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
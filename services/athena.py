@@ -9,6 +9,10 @@ from dotenv import load_dotenv
 sys.path.insert(0, os.path.dirname(__file__))
 
 from output import Output
+try:
+    from services.metrics import UpstreamClient
+except ImportError:  # run directly as a script
+    from metrics import UpstreamClient
 from parse_json import ParseJson
 from field_mapping import FieldMapper
 from config import DEBUG, PROCESS_INDICATORS
@@ -16,6 +20,9 @@ from config import TEST_RUN_ATHENA as TEST_RUN
 
 load_dotenv()
 
+_upstream = UpstreamClient('athena')
+
+
 class Athena:
 
     def __init__(self):
@@ -75,7 +82,7 @@ class Athena:
         try:
             if DEBUG:
                 self.output.add_line(f"Making auth request to {self.auth_url}")
-            response = requests.post(self.auth_url, headers=headers, data=data, timeout=30)
+            response = _upstream.post(self.auth_url, 'auth', headers=headers, data=data, timeout=30)
             if DEBUG:
                 self.output.add_line(f"Auth response status: {response.status_code}")
 
@@ -149,7 +156,7 @@ class Athena:
             headers['Content-Type'] = 'application/json'
 
             try:
-                response = requests.post(url, headers=headers, json=payload, timeout=30)
+                response = _upstream.post(url, 'ticket_view', headers=headers, json=payload, timeout=30)
                 if response.status_code == 200:
                     raw_data = response.json()
                     return FieldMapper.normalize_athena_data(raw_data)  # Normalize field names
@@ -184,7 +191,7 @@ class Athena:
                 headers['Content-Type'] = 'application/json'
 
                 try:
-                    response = requests.post(self.irv_url, headers=headers, json=payload, timeout=120)
+                    response = _upstream.post(self.irv_url, 'ticket_filter', headers=headers, json=payload, timeout=120)
                     if response.status_code == 200:
                         raw_data = response.json()
                         return FieldMapper.normalize_athena_data(raw_data)  # Normalize field names
@@ -213,7 +220,7 @@ class Athena:
                     return None
 
                 try:
-                    response = requests.get(url, headers=headers, timeout=30)
+                    response = _upstream.get(url, 'ticket_get', headers=headers, timeout=30)
                     if response.status_code == 200:
                         raw_data = response.json()
                         return FieldMapper.normalize_athena_data(raw_data)  # Normalize field names
@@ -230,11 +237,39 @@ class Athena:
         """
         Get all ticket numbers from the 'Validation' support group.
 
+        Returns:
+            list: Combined list of ticket numbers from both types
+            None: If requests fail
+        """
+        rows = self._get_validation_rows()
+        if rows is None:
+            return None
+        return [ticket['id'] for ticket in rows]
+
+    def get_validation_ticket_versions(self):
+        """
+        Get all ticket numbers from the 'Validation' support group together
+        with their last modification time, for incremental cache refreshes.
+
+        Returns:
+            dict: Ticket number -> ``last_modified_at`` (None when the view does
+                  not provide it), in queue order
+            None: If requests fail
+        """
+        rows = self._get_validation_rows()
+        if rows is None:
+            return None
+        return {ticket['id']: ticket.get('last_modified_at') for ticket in rows}
+
+    def _get_validation_rows(self):
+        """
+        Query the IR and SR views for tickets in the 'Validation' support group.
+
         Queries active IR tickets and filters by support_group client-side.
         Queries active SR tickets with server-side filtering by support_group.
 
         Returns:
-            list: Combined list of ticket numbers from both types
+            list: Normalized view rows (each with an 'id') from both types
             None: If requests fail
         """
         if not self.token:
@@ -262,14 +297,14 @@ class Athena:
             }
         ]
 
-        all_ticket_numbers = []
+        all_rows = []
 
         # Get incident report tickets from Validation group
         try:
             if DEBUG:
                 self.output.add_line("Querying all incident reports and filtering for Validation support group")
 
-            response = requests.post(self.irv_url, headers=headers, json=ir_payload, timeout=120)
+            response = _upstream.post(self.irv_url, 'validation_incidents', headers=headers, json=ir_payload, timeout=120)
 
             if response.status_code == 200:
                 raw_data = response.json()
@@ -280,7 +315,7 @@ class Athena:
                     for ticket in normalized_data['result']:
                         # Filter client-side by support_group
                         if ticket.get('support_group') == 'Validation' and 'id' in ticket:
-                            all_ticket_numbers.append(ticket['id'])
+                            all_rows.append(ticket)
                             ir_count += 1
 
                 if DEBUG:
@@ -320,7 +355,7 @@ class Athena:
             if DEBUG:
                 self.output.add_line("Querying service requests filtered for Validation support group server-side")
 
-            response = requests.post(self.srv_url, headers=headers, json=sr_payload, timeout=120)
+            response = _upstream.post(self.srv_url, 'validation_service_requests', headers=headers, json=sr_payload, timeout=120)
 
             if response.status_code == 200:
                 raw_data = response.json()
@@ -330,7 +365,7 @@ class Athena:
                 if 'result' in normalized_data:
                     for ticket in normalized_data['result']:
                         if 'id' in ticket:
-                            all_ticket_numbers.append(ticket['id'])
+                            all_rows.append(ticket)
                             sr_count += 1
 
                 if DEBUG:
@@ -346,9 +381,9 @@ class Athena:
             return None
 
         if DEBUG:
-            self.output.add_line(f"Total validation tickets found: {len(all_ticket_numbers)}")
+            self.output.add_line(f"Total validation tickets found: {len(all_rows)}")
 
-        return all_ticket_numbers
+        return all_rows
 
     def modify_ticket(self, ticket_id=None, username=None, priority=None, comment=None, support_group=None, status=None, resolution_comment=None):
         """
@@ -434,7 +469,7 @@ class Athena:
                     self.output.add_line(f"Unsupported ticket type for dispatch: {prefix}")
                     return
 
-            dispatch_response = requests.post(dispatch_url, headers=headers, json=dispatch_payload, timeout=30)
+            dispatch_response = _upstream.post(dispatch_url, 'dispatch', headers=headers, json=dispatch_payload, timeout=30)
             if dispatch_response.status_code != 200:
                 self.output.add_line(f"Failed to dispatch ticket: {dispatch_response.status_code} - {dispatch_response.text}")
                 return
@@ -459,7 +494,7 @@ class Athena:
                 "priority": priority
             }
 
-            priority_response = requests.put(url, headers=headers, json=priority_payload, timeout=30)
+            priority_response = _upstream.put(url, 'set_priority', headers=headers, json=priority_payload, timeout=30)
             if priority_response.status_code != 200:
                 self.output.add_line(f"Failed to update priority: {priority_response.status_code} - {priority_response.text}")
                 return
@@ -475,7 +510,7 @@ class Athena:
                 "isPrivate": False,
                 "entityId": entity_id
             }
-            comment_response = requests.post(comment_url, headers=headers, json=comment_payload, timeout=30)
+            comment_response = _upstream.post(comment_url, 'comment', headers=headers, json=comment_payload, timeout=30)
             if comment_response.status_code == 200:
                 self.output.add_line(f"Successfully added comment to ticket {ticket_id}")
             else:
@@ -500,7 +535,7 @@ class Athena:
                 }
             }
             
-            resolve_response = requests.post(resolve_url, headers=headers, json=resolve_payload, timeout=30)
+            resolve_response = _upstream.post(resolve_url, 'resolve', headers=headers, json=resolve_payload, timeout=30)
             if resolve_response.status_code == 200:
                 self.output.add_line(f"Successfully resolved ticket {ticket_id}")
             else:
@@ -514,7 +549,7 @@ class Athena:
                     "isPrivate": False,
                     "entityId": entity_id
                 }
-                requests.post(fallback_comment_url, headers=headers, json=fallback_payload, timeout=30)
+                _upstream.post(fallback_comment_url, 'comment', headers=headers, json=fallback_payload, timeout=30)
 
 
 
@@ -12,6 +12,22 @@ DEBUG = False
 # Keyword-match module has its own flag (historically kept off to reduce noise).
 DEBUG_KEYWORD_MATCH = False
 
+# ── Logging ───────────────────────────────────────────────────────────────────
+# Output.add_line queues records for a background writer (see services/output.py).
+LOG_FILE = 'output.txt'
+LOG_LEVEL = 'INFO'              # records below this level are discarded
+LOG_FORMAT = 'text'             # 'text' (timestamped lines) | 'json' (one object per line)
+LOG_MAX_BYTES = 10 * 1024 * 1024  # roll over to output.txt.1 beyond this size (0 = never)
+LOG_ROTATE_INTERVAL = 24 * 3600   # roll over after this many seconds (0 = never)
+LOG_BACKUP_COUNT = 5            # rotated files kept
+LOG_QUEUE_SIZE = 10000          # queued records before new ones are dropped
+LOG_BATCH_SIZE = 500            # records written per file write
+LOG_FLUSH_INTERVAL = 0.5        # seconds the writer waits for a record before polling again
+
+# When True, the full JSON prompt context of every ticket-advice request is
+# logged at DEBUG level (only written when LOG_LEVEL = 'DEBUG').
+DEBUG_JSON_DATA = True
+
 # ── Test-run toggles ─────────────────────────────────────────────────────────
 # When True, the ``if __name__ == "__main__" and TEST_RUN:`` block at the
 # bottom of each service file will execute when the file is run directly.
@@ -22,4 +38,17 @@ TEST_RUN_TEXT_GENERATION_MODEL = False
 
 # ── Process indicators ────────────────────────────────────────────────────────
 # When True, prints progress / loading messages to the console (stdout).
-PROCESS_INDICATORS = False
\ No newline at end of file
+PROCESS_INDICATORS = False
+# ── Reference data ────────────────────────────────────────────────────────────
+# Minimum seconds between mtime checks of the JSON reference files
+# (locations.json, support_group_description.json, support_group_keywords.json).
+REFERENCE_DATA_RELOAD_CHECK_SECONDS = 5
+
+# ── Location resolution ───────────────────────────────────────────────────────
+# Number of (company, street address) pairs whose resolved user location is memoized.
+LOCATION_RESOLVER_CACHE_SIZE = 4096
+
+# When True, an affected user's street address that matches no site name as a
+# substring falls back to fuzzy (difflib) site-name matching.
+LOCATION_FUZZY_MATCH = False
+LOCATION_FUZZY_CUTOFF = 0.8
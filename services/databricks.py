@@ -9,6 +9,10 @@ import sys
 sys.path.insert(0, os.path.dirname(__file__))
 
 from output import Output
+try:
+    from services.metrics import UpstreamClient
+except ImportError:  # run directly as a script
+    from metrics import UpstreamClient
 from parse_json import ParseJson
 from field_mapping import FieldMapper
 from embedding_model import EmbeddingModel
@@ -17,6 +21,9 @@ from config import TEST_RUN_DATABRICKS as TEST_RUN
 
 load_dotenv()
 
+_upstream = UpstreamClient('databricks_sql')
+
+
 class Databricks:
 
     def __init__(self):
@@ -26,10 +33,13 @@ class Databricks:
         - DATABRICKS_API_KEY
         - DATABRICKS_SERVER_HOSTNAME
         - DATABRICKS_HTTP_PATH
+        Optionally DATABRICKS_BASE_URL overrides ``https://<server hostname>``
+        (e.g. to point at the local stand-ins in ``mock_services``).
         """
         self.api_key = os.getenv('DATABRICKS_API_KEY')
         self.server_hostname = os.getenv('DATABRICKS_SERVER_HOSTNAME')
         self.http_path = os.getenv('DATABRICKS_HTTP_PATH')
+        self.base_url = (os.getenv('DATABRICKS_BASE_URL') or f"https://{self.server_hostname}").rstrip('/')
 
         self.output = Output()
         if DEBUG:
@@ -54,7 +64,7 @@ class Databricks:
             return False
 
         warehouse_id = self.http_path.split('/')[-1]
-        url = f"https://{self.server_hostname}/api/2.0/sql/warehouses/{warehouse_id}/start"
+        url = f"{self.base_url}/api/2.0/sql/warehouses/{warehouse_id}/start"
         headers = {
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
@@ -63,7 +73,7 @@ class Databricks:
         try:
             if DEBUG:
                 self.output.add_line(f"Starting SQL warehouse {warehouse_id}...")
-            response = requests.post(url, headers=headers, timeout=30)
+            response = _upstream.post(url, 'warehouse_start', headers=headers, timeout=30)
 
             # 200 = start accepted, 409 = already running (conflict is fine)
             if response.status_code in (200, 409):
@@ -104,7 +114,7 @@ class Databricks:
         """
         import time
 
-        status_url = f"https://{self.server_hostname}/api/2.0/sql/warehouses/{warehouse_id}"
+        status_url = f"{self.base_url}/api/2.0/sql/warehouses/{warehouse_id}"
         headers = {
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
@@ -118,7 +128,7 @@ class Databricks:
 
         while time.time() - start_time < timeout:
             try:
-                response = requests.get(status_url, headers=headers, timeout=30)
+                response = _upstream.get(status_url, 'warehouse_status', headers=headers, timeout=30)
                 if response.status_code == 200:
                     state = response.json().get('state', 'UNKNOWN')
                     if DEBUG:
@@ -159,7 +169,7 @@ class Databricks:
             return False
 
         # Use a simple API call to test the key - list clusters as it's a basic endpoint
-        url = f"https://{self.server_hostname}/api/2.0/clusters/list"
+        url = f"{self.base_url}/api/2.0/clusters/list"
         headers = {
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
@@ -168,7 +178,7 @@ class Databricks:
         try:
             if DEBUG:
                 self.output.add_line(f"Testing API key validity with {url}")
-            response = requests.get(url, headers=headers, timeout=30)
+            response = _upstream.get(url, 'api_key_check', headers=headers, timeout=30)
 
             if response.status_code == 200:
                 if DEBUG:
@@ -228,7 +238,7 @@ class Databricks:
             sql_query += f" LIMIT {max_results}"
 
         # API endpoint for executing SQL statements
-        execute_url = f"https://{self.server_hostname}/api/2.0/sql/statements"
+        execute_url = f"{self.base_url}/api/2.0/sql/statements"
 
         headers = {
             'Authorization': f'Bearer {self.api_key}',
@@ -247,7 +257,7 @@ class Databricks:
                 self.output.add_line(f"Using warehouse: {payload['warehouse_id']}")
 
             # Submit the SQL statement
-            response = requests.post(execute_url, headers=headers, json=payload, timeout=120)
+            response = _upstream.post(execute_url, 'statement_execute', headers=headers, json=payload, timeout=120)
 
             if response.status_code == 200:
                 result_data = response.json()
@@ -262,7 +272,7 @@ class Databricks:
                             self.output.add_line("Query returned PENDING but no statement_id found")
                         return {"status": "pending", "message": "Query is still running"}
 
-                    status_url = f"https://{self.server_hostname}/api/2.0/sql/statements/{statement_id}"
+                    status_url = f"{self.base_url}/api/2.0/sql/statements/{statement_id}"
                     poll_timeout = 300  # seconds
                     poll_interval = 5   # seconds between polls
                     start_time = time.time()
@@ -273,7 +283,7 @@ class Databricks:
                     while time.time() - start_time < poll_timeout:
                         time.sleep(poll_interval)
                         try:
-                            poll_response = requests.get(status_url, headers=headers, timeout=30)
+                            poll_response = _upstream.get(status_url, 'statement_poll', headers=headers, timeout=30)
                             if poll_response.status_code == 200:
                                 result_data = poll_response.json()
                                 state = result_data.get('status', {}).get('state')
@@ -372,7 +382,8 @@ class Databricks:
                 self.output.add_line(f"Unexpected error during SQL execution: {str(e)}")
             return {"status": "error", "message": f"Unexpected error: {str(e)}"}
 
-    def similarity_search(self, table_name: str, query_text: str, limit: int = 5):
+    def similarity_search(self, table_name: str, query_text: str, limit: int = 5,
+                          query_embedding: list | None = None):
         """
         Perform vector similarity search on the specified table.
         Generates embedding for query_text and finds similar records by cosine similarity.
@@ -381,15 +392,14 @@ class Databricks:
             table_name (str): Full table path like 'catalog.schema.table' (must have 'id' and 'ticket_embedding' columns)
             query_text (str): Input text to search for similarity
             limit (int): Number of top similar results to return (default: 5)
+            query_embedding (list, optional): Precomputed embedding of query_text; skips the embedding call
 
         Returns:
             list: List of dictionaries with 'id' and 'similarity' keys, or None if failed
         """
-        # Initialize embedding model
-        embedding_model = EmbeddingModel()
-
-        # Generate embedding for query text
-        query_embedding = embedding_model.get_embedding(query_text)
+        # Generate embedding for query text unless the caller already has it
+        if not query_embedding:
+            query_embedding = EmbeddingModel().get_embedding(query_text)
         if not query_embedding:
             if DEBUG:
                 self.output.add_line("Failed to generate embedding for similarity search")
@@ -437,7 +447,7 @@ class Databricks:
         sql_query = f"SELECT * FROM {catalog_name}.{schema_name}.{table_name}"
 
         # API endpoint for executing SQL statements
-        execute_url = f"https://{self.server_hostname}/api/2.0/sql/statements"
+        execute_url = f"{self.base_url}/api/2.0/sql/statements"
 
         headers = {
             'Authorization': f'Bearer {self.api_key}',
@@ -456,7 +466,7 @@ class Databricks:
                 self.output.add_line(f"Using warehouse: {payload['warehouse_id']}")
 
             # Submit the SQL statement
-            response = requests.post(execute_url, headers=headers, json=payload, timeout=60)
+            response = _upstream.post(execute_url, 'table_data', headers=headers, json=payload, timeout=60)
 
             if response.status_code == 200:
                 result_data = response.json()
@@ -504,7 +514,8 @@ class Databricks:
                 self.output.add_line(f"Unexpected error during SQL execution: {str(e)}")
             return None
 
-    def semantic_search_onenote(self, query_text: str, limit: int = 5) -> list:
+    def semantic_search_onenote(self, query_text: str, limit: int = 5,
+                                query_embedding: list | None = None) -> list:
         """
         Perform semantic search on onenote_documentation table.
         Generates embedding for query_text and finds similar documentation pages by cosine similarity.
@@ -512,15 +523,14 @@ class Databricks:
         Args:
             query_text (str): Input text to search for in OneNote documentation
             limit (int): Number of top similar results to return (default: 5)
+            query_embedding (list, optional): Precomputed embedding of query_text; skips the embedding call
 
         Returns:
             list: List of dictionaries with 'title', 'content', 'notebook', 'section', 'similarity' keys, or [] if failed
         """
-        # Initialize embedding model
-        embedding_model = EmbeddingModel()
-
-        # Generate embedding for query text
-        query_embedding = embedding_model.get_embedding(query_text)
+        # Generate embedding for query text unless the caller already has it
+        if not query_embedding:
+            query_embedding = EmbeddingModel().get_embedding(query_text)
         if not query_embedding:
             if DEBUG:
                 self.output.add_line("Failed to generate embedding for semantic search")
@@ -1,4 +1,3 @@
-import requests
 import json
 import os
 from dotenv import load_dotenv
@@ -11,11 +10,18 @@ import sys
 sys.path.insert(0, os.path.dirname(__file__))
 
 from output import Output
+try:
+    from services.metrics import UpstreamClient
+except ImportError:  # run directly as a script
+    from metrics import UpstreamClient
 from config import DEBUG
 from config import TEST_RUN_EMBEDDING_MODEL as TEST_RUN
 
 load_dotenv()
 
+_upstream = UpstreamClient('embedding')
+
+
 class EmbeddingModel:
     """
     Class for interacting with Databricks embedding model to compute text embeddings and similarities.
@@ -53,7 +59,7 @@ class EmbeddingModel:
             if DEBUG:
                 self.output.add_line(f"Generating embedding for text, length: {len(text)}, first 50: {text[:50]}...")
                 self.output.add_line(f"Making request to: {self.embedding_url}")
-            response = requests.post(self.embedding_url, headers=headers, json=payload, timeout=60)
+            response = _upstream.post(self.embedding_url, 'embedding', headers=headers, json=payload, timeout=60)
             if response.status_code == 200:
                 result = response.json()
                 # Assuming result structure similar to other models, extract vector
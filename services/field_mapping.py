@@ -6,10 +6,16 @@ import requests
 import difflib
 import json
 from output import Output
+try:
+    from services.metrics import UpstreamClient
+except ImportError:  # run directly as a script
+    from metrics import UpstreamClient
 from config import DEBUG as DEBUG_LOGGING
 
 # Athena import moved inside get_guid method to avoid circular import
 
+_upstream = UpstreamClient('athena')
+
 # Global field mapping dictionaries to standardize field names across data sources
 # Athena API uses camelCase, Databricks uses PascalCase, we standardize to snake_case
 
@@ -215,7 +221,8 @@ class FieldMapper:
             'user_location',
             'incident_location',
             'location_specific_support',
-            'global_support'
+            'global_support',
+            'matched_keywords'
         }
         standard_fields.update(keyword_match_fields)
 
@@ -436,7 +443,7 @@ class FieldMapper:
         headers = {'Authorization': f'Bearer {token}'}
 
         try:
-            response = requests.get(endpoint, headers=headers, timeout=30)
+            response = _upstream.get(endpoint, 'support_group_search', headers=headers, timeout=30)
 
             if response.status_code != 200:
                 FieldMapper.output.add_line(f"API request failed: {response.status_code} - {response.text}")
@@ -556,7 +563,7 @@ class FieldMapper:
         }
 
         try:
-            response = requests.get(endpoint, headers=headers, timeout=30)
+            response = _upstream.get(endpoint, 'guid_lookup', headers=headers, timeout=30)
 
             if DEBUG_LOGGING:
                 FieldMapper.output.add_line(f"API request status: {response.status_code}")
@@ -653,7 +660,7 @@ class FieldMapper:
         }
 
         try:
-            response = requests.get(endpoint, headers=headers, timeout=30)
+            response = _upstream.get(endpoint, 'label_list', headers=headers, timeout=30)
 
             if DEBUG_LOGGING:
                 FieldMapper.output.add_line(f"API request status: {response.status_code}")
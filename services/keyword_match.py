@@ -1,27 +1,152 @@
 import sys
 import os
-import json
+import re
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from services.athena import Athena
 from services.output import Output
+from services.reference_data import get_reference_data
 from services.config import DEBUG_KEYWORD_MATCH as DEBUG
+from services.config import LOCATION_FUZZY_MATCH
+
+
+class KeywordAutomaton:
+    """
+    Precompiled multi-keyword matcher for support group keyword filtering.
+
+    All keywords from ``support_group_keywords.json`` are compiled into a
+    single trie-shaped regular expression, so one pass over the ticket text
+    finds every keyword that occurs in it (case-insensitive substring match,
+    the same semantics as ``keyword.lower() in ticket_content``).
+    """
+
+    def __init__(self, keywords_data):
+        """
+        Build the automaton from the parsed ``support_group_keywords.json`` list.
+
+        Args:
+            keywords_data: List of ``{'name': str, 'keywords': [str, ...]}`` entries.
+                           Later entries with the same name replace earlier ones.
+        """
+        # name -> original keyword list (last entry wins, as with a dict build)
+        self.group_keywords = {}
+        for kw_entry in keywords_data:
+            self.group_keywords[kw_entry['name']] = kw_entry.get('keywords', []) or []
+
+        # lowercased keyword -> [(group name, position in group, original keyword), ...]
+        self._owners = {}
+        # groups with an empty keyword match every ticket ('' in s is always True)
+        self._always = {}
+        for name, keywords in self.group_keywords.items():
+            for position, keyword in enumerate(keywords):
+                lowered = keyword.lower()
+                if not lowered:
+                    self._always.setdefault(name, []).append((position, keyword))
+                    continue
+                self._owners.setdefault(lowered, []).append((name, position, keyword))
+
+        # The regex reports the longest keyword starting at each position, so
+        # every keyword that is a prefix of it also occurs there.
+        lowered_keywords = sorted(self._owners)
+        self._prefixes = {
+            kw: [other for other in lowered_keywords if kw.startswith(other)]
+            for kw in lowered_keywords
+        }
+
+        self._pattern = None
+        if lowered_keywords:
+            self._pattern = re.compile('(?=(' + self._trie_regex(lowered_keywords) + '))')
+
+    @staticmethod
+    def _trie_regex(words):
+        """
+        Return a regex source string matching any of *words*, shaped as a trie
+        so that the engine does a handful of character comparisons per text
+        position instead of trying every alternative.  Longer continuations
+        are tried first, so a match is always the longest keyword at that
+        position.
+        """
+        trie = {}
+        for word in words:
+            node = trie
+            for ch in word:
+                node = node.setdefault(ch, {})
+            node[''] = {}
+
+        def build(node):
+            branches = [
+                re.escape(ch) + build(child)
+                for ch, child in sorted(node.items())
+                if ch != ''
+            ]
+            if not branches:
+                return ''
+            alternation = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            if '' in node:
+                return '(?:' + alternation + ')?'
+            return alternation
+
+        return build(trie)
+
+    def find_keywords(self, text):
+        """
+        Return the set of lowercased keywords that occur anywhere in *text*.
+
+        Args:
+            text (str): Ticket content; lowercased here before matching.
+        """
+        found = set()
+        if self._pattern is None or not text:
+            return found
+        for longest in set(m.group(1) for m in self._pattern.finditer(text.lower())):
+            found.update(self._prefixes[longest])
+        return found
+
+    def match(self, text):
+        """
+        Find every support group with at least one keyword in *text*.
+
+        Args:
+            text (str): Ticket content to search.
+
+        Returns:
+            dict: Support group name -> list of the group's keywords (original
+                  casing, in ``support_group_keywords.json`` order) that matched.
+        """
+        hits = {name: list(empty) for name, empty in self._always.items()}
+        for lowered in self.find_keywords(text):
+            for name, position, keyword in self._owners[lowered]:
+                hits.setdefault(name, []).append((position, keyword))
+        return {
+            name: [keyword for _, keyword in sorted(group_hits)]
+            for name, group_hits in hits.items()
+        }
+
+
+def get_keyword_automaton():
+    """
+    Return the process-wide :class:`KeywordAutomaton` for the current
+    ``support_group_keywords.json`` (rebuilt when the file changes).
+    """
+    return get_reference_data().keyword_automaton
 
 
 class KeywordMatch:
     """
     Production class for keyword matching functionality.
     Provides methods to match locations and support groups against ticket data.
+
+    The matcher is stateless: every call reads the current reference-data
+    snapshot, so one instance can be shared by all threads (see
+    :func:`get_keyword_matcher`) and benchmarked without any service clients.
     """
 
     def __init__(self):
         """
-        Initialize KeywordMatch with Athena client and Output handler.
+        Initialize KeywordMatch with an Output handler.
         """
-        self.athena = Athena() 
-        self.output = Output() 
+        self.output = Output()
 
     def match_locations(self, ticket_data):
         """
@@ -37,10 +162,11 @@ class KeywordMatch:
         if DEBUG:
             self.output.add_line("match_locations method called with ticket data")
 
-        # Load locations data
-        locations_path = os.path.join(os.path.dirname(__file__), 'locations.json')
-        with open(locations_path, 'r') as f:
-            locations_data = json.load(f)
+        return self._match_locations(ticket_data, get_reference_data())
+
+    def _match_locations(self, ticket_data, reference):
+        """match_locations against an explicit reference-data snapshot."""
+        resolver = reference.location_resolver
 
         user_location = "none"
         incident_location = "none"
@@ -57,48 +183,18 @@ class KeywordMatch:
                 location_ticket_number = None
 
             if location_ticket_number and location_ticket_number != "Remote User":
-                # Search for this value in locations.json
-                for location in locations_data.get('locations', []):
-                    for site in location.get('sites', []):
-                        if site.get('name') == location_ticket_number:
-                            incident_location = location.get('category', 'none')
-                            break
-                    if incident_location != "none":
-                        break
+                # Exact site name lookup in locations.json
+                incident_location = resolver.category_for_site(location_ticket_number)
 
-        # Step 2: Check affectedUser.company for user location
+        # Steps 2 and 3: affectedUser.company, then affectedUser.streetAddress
+        # (category match or site-name substring, memoized per user)
         if ticket_data and 'affectedUser' in ticket_data and ticket_data['affectedUser']:
-            company = ticket_data['affectedUser'].get('company')
-            if company:
-                # Search for this company in locations.json
-                for location in locations_data.get('locations', []):
-                    # Check if company matches category (case-insensitive)
-                    if company.lower() == location.get('category', '').lower():
-                        user_location = location.get('category', 'none')
-                        break
-                    # Check if company is contained in site names (case-insensitive)
-                    for site in location.get('sites', []):
-                        site_name = site.get('name', '')
-                        if company.lower() in site_name.lower():
-                            user_location = location.get('category', 'none')
-                            break
-                    if user_location != "none":
-                        break
-
-        # Step 3: Check affectedUser.streetAddress for user location (if still none)
-        if user_location == "none" and ticket_data and 'affectedUser' in ticket_data and ticket_data['affectedUser']:
-            street_address = ticket_data['affectedUser'].get('streetAddress')
-            if street_address:
-                # Search for this address in locations.json site names
-                for location in locations_data.get('locations', []):
-                    for site in location.get('sites', []):
-                        site_name = site.get('name', '')
-                        # Check if street_address is contained in site_name (case-insensitive)
-                        if street_address.lower() in site_name.lower():
-                            user_location = location.get('category', 'none')
-                            break
-                    if user_location != "none":
-                        break
+            affected_user = ticket_data['affectedUser']
+            user_location = resolver.resolve_user_location(
+                affected_user.get('company'),
+                affected_user.get('streetAddress'),
+                LOCATION_FUZZY_MATCH,
+            )
 
         result = {
             "user_location": user_location,
@@ -121,7 +217,9 @@ class KeywordMatch:
 
         Returns:
             dict: Dictionary with keys 'location_specific_support' and 'global_support'
-                  containing lists of matched support group records
+                  containing lists of matched support group records, and
+                  'matched_keywords' mapping each global support group name to
+                  the keywords that matched the ticket content
         """
         if DEBUG:
             self.output.add_line("match_support_groups method called with ticket data")
@@ -135,35 +233,16 @@ class KeywordMatch:
             elif ticket_id.startswith('IR'):
                 ticket_type = "ir"
 
-        # Load support group data
-        support_groups_path = os.path.join(os.path.dirname(__file__), 'support_group_description.json')
-        with open(support_groups_path, 'r') as f:
-            support_groups_data = json.load(f)
+        reference = get_reference_data()
 
-        # Load support group keywords data
-        keywords_path = os.path.join(os.path.dirname(__file__), 'support_group_keywords.json')
-        with open(keywords_path, 'r') as f:
-            keywords_data = json.load(f)
+        # Support groups for this ticket type that have a description
+        support_groups_data = reference.support_groups_by_type.get(ticket_type, [])
 
-        # Create mapping from support group name to keywords
-        sg_keywords_map = {}
-        for kw_entry in keywords_data:
-            sg_keywords_map[kw_entry['name']] = kw_entry.get('keywords', [])
-
-        # Load locations data to get all categories for exclusion check
-        locations_path = os.path.join(os.path.dirname(__file__), 'locations.json')
-        with open(locations_path, 'r') as f:
-            locations_data = json.load(f)
-
-        # Get all unique location categories
-        all_location_categories = set()
-        for location in locations_data.get('locations', []):
-            category = location.get('category', '')
-            if category:
-                all_location_categories.add(category.lower())
+        # All unique location categories (lowercased) for the exclusion check
+        all_location_categories = reference.location_categories
 
         # Get location matches from match_locations
-        location_matches = self.match_locations(ticket_data)
+        location_matches = self._match_locations(ticket_data, reference)
         location_keywords = set()
         for loc in [location_matches.get('user_location'), location_matches.get('incident_location')]:
             if loc and loc != 'none':
@@ -175,8 +254,6 @@ class KeywordMatch:
 
         for sg in support_groups_data:
             name = sg.get('name', '').lower()
-            sg_ticket_type = sg.get('ticket_type')
-            description = sg.get('description')
 
             # Check if this support group matches location keywords
             is_location_specific = False
@@ -185,9 +262,9 @@ class KeywordMatch:
                     is_location_specific = True
                     break
 
-            if is_location_specific and sg_ticket_type == ticket_type and description is not None:
+            if is_location_specific:
                 location_specific_support.append(sg)
-            elif sg_ticket_type == ticket_type and description is not None:
+            else:
                 remaining_support_groups.append(sg)
 
         # Filter global support groups (exclude those that contain any location category)
@@ -230,34 +307,31 @@ class KeywordMatch:
         # Combine all ticket content into a single string for searching
         ticket_content = ' '.join(ticket_content_fields).lower()
 
-        # Filter global_support based on keyword matches
-        keyword_filtered_global_support = []
-        for sg in global_support:
-            sg_name = sg.get('name', '')
-            sg_keywords = sg_keywords_map.get(sg_name, [])
-
-            # If support group has no keywords defined, exclude it
-            if not sg_keywords:
-                continue
-
-            # Check if any keyword appears in ticket content
-            has_keyword_match = False
-            for keyword in sg_keywords:
-                if keyword.lower() in ticket_content:
-                    has_keyword_match = True
-                    break
-
-            # Only keep support groups that have keyword matches
-            if has_keyword_match:
-                keyword_filtered_global_support.append(sg)
+        # One pass over the ticket text finds every group with a keyword hit
+        keyword_matches = reference.keyword_automaton.match(ticket_content)
 
-        global_support = keyword_filtered_global_support
+        # Only keep support groups that have keyword matches (groups without
+        # keywords never match)
+        global_support = [sg for sg in global_support if sg.get('name', '') in keyword_matches]
+        matched_keywords = {
+            sg.get('name', ''): keyword_matches[sg.get('name', '')]
+            for sg in global_support
+        }
 
         result = {
             "location_specific_support": location_specific_support,
-            "global_support": global_support
+            "global_support": global_support,
+            "matched_keywords": matched_keywords
         }
 
         if DEBUG:
             self.output.add_line(f"Support group match result: {len(location_specific_support)} location-specific, {len(global_support)} global support groups")
-        return result
\ No newline at end of file
+        return result
+
+
+_shared_matcher = KeywordMatch()
+
+
+def get_keyword_matcher():
+    """Return the process-wide shared :class:`KeywordMatch` instance."""
+    return _shared_matcher
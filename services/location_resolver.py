@@ -0,0 +1,169 @@
+import sys
+import os
+import difflib
+import functools
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from services.config import LOCATION_RESOLVER_CACHE_SIZE, LOCATION_FUZZY_CUTOFF
+
+
+class LocationResolver:
+    """
+    Indexed lookups over the ``locations.json`` site list.
+
+    Replaces the nested "scan every site name" loops with:
+      - an exact site-name hash map (incident location),
+      - a character trigram inverted index that narrows substring queries
+        (company / street address contained in a site name) to a handful of
+        candidate sites before verifying them,
+      - a word-token inverted index used to shortlist candidates for fuzzy
+        matching.
+
+    Results keep the original precedence: the first location category in
+    ``locations.json`` order wins.  User-location results are memoized per
+    ``(company, street_address)`` pair because the same affected users and
+    buildings recur across tickets.
+    """
+
+    NGRAM = 3
+
+    def __init__(self, locations):
+        """
+        Build the indexes.
+
+        Args:
+            locations: The ``locations`` list from ``locations.json``.
+        """
+        # Exact site name -> category (first category listing the site wins)
+        self.site_categories = {}
+        # Lowercased category -> position of the first location with that category
+        self._category_rank = {}
+        # Parallel per-site arrays: lowercased name, owning location position
+        self._site_names = []
+        self._site_location = []
+        self._categories = []
+
+        for position, location in enumerate(locations):
+            category = location.get('category', 'none')
+            self._categories.append(category)
+            if category == 'none':
+                # A missing category never terminates the original scans
+                continue
+            self._category_rank.setdefault(location.get('category', '').lower(), position)
+            for site in location.get('sites', []):
+                self.site_categories.setdefault(site.get('name'), category)
+                self._site_names.append(site.get('name', '').lower())
+                self._site_location.append(position)
+
+        # n-gram -> set of site ids; token -> set of site ids
+        self._ngram_index = {}
+        self._token_index = {}
+        for site_id, name in enumerate(self._site_names):
+            for gram in self._ngrams(name):
+                self._ngram_index.setdefault(gram, set()).add(site_id)
+            for token in name.split():
+                self._token_index.setdefault(token, set()).add(site_id)
+
+        self.resolve_user_location = functools.lru_cache(maxsize=LOCATION_RESOLVER_CACHE_SIZE)(
+            self._resolve_user_location
+        )
+
+    @classmethod
+    def _ngrams(cls, text):
+        return {text[i:i + cls.NGRAM] for i in range(len(text) - cls.NGRAM + 1)}
+
+    def category_for_site(self, site_name):
+        """
+        Return the category of the location listing *site_name* exactly, or
+        ``'none'`` if no site has that name.
+        """
+        return self.site_categories.get(site_name, 'none')
+
+    def _substring_sites(self, query):
+        """Return ids of sites whose lowercased name contains *query* (already lowercased)."""
+        if len(query) < self.NGRAM:
+            return [i for i, name in enumerate(self._site_names) if query in name]
+
+        postings = []
+        for gram in self._ngrams(query):
+            sites = self._ngram_index.get(gram)
+            if not sites:
+                return []
+            postings.append(sites)
+        postings.sort(key=len)
+        candidates = set.intersection(*postings)
+        return [i for i in candidates if query in self._site_names[i]]
+
+    def find_substring(self, query):
+        """
+        Return the category of the first location (in file order) with a site
+        name containing *query* case-insensitively, or ``'none'``.
+        """
+        if not query:
+            return 'none'
+        site_ids = self._substring_sites(query.lower())
+        if not site_ids:
+            return 'none'
+        return self._categories[min(self._site_location[i] for i in site_ids)]
+
+    def find_fuzzy(self, query, cutoff=LOCATION_FUZZY_CUTOFF):
+        """
+        Return the category of the site name most similar to *query*, or
+        ``'none'`` if no candidate reaches *cutoff* (``difflib`` ratio).
+
+        Candidates are sites sharing at least one word token or trigram with
+        the query, so only a small shortlist is scored.
+        """
+        if not query:
+            return 'none'
+        lowered = query.lower()
+        candidates = set()
+        for token in lowered.split():
+            candidates |= self._token_index.get(token, set())
+        if not candidates:
+            for gram in self._ngrams(lowered):
+                candidates |= self._ngram_index.get(gram, set())
+
+        best_ratio, best_site = 0.0, None
+        for site_id in sorted(candidates):
+            ratio = difflib.SequenceMatcher(None, lowered, self._site_names[site_id]).ratio()
+            if ratio > best_ratio:
+                best_ratio, best_site = ratio, site_id
+        if best_site is None or best_ratio < cutoff:
+            return 'none'
+        return self._categories[self._site_location[best_site]]
+
+    def _resolve_user_location(self, company, street_address, fuzzy=False):
+        """
+        Resolve an affected user's location category.
+
+        Args:
+            company (str | None): ``affectedUser.company``.  Matches a location
+                                  whose category equals it, or that has a site
+                                  name containing it (case-insensitive).
+            street_address (str | None): ``affectedUser.streetAddress``, tried
+                                         only when *company* finds nothing.
+            fuzzy (bool): Fall back to fuzzy site-name matching on the street
+                          address when the substring lookups find nothing.
+
+        Returns:
+            str: Location category, or ``'none'``.
+        """
+        if company:
+            lowered = company.lower()
+            ranks = []
+            if lowered in self._category_rank:
+                ranks.append(self._category_rank[lowered])
+            ranks.extend(self._site_location[i] for i in self._substring_sites(lowered))
+            if ranks:
+                return self._categories[min(ranks)]
+
+        if street_address:
+            category = self.find_substring(street_address)
+            if category == 'none' and fuzzy:
+                category = self.find_fuzzy(street_address)
+            return category
+
+        return 'none'
@@ -0,0 +1,292 @@
+"""
+Process-wide metrics registry with Prometheus text exposition.
+
+Counters, gauges and histograms are registered once at import time by the
+module that owns them and updated in place; each keeps its label values in
+a dict guarded by one lock, so an update costs a dict lookup and an add.
+Gauges may instead be backed by a callback evaluated at scrape time (e.g. the
+number of connected SSE clients).
+
+Upstream HTTP calls (Athena, Databricks SQL, embedding, LLM) go through
+:class:`UpstreamClient`, which records per-operation request counts by
+status, errors and latency.
+
+:func:`render` produces the text exposition format (version 0.0.4) served at
+``/metrics``.
+"""
+
+import bisect
+import threading
+import time
+
+import requests
+
+# Service modules import this as ``services.metrics`` (falling back to the bare
+# name only when run as scripts) so the process has a single registry.
+
+# Seconds; tuned for HTTP calls that range from tens of ms to minutes
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_registry_lock = threading.Lock()
+_metrics: dict = {}   # name -> metric, in registration order
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = '') -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name}: expected labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _header(self) -> list[str]:
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self._header() + [
+            f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}' for key, v in items
+        ]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down; set directly or computed by *callback* at scrape time."""
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        """
+        Args:
+            callback: Optional zero-argument function returning the value
+                (unlabelled gauges) or a ``{label values tuple: value}`` dict.
+        """
+        super().__init__(name, documentation, labelnames)
+        self._values: dict = {}
+        self._callback = callback
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def collect(self) -> list[str]:
+        if self._callback is not None:
+            try:
+                value = self._callback()
+            except Exception:
+                return self._header()   # a failing callback must not break the scrape
+            items = list(value.items()) if isinstance(value, dict) else [((), value)]
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        return self._header() + [
+            f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}' for key, v in items
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram of observed values (seconds by convention)."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: dict = {}   # key -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def time(self, **labels):
+        """Context manager observing the duration of the enclosed block."""
+        return _Timer(self, labels)
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        lines = self._header()
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), state[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(state[-1])}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram: Histogram, labels: dict):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+# ── Registry ──────────────────────────────────────────────────────────────────
+
+def _register(metric: _Metric) -> _Metric:
+    with _registry_lock:
+        existing = _metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f'Metric {metric.name} already registered differently')
+            return existing
+        _metrics[metric.name] = metric
+        return metric
+
+
+def counter(name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+    """Register (or return the existing) counter *name*."""
+    return _register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: tuple = (), callback=None) -> Gauge:
+    """Register (or return the existing) gauge *name*."""
+    return _register(Gauge(name, documentation, labelnames, callback))
+
+
+def histogram(name: str, documentation: str, labelnames: tuple = (),
+              buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+    """Register (or return the existing) histogram *name*."""
+    return _register(Histogram(name, documentation, labelnames, buckets))
+
+
+def render() -> str:
+    """Return every registered metric in Prometheus text exposition format."""
+    with _registry_lock:
+        metrics = list(_metrics.values())
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.collect())
+    return '\n'.join(lines) + '\n'
+
+
+# ── Upstream HTTP calls ───────────────────────────────────────────────────────
+
+UPSTREAM_REQUESTS = counter(
+    'upstream_requests_total', 'HTTP requests to upstream services by response status.',
+    ('service', 'operation', 'status'),
+)
+UPSTREAM_ERRORS = counter(
+    'upstream_errors_total', 'Upstream requests that raised (timeouts, connection errors).',
+    ('service', 'operation', 'error'),
+)
+UPSTREAM_LATENCY = histogram(
+    'upstream_request_duration_seconds', 'Upstream HTTP request latency.',
+    ('service', 'operation'),
+)
+UPSTREAM_RETRIES = counter(
+    'upstream_retries_total', 'Upstream calls retried after a failed or invalid response.',
+    ('service', 'operation'),
+)
+
+
+class UpstreamClient:
+    """
+    Thin wrapper over ``requests`` that records metrics for one upstream service.
+
+    Each call names its *operation* (a fixed, low-cardinality label such as
+    ``'ticket_view'``); status ``'2xx'`` … ``'5xx'`` is recorded per response
+    and exceptions are counted by type before being re-raised.
+    """
+
+    def __init__(self, service: str):
+        self.service = service
+
+    def request(self, method: str, url: str, operation: str, **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        try:
+            response = requests.request(method, url, **kwargs)
+        except Exception as exc:
+            UPSTREAM_ERRORS.inc(service=self.service, operation=operation, error=type(exc).__name__)
+            raise
+        finally:
+            UPSTREAM_LATENCY.observe(time.perf_counter() - start,
+                                     service=self.service, operation=operation)
+        UPSTREAM_REQUESTS.inc(service=self.service, operation=operation,
+                              status=f'{response.status_code // 100}xx')
+        return response
+
+    def get(self, url: str, operation: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, operation, **kwargs)
+
+    def post(self, url: str, operation: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, operation, **kwargs)
+
+    def put(self, url: str, operation: str, **kwargs) -> requests.Response:
+        return self.request('PUT', url, operation, **kwargs)
+
+    def retry(self, operation: str) -> None:
+        """Count one retry of *operation*."""
+        UPSTREAM_RETRIES.inc(service=self.service, operation=operation)
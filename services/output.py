@@ -1,3 +1,260 @@
+"""
+Application log output.
+
+``Output().add_line(...)`` used to open ``output.txt``, append and close it on
+every call, from request handlers and SSE generators alike.  It now hands a
+:class:`logging.LogRecord` to a bounded in-memory queue and returns; a single
+background writer thread drains the queue in batches (one ``write`` + flush
+per batch), so callers never wait on disk I/O and concurrent lines are never
+interleaved.
+
+- **Levels** — ``add_line(line, level='DEBUG')`` or the :meth:`Output.debug`
+  / :meth:`Output.info` / :meth:`Output.warning` / :meth:`Output.error`
+  shortcuts.  Records below ``LOG_LEVEL`` are discarded before queueing.
+- **Structured records** — keyword arguments are attached as context and
+  written as ``key=value`` pairs (``LOG_FORMAT = 'text'``) or as one JSON
+  object per line (``LOG_FORMAT = 'json'``).
+- **Rotation** — the file is rolled over to ``output.txt.1`` … when it
+  exceeds ``LOG_MAX_BYTES`` or every ``LOG_ROTATE_INTERVAL`` seconds.
+- **Overflow** — when the queue is full, records are dropped (never
+  blocking the caller) and the number dropped is logged once there is room.
+
+Settings live in the "Logging" section of ``services/config.py``.  Pending
+records are flushed at interpreter exit.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+try:
+    from services.config import (
+        LOG_FILE,
+        LOG_LEVEL,
+        LOG_FORMAT,
+        LOG_MAX_BYTES,
+        LOG_ROTATE_INTERVAL,
+        LOG_BACKUP_COUNT,
+        LOG_QUEUE_SIZE,
+        LOG_BATCH_SIZE,
+        LOG_FLUSH_INTERVAL,
+    )
+except ImportError:  # service module run directly as a script
+    from config import (
+        LOG_FILE,
+        LOG_LEVEL,
+        LOG_FORMAT,
+        LOG_MAX_BYTES,
+        LOG_ROTATE_INTERVAL,
+        LOG_BACKUP_COUNT,
+        LOG_QUEUE_SIZE,
+        LOG_BATCH_SIZE,
+        LOG_FLUSH_INTERVAL,
+    )
+
+_LOGGER_NAME = 'service_desk'
+_STOP = object()   # queue sentinel: flush and exit the writer
+
+
+# ── Formatting ────────────────────────────────────────────────────────────────
+
+class _TextFormatter(logging.Formatter):
+    """Plain lines (as before) prefixed with time and level; context appended as key=value."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = (f"{self.formatTime(record, '%Y-%m-%d %H:%M:%S')} "
+                f"{record.levelname:<7} {record.getMessage()}")
+        context = getattr(record, 'context', None)
+        if context:
+            line += ' ' + ' '.join(f'{k}={v}' for k, v in context.items())
+        return line
+
+
+class _JSONFormatter(logging.Formatter):
+    """One JSON object per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        context = getattr(record, 'context', None)
+        if context:
+            entry['context'] = context
+        return json.dumps(entry, default=str)
+
+
+# ── Background writer ─────────────────────────────────────────────────────────
+
+class _QueueHandler(logging.Handler):
+    """Enqueue records without blocking; count the ones dropped when the queue is full."""
+
+    def __init__(self, records: queue.Queue):
+        super().__init__()
+        self.records = records
+        self.dropped = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.records.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _LogWriter:
+    """Drains the record queue into the log file in batches, rotating by size and age."""
+
+    def __init__(self, path: str, records: queue.Queue, handler: _QueueHandler,
+                 formatter: logging.Formatter):
+        self.path = path
+        self.records = records
+        self.handler = handler
+        self.formatter = formatter
+        self._file_lock = threading.Lock()   # guards the open file against truncate()
+        self._file = None
+        self._opened_at = 0.0
+        self._reported_drops = 0
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self.records.get(timeout=LOG_FLUSH_INTERVAL)
+            except queue.Empty:
+                continue
+            batch = [first]
+            while len(batch) < LOG_BATCH_SIZE:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(item is _STOP for item in batch)
+            self._write([r for r in batch if r is not _STOP])
+            for _ in batch:
+                self.records.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: list) -> None:
+        lines = []
+        dropped = self.handler.dropped
+        if dropped > self._reported_drops:
+            lines.append(f'log queue full: {dropped - self._reported_drops} record(s) dropped')
+            self._reported_drops = dropped
+        for record in batch:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception as exc:
+                lines.append(f'unformattable log record: {exc}')
+        if not lines:
+            return
+
+        data = '\n'.join(lines) + '\n'
+        with self._file_lock:
+            try:
+                if self._file is None:
+                    self._open()
+                self._rotate_if_due(len(data))
+                if self._file is None:
+                    self._open()
+                self._file.write(data)
+                self._file.flush()
+            except OSError:
+                # Nowhere to report it; drop the batch rather than kill the writer
+                self._close()
+
+    def _open(self) -> None:
+        self._file = open(self.path, 'a', encoding='utf-8')
+        # A file left over from an earlier run ages from its last write
+        self._opened_at = os.fstat(self._file.fileno()).st_mtime if self._file.tell() else time.time()
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate_if_due(self, incoming: int) -> None:
+        if self._file is None:
+            return
+        too_big = LOG_MAX_BYTES and self._file.tell() + incoming > LOG_MAX_BYTES
+        too_old = LOG_ROTATE_INTERVAL and time.time() - self._opened_at >= LOG_ROTATE_INTERVAL
+        if not (too_big or too_old) or self._file.tell() == 0:
+            return
+
+        self._close()
+        if LOG_BACKUP_COUNT > 0:
+            for i in range(LOG_BACKUP_COUNT - 1, 0, -1):
+                src = f'{self.path}.{i}'
+                if os.path.exists(src):
+                    os.replace(src, f'{self.path}.{i + 1}')
+            os.replace(self.path, f'{self.path}.1')
+        else:
+            os.remove(self.path)
+
+    def truncate(self) -> None:
+        """Empty the log file (pending records are still written afterwards)."""
+        with self._file_lock:
+            self._close()
+            with open(self.path, 'w', encoding='utf-8'):
+                pass
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write everything queued so far and stop the writer."""
+        try:
+            self.records.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+        with self._file_lock:
+            self._close()
+
+
+def _build_writer() -> tuple[logging.Logger, _LogWriter]:
+    """
+    Set up the process's logger and writer once.  Service modules import
+    this file by bare name (``from output import ...``) while the app
+    imports ``services.output``, so it can load twice; the second load
+    reuses the writer attached to the named logger instead of adding a
+    second handler and writer thread.
+    """
+    logger = logging.getLogger(_LOGGER_NAME)
+    writer = getattr(logger, 'service_desk_writer', None)
+    if writer is not None and logger.handlers:
+        return logger, writer
+
+    records: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    handler = _QueueHandler(records)
+    formatter = _JSONFormatter() if LOG_FORMAT == 'json' else _TextFormatter()
+
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+    logger.addHandler(handler)
+
+    writer = _LogWriter(LOG_FILE, records, handler, formatter)
+    logger.service_desk_writer = writer
+    atexit.register(writer.stop)
+    return logger, writer
+
+
+_logger, _writer = _build_writer()
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def _levelno(level) -> int:
+    if isinstance(level, int):
+        return level
+    return getattr(logging, str(level).upper(), logging.INFO)
+
+
 class Output:
     def __init__(self, clear_on_init=False):
         """
@@ -5,13 +262,43 @@ class Output:
         clear_on_init: If True, clears output.txt on initialization
         """
         if clear_on_init:
-            with open("output.txt", "w", encoding='utf-8') as f:
-                pass  # Create/empty file
+            _writer.truncate()
 
-    def add_line(self, line):
+    def add_line(self, line, level='INFO', **context):
         """
-        Appends a line of text to output.txt, followed by newline.
+        Queue a line for output.txt; returns without waiting for the write.
         line: String to add
+        level: Logging level name ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+        context: Optional structured fields recorded with the line
         """
-        with open("output.txt", "a", encoding='utf-8') as f:
-            f.write(line + "\n")
+        levelno = _levelno(level)
+        if _logger.isEnabledFor(levelno):
+            _logger.log(levelno, line, extra={'context': context} if context else None)
+
+    def is_enabled_for(self, level) -> bool:
+        """True if lines at *level* are written (lets callers skip building them)."""
+        return _logger.isEnabledFor(_levelno(level))
+
+    def debug(self, line, **context):
+        self.add_line(line, 'DEBUG', **context)
+
+    def info(self, line, **context):
+        self.add_line(line, 'INFO', **context)
+
+    def warning(self, line, **context):
+        self.add_line(line, 'WARNING', **context)
+
+    def error(self, line, **context):
+        self.add_line(line, 'ERROR', **context)
+
+    @staticmethod
+    def flush(timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is written; False on timeout."""
+        records = _writer.records
+        deadline = time.time() + timeout
+        with records.all_tasks_done:
+            while records.unfinished_tasks:
+                remaining = deadline - time.time()
+                if remaining <= 0 or not records.all_tasks_done.wait(remaining):
+                    return False
+        return True
@@ -0,0 +1,172 @@
+import sys
+import os
+import json
+import time
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from services.output import Output
+from services.location_resolver import LocationResolver
+from services.config import DEBUG, REFERENCE_DATA_RELOAD_CHECK_SECONDS
+
+_SERVICES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+REFERENCE_FILES = {
+    'locations': os.path.join(_SERVICES_DIR, 'locations.json'),
+    'support_groups': os.path.join(_SERVICES_DIR, 'support_group_description.json'),
+    'keywords': os.path.join(_SERVICES_DIR, 'support_group_keywords.json'),
+}
+
+
+class ReferenceData:
+    """
+    Parsed reference data plus the lookup indexes built from it.
+
+    Instances are treated as read-only snapshots: the registry builds a new
+    one whenever a source file changes and swaps it in, so callers holding an
+    older snapshot keep a consistent view for the duration of their call.
+    """
+
+    def __init__(self, locations_data, support_groups_data, keywords_data, keyword_automaton=None):
+        """
+        Build all indexes from the raw parsed JSON documents.
+
+        Args:
+            locations_data: Parsed ``locations.json`` (``{'locations': [...]}``).
+            support_groups_data: Parsed ``support_group_description.json`` list.
+            keywords_data: Parsed ``support_group_keywords.json`` list.
+            keyword_automaton: Previously built automaton to reuse when the
+                               keywords file did not change.
+        """
+        self.locations = locations_data.get('locations', [])
+        self.support_groups = support_groups_data
+        self.keywords = keywords_data
+
+        # Exact-name, substring and fuzzy site lookups (memoized per user)
+        self.location_resolver = LocationResolver(self.locations)
+        # Exact site name -> location category (first category listing the site wins)
+        self.site_categories = self.location_resolver.site_categories
+        # Lowercased location categories, for "is this group location-related?" checks
+        self.location_categories = set()
+        for location in self.locations:
+            category = location.get('category', '')
+            if category:
+                self.location_categories.add(category.lower())
+
+        # ticket_type -> support groups with a description, in file order
+        self.support_groups_by_type = {}
+        for sg in self.support_groups:
+            if sg.get('description') is None:
+                continue
+            self.support_groups_by_type.setdefault(sg.get('ticket_type'), []).append(sg)
+
+        # Support group name -> keyword list (last entry wins)
+        self.group_keywords = {}
+        for kw_entry in self.keywords:
+            self.group_keywords[kw_entry['name']] = kw_entry.get('keywords', []) or []
+
+        self.support_group_names = sorted(g['name'] for g in self.keywords if 'name' in g)
+
+        if keyword_automaton is None:
+            from services.keyword_match import KeywordAutomaton
+            keyword_automaton = KeywordAutomaton(self.keywords)
+        self.keyword_automaton = keyword_automaton
+
+
+class ReferenceDataRegistry:
+    """
+    Load-once registry for the JSON reference files in ``services/``.
+
+    Each file is parsed once and re-parsed only when its modification time
+    changes (checked at most every ``REFERENCE_DATA_RELOAD_CHECK_SECONDS``),
+    so editing a JSON file on disk is picked up without a restart.
+    """
+
+    def __init__(self, files=None, check_interval=REFERENCE_DATA_RELOAD_CHECK_SECONDS):
+        """
+        Args:
+            files (dict, optional): Mapping of ``'locations'``, ``'support_groups'``
+                                    and ``'keywords'`` to file paths.
+            check_interval (float): Minimum seconds between mtime checks.
+        """
+        self.files = dict(files or REFERENCE_FILES)
+        self.check_interval = check_interval
+        self.output = Output()
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._mtimes = {}
+        self._parsed = {}
+        self._checked_at = 0.0
+
+    def get(self):
+        """
+        Return the current :class:`ReferenceData` snapshot, reloading any file
+        whose mtime changed since it was last parsed.
+
+        Raises:
+            FileNotFoundError / json.JSONDecodeError: only when no snapshot has
+            been loaded yet; later reload failures keep the last good snapshot.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return self._snapshot
+            try:
+                self._reload_changed()
+            except (OSError, ValueError) as e:
+                if self._snapshot is None:
+                    raise
+                self.output.add_line(f"Reference data reload failed, keeping previous data: {e}")
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def reload(self):
+        """Force an mtime check on the next :meth:`get` call."""
+        with self._lock:
+            self._checked_at = 0.0
+
+    def _reload_changed(self):
+        """Re-parse changed files and rebuild the snapshot. Caller holds ``_lock``."""
+        changed = set()
+        parsed = dict(self._parsed)
+        mtimes = dict(self._mtimes)
+        for key, path in self.files.items():
+            mtime = os.stat(path).st_mtime_ns
+            if key in parsed and mtimes.get(key) == mtime:
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                parsed[key] = json.load(f)
+            mtimes[key] = mtime
+            changed.add(key)
+
+        if not changed and self._snapshot is not None:
+            return
+
+        keyword_automaton = None
+        if self._snapshot is not None and 'keywords' not in changed:
+            keyword_automaton = self._snapshot.keyword_automaton
+
+        self._snapshot = ReferenceData(
+            parsed['locations'],
+            parsed['support_groups'],
+            parsed['keywords'],
+            keyword_automaton=keyword_automaton,
+        )
+        self._parsed = parsed
+        self._mtimes = mtimes
+
+        if DEBUG:
+            self.output.add_line(f"Reference data loaded: {', '.join(sorted(changed))}")
+
+
+_registry = ReferenceDataRegistry()
+
+
+def get_reference_data():
+    """Return the current process-wide :class:`ReferenceData` snapshot."""
+    return _registry.get()
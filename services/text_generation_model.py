@@ -9,11 +9,18 @@ from dotenv import load_dotenv
 sys.path.insert(0, os.path.dirname(__file__))
 
 from output import Output
+try:
+    from services.metrics import UpstreamClient
+except ImportError:  # run directly as a script
+    from metrics import UpstreamClient
 from config import DEBUG
 from config import TEST_RUN_TEXT_GENERATION_MODEL as TEST_RUN
 
 load_dotenv()
 
+_upstream = UpstreamClient('llm')
+
+
 class TextGenerationModel:
     def __init__(self):
         self.api_key = os.getenv('DATABRICKS_API_KEY')
@@ -32,6 +39,8 @@ class TextGenerationModel:
             Parsed JSON dict from LLM response with required keys, or error dict
         """
         for attempt in range(max_retries):
+            if attempt:
+                _upstream.retry('chat_completion')
             try:
                 if DEBUG:
                     self.output.add_line(f"LLM Query attempt {attempt + 1}: {prompt[:200]}{'...' if len(prompt) > 200 else ''}")
@@ -48,7 +57,7 @@ class TextGenerationModel:
                     "Content-Type": "application/json"
                 }
 
-                response = requests.post(self.url, headers=headers, json=payload)
+                response = _upstream.post(self.url, 'chat_completion', headers=headers, json=payload)
                 response.raise_for_status()
 
                 data = response.json()